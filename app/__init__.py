@@ -4,6 +4,7 @@ from fastapi import FastAPI
 
 from app.configuration import __containers__
 from app.configuration.server import Server
+from app.internal.pkg.responses import ORJSONResponse
 
 
 def create_app() -> FastAPI:
@@ -13,7 +14,7 @@ def create_app() -> FastAPI:
     In :func:`.create_app` you can add all your middlewares, routes, dependencies, etc.
     required for global server startup.
     """
-    app = FastAPI()
+    app = FastAPI(default_response_class=ORJSONResponse)
     __containers__.wire_packages(app=app)
     return Server(app).get_app()
 
@@ -1,22 +1,218 @@
 """``on_startup`` function will be called when server trying to start."""
 
+import asyncio
+import contextlib
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Optional, Sequence
 
-async def on_startup() -> None:
+from aiopg import Pool
+from dependency_injector import providers
+from dependency_injector.wiring import Provide, inject
+from fastapi import FastAPI
+
+from app.internal.repository.postgresql import (
+    NotificationRepository,
+    ProfileRepository,
+    UserRepository,
+)
+from app.internal.repository.postgresql.connection import warm_up
+from app.internal.services import SavedSearchService, Services
+from app.pkg import models
+from app.pkg.connectors import Connectors
+from app.pkg.logger import get_logger
+from app.pkg.metrics import MultiProcessExporter
+from app.pkg.settings import settings
+from app.pkg.tracing import OTLPFileExporter, tracer
+from app.pkg.utils.batcher import AsyncBatcher
+
+logger = get_logger(__name__)
+
+#: float: Seconds between warm-up attempts while the database is unavailable.
+_WARM_UP_RETRY_INTERVAL = 5.0
+
+#: uuid.UUID: Key that matches no row, used to run hot queries.
+_NIL = uuid.UUID(int=0)
+
+
+@inject
+async def on_startup(
+    app: FastAPI,
+    connector: providers.Resource = Provide[Connectors.postgresql.connector.provider],
+    profile_repository: ProfileRepository = Provide[
+        Services.repositories.profile_repository
+    ],
+    user_repository: UserRepository = Provide[Services.repositories.user_repository],
+    notification_repository: NotificationRepository = Provide[
+        Services.repositories.notification_repository
+    ],
+    metrics_exporter: Optional[MultiProcessExporter] = Provide[
+        Services.metrics_exporter
+    ],
+    tracing_exporter: Optional[OTLPFileExporter] = Provide[Services.tracing_exporter],
+) -> None:
     """Run code on server startup.
 
+    Warms up the server before it reports ready on ``/ready``: opens
+    ``POSTGRES__MIN_CONNECTION`` connections, validates them, prepares hot
+    queries on each of them and builds the OpenAPI schema. If the database
+    is unavailable, warm-up is retried in background and the server stays
+    not ready.
+
     Warnings:
         **Don't use this function for insert default data in database.
         For this action, we have scripts/migrate.py.**
 
+    Args:
+        app:
+            ``FastAPI`` application instance.
+        connector:
+            Provider of the postgresql pool.
+        profile_repository:
+            Repository of profiles, read by hot queries.
+        user_repository:
+            Repository of users, read by hot queries.
+        notification_repository:
+            Repository of notifications, read by hot queries.
+        metrics_exporter:
+            Writer of metrics of this worker for ``/metrics`` of other
+            workers, None if metrics are not aggregated.
+        tracing_exporter:
+            Writer of sampled spans, None if tracing is disabled.
+
     Returns:
         None
     """
 
+    app.state.ready = False
+    _start_metrics_export(metrics_exporter)
+    _start_tracing(tracing_exporter)
+    app.openapi()
+
+    queries = (
+        lambda: profile_repository.read(query=models.ReadProfileQuery(user_id=_NIL)),
+        lambda: user_repository.read(query=models.ReadUserQuery(id=_NIL)),
+        lambda: notification_repository.read(
+            query=models.ReadNotificationsQuery(user_id=_NIL),
+        ),
+    )
+    if not await _warm_up(app, connector, queries):
+        app.state.warm_up = asyncio.create_task(
+            _retry_warm_up(app, connector, queries),
+        )
+
+
+def _start_metrics_export(metrics_exporter: Optional[MultiProcessExporter]) -> None:
+    """Start writing snapshots of metrics of this worker, if aggregated."""
+
+    if metrics_exporter is not None:
+        metrics_exporter.start()
+
+
+def _start_tracing(tracing_exporter: Optional[OTLPFileExporter]) -> None:
+    """Pass sampled spans to the exporter, if tracing is enabled."""
+
+    if tracing_exporter is not None:
+        tracer.exporter = tracing_exporter
+        tracing_exporter.start()
 
-async def on_shutdown() -> None:
+
+async def _warm_up(
+    app: FastAPI,
+    connector: providers.Resource,
+    queries: Sequence[Callable[[], Awaitable[Any]]],
+) -> bool:
+    """Warm up the primary pool and mark the server ready.
+
+    Returns:
+        True if the server is ready, False if warm-up failed.
+    """
+
+    started = time.perf_counter()
+    try:
+        pool = connector()
+        if not isinstance(pool, Pool):
+            pool = await pool
+        await warm_up(
+            pool=pool,
+            size=settings.POSTGRES.MIN_CONNECTION,
+            queries=queries,
+        )
+    except Exception as error:  # pylint: disable=broad-except
+        logger.error("Warm-up failed, server is not ready: %s", error)
+        return False
+
+    app.state.ready = True
+    logger.info(
+        "Server is ready, warmed up in %.3fs.",
+        time.perf_counter() - started,
+    )
+    return True
+
+
+async def _retry_warm_up(
+    app: FastAPI,
+    connector: providers.Resource,
+    queries: Sequence[Callable[[], Awaitable[Any]]],
+) -> None:
+    """Retry warm-up in background until the database is available."""
+
+    while True:
+        await asyncio.sleep(_WARM_UP_RETRY_INTERVAL)
+        if await _warm_up(app, connector, queries):
+            return
+
+
+@inject
+async def on_shutdown(
+    app: FastAPI,
+    notification_batcher: AsyncBatcher = Provide[Services.notification_batcher],
+    saved_search_service: SavedSearchService = Provide[Services.saved_search_service],
+    connector: providers.Resource = Provide[Connectors.postgresql.connector.provider],
+    replica: providers.Resource = Provide[Connectors.postgresql.replica.provider],
+    metrics_exporter: Optional[MultiProcessExporter] = Provide[
+        Services.metrics_exporter
+    ],
+    tracing_exporter: Optional[OTLPFileExporter] = Provide[Services.tracing_exporter],
+) -> None:
     """Run code on server shutdown. Use this function for close all
     connections, etc.
 
+    Args:
+        app:
+            ``FastAPI`` application instance.
+        notification_batcher:
+            Buffered saved search notifications, written before exit.
+        saved_search_service:
+            Service of saved searches, its background reload is stopped.
+        connector:
+            Provider of the postgresql pool, closed after checked out
+            connections are returned.
+        replica:
+            Provider of the read replica pool.
+        metrics_exporter:
+            Writer of metrics of this worker, writes the last snapshot.
+        tracing_exporter:
+            Writer of sampled spans, writes the remaining spans.
+
     Returns:
         None
     """
+
+    app.state.ready = False
+    warm_up_task = getattr(app.state, "warm_up", None)
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await warm_up_task
+
+    await saved_search_service.close()
+    await notification_batcher.close()
+    if metrics_exporter is not None:
+        await metrics_exporter.stop()
+    if tracing_exporter is not None:
+        tracer.exporter = None
+        await tracing_exporter.stop()
+    for resource in (connector, replica):
+        if resource.initialized:
+            await resource.shutdown()
@@ -1,16 +1,24 @@
 """Server configuration."""
 
+from functools import partial
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.configuration.events import on_shutdown, on_startup
+from app.internal.pkg.middlewares.deadline import DeadlineMiddleware
+from app.internal.pkg.middlewares.disconnect import DisconnectMiddleware
 from app.internal.pkg.middlewares.handle_http_exceptions import (
     handle_api_exceptions,
     handle_drivers_exceptions,
     handle_internal_exception,
+    handle_version_conflict,
 )
+from app.internal.pkg.middlewares.metrics import MetricsMiddleware
+from app.internal.pkg.middlewares.tracing import TracingMiddleware
 from app.internal.routes import __routes__
 from app.pkg.models.base import BaseAPIException
+from app.pkg.models.exceptions.repository import DriverError, VersionConflict
 from app.pkg.models.types.fastapi import FastAPITypes
 from app.pkg.settings import settings
 
@@ -67,8 +75,8 @@ class Server:
             None
         """
 
-        app.on_event("startup")(on_startup)
-        app.on_event("shutdown")(on_shutdown)
+        app.on_event("startup")(partial(on_startup, app))
+        app.on_event("shutdown")(partial(on_shutdown, app))
 
     @staticmethod
     def _register_routes(app: FastAPITypes.instance) -> None:
@@ -117,13 +125,39 @@ class Server:
         """
 
         self.__register_cors_origins(app)
+        self.__register_deadline(app)
+        app.add_middleware(DisconnectMiddleware)
+        app.add_middleware(TracingMiddleware)
+        # Added last, so it is the outermost and measures all middlewares.
+        app.add_middleware(MetricsMiddleware)
+
+    @staticmethod
+    def __register_deadline(app: FastAPITypes.instance) -> None:
+        """
+        Регистрирует дедлайн запросов из заголовка ``X-Request-Timeout``
+        или из настроек :class:`.RequestDeadline`.
+
+        Args:
+            app (FastAPI): Экземпляр приложения ``FastAPI``.
+
+        Returns:
+            None
+        """
+
+        app.add_middleware(
+            DeadlineMiddleware,
+            default=settings.API.DEADLINE.DEFAULT,
+            maximum=settings.API.DEADLINE.MAX,
+            routes=settings.API.DEADLINE.ROUTES,
+        )
 
     @staticmethod
     def _register_http_exceptions(app: FastAPITypes.instance) -> None:
         """
         Регистрирует HTTP исключения.
         Экземпляр обрабатывает исключения ``BaseAPIException``,
-        возникающие внутри функций.
+        возникающие внутри функций, со статусом из исключения, а
+        необработанные исключения - со статусом 500.
 
         Args:
             app (FastAPI): Экземпляр приложения ``FastAPI``.
@@ -133,5 +167,6 @@ class Server:
         """
 
         app.add_exception_handler(BaseAPIException, handle_api_exceptions)
-        app.add_exception_handler(BaseAPIException, handle_drivers_exceptions)
-        app.add_exception_handler(BaseAPIException, handle_internal_exception)
+        app.add_exception_handler(DriverError, handle_drivers_exceptions)
+        app.add_exception_handler(VersionConflict, handle_version_conflict)
+        app.add_exception_handler(Exception, handle_internal_exception)
@@ -0,0 +1,91 @@
+"""Middleware that sets the deadline of every request."""
+
+import math
+from typing import Dict, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.pkg.utils.deadline import deadline
+
+__all__ = ["DeadlineMiddleware"]
+
+#: bytes: Header with the budget of the request in seconds.
+TIMEOUT_HEADER = b"x-request-timeout"
+
+
+class DeadlineMiddleware:
+    """Run every HTTP request under a deadline.
+
+    The budget is taken from the ``X-Request-Timeout`` header, capped by
+    ``maximum``. Requests without a valid header get the budget of the
+    longest route prefix in ``routes`` that matches their path, else
+    ``default``. See :mod:`app.pkg.utils.deadline`.
+
+    Attributes:
+        app: Wrapped ASGI application.
+        default: Budget of requests without header, None for no limit.
+        maximum: Largest budget a client can ask for.
+        routes: Budgets of path prefixes.
+    """
+
+    app: ASGIApp
+    default: Optional[float]
+    maximum: float
+    routes: Dict[str, float]
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        default: Optional[float] = None,
+        maximum: float = 60.0,
+        routes: Optional[Dict[str, float]] = None,
+    ):
+        self.app = app
+        self.default = default
+        self.maximum = maximum
+        # Longest prefixes first, so the most specific route wins.
+        self.routes = dict(
+            sorted((routes or {}).items(), key=lambda item: -len(item[0])),
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with deadline(self.timeout(scope)):
+            await self.app(scope, receive, send)
+
+    def timeout(self, scope: Scope) -> Optional[float]:
+        """Get budget of the request.
+
+        Args:
+            scope: ASGI scope of the request.
+
+        Returns:
+            Number of seconds, None for no limit.
+        """
+
+        timeout = self.__requested(scope)
+        if timeout is not None:
+            return min(timeout, self.maximum)
+
+        path = scope["path"]
+        for prefix, timeout in self.routes.items():
+            if path.startswith(prefix):
+                return timeout
+        return self.default
+
+    @staticmethod
+    def __requested(scope: Scope) -> Optional[float]:
+        """Budget from the header, None if it is missing or invalid."""
+
+        for name, value in scope["headers"]:
+            if name != TIMEOUT_HEADER:
+                continue
+            try:
+                timeout = float(value)
+            except ValueError:
+                return None
+            return timeout if math.isfinite(timeout) and timeout > 0 else None
+        return None
@@ -0,0 +1,105 @@
+"""Middleware that stops requests whose client disconnected."""
+
+import asyncio
+import contextlib
+import functools
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.pkg.logger import get_logger
+from app.pkg.utils.cancellation import cancel_scope
+
+__all__ = ["DisconnectMiddleware"]
+
+logger = get_logger(__name__)
+
+
+class DisconnectMiddleware:
+    """Cancel the handler of a request when its client disconnects.
+
+    The middleware reads messages of the client itself and passes them to
+    the application through a queue, so it notices ``http.disconnect``
+    while the handler is still running. Work registered in the
+    :class:`app.pkg.utils.cancellation.CancelScope` of the request, e.g.
+    running postgresql queries, is cancelled first, then the handler task.
+
+    Notes:
+        Servers report ``http.disconnect`` as soon as the response is
+        sent, so a disconnect after the last body message is ignored and
+        work after the response, e.g. background tasks, runs to the end.
+
+        A query cancelled on the server fails in the handler, which then
+        releases its connection. The handler task is only cancelled if it
+        is still running ``grace`` seconds later, because a task cancelled
+        while aiopg waits for a query closes the connection.
+
+    Attributes:
+        app: Wrapped ASGI application.
+        grace: Number of seconds the handler may take to finish after its
+            work was cancelled.
+    """
+
+    app: ASGIApp
+    grace: float
+
+    def __init__(self, app: ASGIApp, grace: float = 1.0):
+        self.app = app
+        self.grace = grace
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        messages: asyncio.Queue = asyncio.Queue()
+        responded = asyncio.Event()
+        with cancel_scope() as cancellation:
+            handler = asyncio.create_task(
+                self.app(
+                    scope, messages.get, functools.partial(_send, send, responded)
+                ),
+            )
+            listener = asyncio.create_task(_listen(receive, messages))
+            try:
+                await asyncio.wait(
+                    (handler, listener),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            except asyncio.CancelledError:
+                handler.cancel()
+                raise
+            finally:
+                listener.cancel()
+
+            if handler.done() or responded.is_set() or listener.exception() is not None:
+                await handler
+                return
+
+            logger.info(
+                "Client disconnected, cancelling %s %s.",
+                scope["method"],
+                scope["path"],
+            )
+            await cancellation.cancel()
+            await asyncio.wait({handler}, timeout=self.grace)
+            handler.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await handler
+
+
+async def _listen(receive: Receive, messages: asyncio.Queue) -> Message:
+    """Pass messages of the client to the queue until it disconnects."""
+
+    while True:
+        message = await receive()
+        messages.put_nowait(message)
+        if message["type"] == "http.disconnect":
+            return message
+
+
+async def _send(send: Send, responded: asyncio.Event, message: Message) -> None:
+    """Send the message and note when the response is complete."""
+
+    await send(message)
+    if message["type"] == "http.response.body" and not message.get("more_body"):
+        responded.set()
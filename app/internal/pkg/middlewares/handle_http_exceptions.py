@@ -6,14 +6,16 @@ from starlette import status
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
+from app.internal.pkg.responses import ModelResponse
 from app.pkg.logger import get_logger
 from app.pkg.models.base import BaseAPIException
-from app.pkg.models.exceptions.repository import DriverError
+from app.pkg.models.exceptions.repository import DriverError, VersionConflict
 
 __all__ = [
     "handle_internal_exception",
     "handle_api_exceptions",
     "handle_drivers_exceptions",
+    "handle_version_conflict",
 ]
 
 logger = get_logger(__name__)
@@ -59,11 +61,35 @@ def handle_api_exceptions(request: Request, exc: BaseAPIException):
 
     del request  # unused
 
-    logger.info(exc)
+    logger.info("%r", exc)
 
     return JSONResponse(status_code=exc.status_code, content={"message": exc.message})
 
 
+def handle_version_conflict(request: Request, exc: VersionConflict):
+    """Handle :class:`.VersionConflict` of optimistic concurrency.
+
+    Args:
+        request:
+            ``Request`` instance.
+        exc:
+            :class:`.VersionConflict` instance.
+
+    Returns:
+        ``ModelResponse`` object with status code 409 and the current state
+        of the row in ``current``.
+    """
+
+    del request  # unused
+
+    logger.info("%r", exc)
+
+    return ModelResponse(
+        {"message": exc.message, "current": exc.current},
+        status_code=exc.status_code,
+    )
+
+
 def handle_internal_exception(request: Request, exc: Exception):
     """Handle all internal unhandled exceptions.
 
@@ -0,0 +1,70 @@
+"""Middleware that records metrics of HTTP requests."""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.pkg.metrics import Counter, Gauge, Histogram
+
+__all__ = ["MetricsMiddleware"]
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "Finished HTTP requests by route and status code.",
+    labelnames=("method", "route", "status"),
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_seconds",
+    "Duration of HTTP requests until the response is sent.",
+    labelnames=("method", "route"),
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests being processed.",
+)
+
+#: str: Route label of requests that matched no route.
+UNMATCHED = "unmatched"
+
+
+class MetricsMiddleware:
+    """Count HTTP requests and measure their duration.
+
+    Requests are labelled with the path template of the matched route,
+    e.g. ``/v1/profile/{user_id}``, so the number of label sets stays
+    bounded whatever paths clients request.
+
+    Attributes:
+        app: Wrapped ASGI application.
+    """
+
+    app: ASGIApp
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - started
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            route = getattr(route, "path", UNMATCHED)
+            method = scope["method"]
+            HTTP_REQUEST_SECONDS.observe(duration, method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=status)
@@ -0,0 +1,70 @@
+"""Middleware that opens the root span of every request."""
+
+import functools
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.pkg.tracing import AnySpan, tracer
+
+__all__ = ["TracingMiddleware"]
+
+#: bytes: W3C header with the trace of the client.
+TRACEPARENT_HEADER = b"traceparent"
+
+
+class TracingMiddleware:
+    """Run every HTTP request in a root span.
+
+    The span continues the trace of the ``traceparent`` header of the
+    client, if it is present, and is named after the method and the path
+    template of the matched route, e.g. ``PUT /v1/profile/``.
+
+    Attributes:
+        app: Wrapped ASGI application.
+    """
+
+    app: ASGIApp
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        with tracer.span(
+            method,
+            traceparent=_traceparent(scope),
+            **{"http.method": method, "http.target": scope["path"]},
+        ) as span:
+            try:
+                await self.app(
+                    scope,
+                    receive,
+                    functools.partial(_send_with_status, send, span),
+                )
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route is not None and span.recording:
+                    span.name = f"{method} {route}"
+                    span.set_attribute("http.route", route)
+
+
+def _traceparent(scope: Scope) -> Optional[str]:
+    """Get ``traceparent`` header of the request, None if it is missing."""
+
+    for name, value in scope["headers"]:
+        if name == TRACEPARENT_HEADER:
+            return value.decode("latin-1")
+    return None
+
+
+async def _send_with_status(send: Send, span: AnySpan, message: Message) -> None:
+    """Send the message and record the status code of the response."""
+
+    if message["type"] == "http.response.start":
+        span.set_attribute("http.status_code", message["status"])
+    await send(message)
@@ -0,0 +1,137 @@
+"""Response classes of the server."""
+
+import datetime
+import decimal
+import time
+import typing
+
+import orjson
+import pydantic
+from fastapi.responses import JSONResponse
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+from app.pkg.tracing import tracer
+
+__all__ = ["ModelResponse", "ORJSONResponse", "TracedJSONResponse"]
+
+
+class TracedJSONResponse(JSONResponse):
+    """``JSONResponse`` that renders its body in a ``serialize`` span.
+
+    Notes:
+        ``FastAPI`` converts the result of the route to JSON-compatible
+        data before the response is created, that part stays in the span
+        of the route.
+    """
+
+    def render(self, content: typing.Any) -> bytes:
+        with tracer.span("serialize") as span:
+            body = self.dumps(content)
+            span.set_attribute("http.response_content_length", len(body))
+            return body
+
+    def dumps(self, content: typing.Any) -> bytes:
+        """Serialize content of the response.
+
+        Args:
+            content: JSON-compatible data.
+
+        Returns:
+            Body of the response.
+        """
+
+        return super().render(content)
+
+
+class ORJSONResponse(TracedJSONResponse):
+    """``JSONResponse`` serialized with ``orjson``.
+
+    Models, ``UUID``, secrets, bytes and dates are encoded the same way
+    as :attr:`.BaseModel.Config.json_encoders` do, so the content does not
+    have to go through ``jsonable_encoder`` first, see
+    :class:`.ModelResponse`. Rows of models, see :func:`.row_class`, are
+    dataclasses, which ``orjson`` encodes natively.
+    """
+
+    #: int: ``orjson`` passes dates to :func:`._default`, they are
+    #: encoded as timestamps.
+    option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, content: typing.Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=self.option)
+
+
+class ModelResponse(ORJSONResponse):
+    """Response with models the route has already validated.
+
+    ``FastAPI`` validates the result of the route against
+    ``response_model`` and converts it with ``jsonable_encoder`` before
+    the response is created. Models returned by services are already
+    valid, so a route may return them in this response, which is
+    serialized by ``orjson`` directly. ``response_model`` of the route is
+    only used by the OpenAPI schema then.
+
+    Examples:
+        Return profiles and keep the cookies the service has set::
+
+            @router.get("/", response_model=typing.List[models.Profile])
+            async def read_all(response: fastapi.Response, ...):
+                profiles = await service.read_all_profile(response=response)
+                return ModelResponse(profiles, response=response)
+    """
+
+    def __init__(
+        self,
+        content: typing.Any,
+        status_code: int = 200,
+        headers: typing.Optional[typing.Mapping[str, str]] = None,
+        background: typing.Optional[BackgroundTask] = None,
+        response: typing.Optional[Response] = None,
+    ):
+        """Create the response.
+
+        Args:
+            content: Models, lists of models or JSON-compatible data.
+            status_code: Status code, overridden by the one set on
+                ``response``.
+            headers: Headers of the response.
+            background: Task run after the response is sent.
+            response: Response injected into the route, its headers,
+                e.g. cookies set by services, are copied.
+        """
+
+        if response is not None and response.status_code:
+            status_code = response.status_code
+        super().__init__(content, status_code, headers, background=background)
+        if response is not None:
+            self.raw_headers.extend(response.raw_headers)
+
+
+def _secret(value: typing.Any) -> typing.Any:
+    return value.get_secret_value() if value else None
+
+
+#: dict: Encoders of types that ``orjson`` does not encode natively, the
+#: same as ``BaseModel.Config.json_encoders`` and ``jsonable_encoder``.
+_ENCODERS: typing.Dict[type, typing.Callable[[typing.Any], typing.Any]] = {
+    pydantic.BaseModel: lambda value: value.dict(by_alias=True),
+    pydantic.SecretStr: _secret,
+    pydantic.SecretBytes: _secret,
+    bytes: lambda value: value.decode() if value else None,
+    datetime.datetime: lambda value: int(value.timestamp()),
+    datetime.date: lambda value: int(time.mktime(value.timetuple())),
+    datetime.time: datetime.time.isoformat,
+    decimal.Decimal: float,
+    set: list,
+    frozenset: list,
+}
+
+
+def _default(value: typing.Any) -> typing.Any:
+    # The most specific encoder wins, e.g. of ``datetime`` over ``date``.
+    for cls in type(value).__mro__:
+        encoder = _ENCODERS.get(cls)
+        if encoder is not None:
+            return encoder(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
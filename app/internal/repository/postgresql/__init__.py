@@ -2,7 +2,9 @@
 
 from dependency_injector import containers, providers
 
+from app.internal.repository.postgresql.notifications import NotificationRepository
 from app.internal.repository.postgresql.profiles import ProfileRepository
+from app.internal.repository.postgresql.saved_searches import SavedSearchRepository
 from app.internal.repository.postgresql.users import UserRepository
 
 
@@ -12,3 +14,7 @@ class Repositories(containers.DeclarativeContainer):
     user_repository = providers.Factory(UserRepository)
 
     profile_repository = providers.Factory(ProfileRepository)
+
+    saved_search_repository = providers.Factory(SavedSearchRepository)
+
+    notification_repository = providers.Factory(NotificationRepository)
@@ -0,0 +1,195 @@
+"""Compile repository statements from models.
+
+Columns of a table are the fields of its model, so select lists,
+``returning`` clauses and inserted or updated columns are derived from
+the models instead of being repeated in every query. A statement is
+compiled once per table, operation and set of columns, and its text is
+the same on every call, so it is prepared once per connection as well,
+see :mod:`.prepared`.
+
+Examples:
+    ::
+
+        >>> PROFILES = Table("profiles", models.Profile)
+        >>> select(PROFILES, where=("user_id",), fields=("user_id", "bio"))
+        'select user_id, bio from profiles where user_id = %(user_id)s'
+"""
+
+from __future__ import annotations
+
+import functools
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple, Type
+
+import pydantic
+
+__all__ = ["Table", "delete", "insert", "select", "update"]
+
+Columns = Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Table:
+    """Table whose columns are the fields of a model.
+
+    Attributes:
+        name: Name of the table.
+        model: Model of the rows of the table.
+        version: Column of the row version, if rows are versioned. Updates
+            increment it and only change rows whose version equals the
+            parameter of the same name, see :func:`.update`.
+    """
+
+    name: str
+    model: Type[pydantic.BaseModel]
+    version: Optional[str] = None
+
+    def columns(self, fields: Optional[Iterable[str]] = None) -> str:
+        """Get comma separated columns.
+
+        Args:
+            fields: Fields of the model, None for all of them.
+
+        Raises:
+            ValueError: If some of ``fields`` are not fields of the model.
+
+        Returns:
+            Columns in the order of ``fields``.
+        """
+
+        return ", ".join(self.check(fields or self.model.__fields__))
+
+    def check(self, fields: Iterable[str]) -> Columns:
+        """Check that the names are fields of the model.
+
+        Names are inserted into statements as is, so only names of fields
+        are allowed.
+
+        Args:
+            fields: Names of columns.
+
+        Raises:
+            ValueError: If some of ``fields`` are not fields of the model.
+
+        Returns:
+            Names as a tuple.
+        """
+
+        fields = tuple(fields)
+        unknown = set(fields) - self.model.__fields__.keys()
+        if unknown:
+            raise ValueError(
+                f"{self.name} has no columns: {', '.join(sorted(unknown))}",
+            )
+        return fields
+
+
+@functools.lru_cache(maxsize=1024)
+def select(
+    table: Table,
+    where: Columns = (),
+    fields: Optional[Columns] = None,
+) -> str:
+    """Compile ``select`` of rows by equality of columns.
+
+    Args:
+        table: Table to read.
+        where: Columns compared with parameters of the same names.
+        fields: Selected columns, e.g. validated ``?fields=``, all if None.
+
+    Returns:
+        Statement text.
+    """
+
+    return f"select {table.columns(fields)} from {table.name}{_where(table, where)}"
+
+
+@functools.lru_cache(maxsize=1024)
+def insert(table: Table, cmd: Type[pydantic.BaseModel]) -> str:
+    """Compile ``insert`` of one row returning all columns.
+
+    Args:
+        table: Table to insert into.
+        cmd: Command model, its fields are the inserted columns.
+
+    Returns:
+        Statement text.
+    """
+
+    columns = table.check(cmd.__fields__)
+    return (
+        f"insert into {table.name}({', '.join(columns)})"
+        f" values ({', '.join(f'%({name})s' for name in columns)})"
+        f" returning {table.columns()}"
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def update(
+    table: Table,
+    values: Columns,
+    where: Columns,
+    only_changed: bool = False,
+) -> str:
+    """Compile ``update`` of rows by equality of columns returning them.
+
+    Args:
+        table: Table to update.
+        values: Columns set to parameters of the same names.
+        where: Columns compared with parameters of the same names.
+        only_changed: If True, rows whose ``values`` already equal the
+            parameters, ``null`` included, are not written and not
+            returned.
+
+    Notes:
+        Updates of a versioned table also compare the version column with
+        the parameter of the same name and increment it. A row changed by
+        another request since it was read is not updated and not
+        returned, without locking it in advance.
+
+    Raises:
+        ValueError: If ``where`` is empty, all rows would be updated.
+
+    Returns:
+        Statement text.
+    """
+
+    if not where:
+        raise ValueError(f"update of {table.name} without where")
+    values = table.check(values)
+    assignments = [f"{name} = %({name})s" for name in values]
+    if table.version is not None:
+        assignments.append(f"{table.version} = {table.version} + 1")
+        where = (*where, table.version)
+    q = f"update {table.name} set {', '.join(assignments)}{_where(table, where)}"
+    if only_changed:
+        parameters = ", ".join(f"%({name})s" for name in values)
+        q += f" and row({', '.join(values)}) is distinct from row({parameters})"
+    return f"{q} returning {table.columns()}"
+
+
+@functools.lru_cache(maxsize=1024)
+def delete(table: Table, where: Columns) -> str:
+    """Compile ``delete`` of rows by equality of columns returning them.
+
+    Args:
+        table: Table to delete from.
+        where: Columns compared with parameters of the same names.
+
+    Raises:
+        ValueError: If ``where`` is empty, all rows would be deleted.
+
+    Returns:
+        Statement text.
+    """
+
+    if not where:
+        raise ValueError(f"delete from {table.name} without where")
+    return f"delete from {table.name}{_where(table, where)} returning {table.columns()}"
+
+
+def _where(table: Table, where: Columns) -> str:
+    if not where:
+        return ""
+    conditions = " and ".join(f"{name} = %({name})s" for name in table.check(where))
+    return f" where {conditions}"
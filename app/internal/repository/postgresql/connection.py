@@ -1,17 +1,71 @@
 """Create connection to postgresql."""
 
-from contextlib import asynccontextmanager
-from typing import Optional, Union
+import asyncio
+import time
+import weakref
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
+from contextvars import ContextVar
+from functools import partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
+import psycopg2
 from aiopg import Pool
 from aiopg.pool import Cursor
 from dependency_injector.wiring import Provide, inject
 from psycopg2.extensions import cursor  # type: ignore
 from psycopg2.extras import RealDictCursor  # type: ignore
 
+from app.internal.repository.postgresql.prepared import (
+    PreparedCursor,
+    get_statement_cache,
+)
+from app.internal.repository.postgresql.profiling import (
+    ProfiledCursor,
+    current_profile,
+)
+from app.internal.repository.postgresql.routing import Intent, router
 from app.pkg.connectors import Connectors
+from app.pkg.connectors.postgresql.metrics import (
+    POOL_ACQUIRE_SECONDS,
+    POOL_ACQUIRE_TIMEOUTS,
+    POOL_HOLD_SECONDS,
+    POOL_WAITING,
+    QUERY_CANCELS,
+    pool_name,
+)
+from app.pkg.models.base import BaseAPIException
+from app.pkg.models.exceptions.repository import DeadlineExceeded, PoolTimeout
+from app.pkg.settings import settings
+from app.pkg.tracing import tracer
+from app.pkg.utils.cancellation import on_cancel
+from app.pkg.utils.deadline import remaining
 
-__all__ = ["get_connection", "acquire_connection"]
+__all__ = [
+    "get_connection",
+    "acquire_connection",
+    "unit_of_work",
+    "warm_up",
+    "Intent",
+]
+
+#: ContextVar: Cursor of the innermost :func:`.unit_of_work`.
+_bound_cursor: ContextVar[Optional[Union[Cursor, PreparedCursor]]] = ContextVar(
+    "bound_cursor",
+    default=None,
+)
+
+#: WeakKeyDictionary: ``statement_timeout`` in milliseconds left on connections
+#: by requests with a deadline.
+_statement_timeouts: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
 
 
 @asynccontextmanager
@@ -19,6 +73,8 @@ __all__ = ["get_connection", "acquire_connection"]
 async def get_connection(
     pool: Pool = Provide[Connectors.postgresql.connector],
     return_pool: bool = False,
+    intent: Optional[Intent] = None,
+    replica: Optional[Pool] = Provide[Connectors.postgresql.replica],
 ) -> Union[Cursor, Pool]:
     """Get async connection pool to postgresql.
 
@@ -27,6 +83,15 @@ async def get_connection(
             postgresql connection pool.
         return_pool:
             if True, return pool, else return connection.
+        intent:
+            :attr:`.Intent.READ` allows to execute queries on the read
+            replica, :attr:`.Intent.WRITE` keeps following reads of the
+            session on the primary, see
+            :mod:`app.internal.repository.postgresql.routing`. Without
+            intent queries are executed on the primary.
+        replica:
+            postgresql connection pool of the read replica, None if
+            the replica is not configured.
 
     Examples:
         If you have a function that contains a query in postgresql,
@@ -38,10 +103,27 @@ async def get_connection(
             ...     async with get_connection() as c:
             ...         await c.execute("SELECT * FROM users")
 
+    Notes:
+        Queries of the returned cursor are executed as server-side prepared
+        statements, unless ``POSTGRES__PREPARED_STATEMENTS`` is disabled.
+        See :mod:`app.internal.repository.postgresql.prepared`.
+
+        Inside :func:`.unit_of_work` the cursor of the unit is returned
+        instead of a new connection of the pool, whatever the intent is.
+
+        Inside a profiled repository call the cursor records executed
+        statements, see :mod:`app.internal.repository.postgresql.profiling`.
+
     Returns:
         Async connection to postgresql.
     """
 
+    profile = current_profile()
+    bound = _bound_cursor.get()
+    if bound is not None and not return_pool:
+        yield bound if profile is None else ProfiledCursor(bound, profile)
+        return
+
     if not isinstance(pool, Pool):
         pool = await pool
 
@@ -49,15 +131,23 @@ async def get_connection(
         yield pool
         return
 
-    async with acquire_connection(pool=pool, cursor_factory=None) as cur:
-        yield cur
+    pool = await __route(pool, intent, replica)
+
+    async with acquire_connection(
+        pool=pool,
+        cursor_factory=None,
+        prepared=settings.POSTGRES.PREPARED_STATEMENTS,
+    ) as cur:
+        yield cur if profile is None else ProfiledCursor(cur, profile)
 
 
 @asynccontextmanager
 async def acquire_connection(
     pool: Pool,
     cursor_factory: Optional[cursor] = None,
-) -> Cursor:
+    prepared: bool = False,
+    begin: bool = False,
+) -> Union[Cursor, PreparedCursor]:
     """Acquire connection from pool.
 
     Args:
@@ -65,6 +155,12 @@ async def acquire_connection(
             Getings from :func:`.get_connection` postgresql pool.
         cursor_factory:
             cursor factory.
+        prepared:
+            if True, execute queries as prepared statements cached
+            on the acquired connection.
+        begin:
+            if True, start a transaction on the acquired connection. The
+            caller must commit or roll it back, see :func:`.unit_of_work`.
 
     Examples:
         If you have a function that contains a query in postgresql,
@@ -80,6 +176,30 @@ async def acquire_connection(
             ...         async with acquire_connection(__pool) as _cursor:
             ...             await _cursor.execute(q)
 
+    Notes:
+        Wait and hold times of the connection are recorded in metrics of
+        :mod:`app.pkg.connectors.postgresql.metrics`.
+
+        If the request has a deadline, see :mod:`app.pkg.utils.deadline`,
+        the connection is awaited at most for the remaining budget, and
+        the rest of the budget becomes ``statement_timeout`` of its
+        queries. aiopg connections are in autocommit mode, where
+        ``SET LOCAL`` has no effect, so the timeout is set for the session
+        and reset by the next checkout without a deadline. The session
+        keeps it if it is already the same. A transaction started with
+        ``begin`` sets it with ``SET LOCAL`` instead, in the round trip of
+        ``BEGIN``.
+
+        If the request is cancelled, see :mod:`app.pkg.utils.cancellation`,
+        the running query of the connection is cancelled on the server, so
+        the connection is released as soon as the server stops the query.
+
+    Raises:
+        PoolTimeout: No connection was released within
+            ``POSTGRES__ACQUIRE_TIMEOUT`` seconds.
+        DeadlineExceeded: The deadline of the request passed before a
+            connection was acquired.
+
     Returns:
         Async connection to postgresql.
     """
@@ -87,6 +207,266 @@ async def acquire_connection(
     if cursor_factory is None:
         cursor_factory = RealDictCursor
 
-    async with pool.acquire() as conn:
+    name = pool_name(pool)
+    started = time.perf_counter()
+    conn = await __acquire(pool, name)
+    acquired = time.perf_counter()
+    POOL_ACQUIRE_SECONDS.observe(acquired - started, pool=name)
+    if (profile := current_profile()) is not None:
+        profile.pool_wait += acquired - started
+        profile.pool = pool
+    try:
         acquire_cursor = await conn.cursor(cursor_factory=cursor_factory)
-        yield acquire_cursor
+        await __set_statement_timeout(conn, acquire_cursor, begin=begin)
+        if prepared:
+            acquire_cursor = PreparedCursor(
+                cursor=acquire_cursor,
+                cache=get_statement_cache(
+                    conn,
+                    max_size=settings.POSTGRES.PREPARED_STATEMENTS_CACHE_SIZE,
+                ),
+            )
+        with on_cancel(partial(__cancel_query, conn, name)):
+            yield acquire_cursor
+    finally:
+        POOL_HOLD_SECONDS.observe(time.perf_counter() - acquired, pool=name)
+        await pool.release(conn)
+
+
+async def __acquire(pool: Pool, name: str) -> Any:
+    """Wait for a connection of the pool within the budget of the request."""
+
+    budget = remaining()
+    if budget is not None and budget <= 0:
+        raise DeadlineExceeded
+
+    timeout = settings.POSTGRES.ACQUIRE_TIMEOUT
+    by_deadline = budget is not None and budget < timeout
+    POOL_WAITING.inc(pool=name)
+    try:
+        with tracer.span("db.pool.acquire", **{"db.pool": name}):
+            return await asyncio.wait_for(
+                pool.acquire(),
+                timeout=budget if by_deadline else timeout,
+            )
+    except asyncio.TimeoutError as error:
+        POOL_ACQUIRE_TIMEOUTS.inc(pool=name)
+        if by_deadline:
+            raise DeadlineExceeded from error
+        raise PoolTimeout from error
+    finally:
+        POOL_WAITING.dec(pool=name)
+
+
+async def __route(pool: Pool, intent: Optional[Intent], replica: Any) -> Pool:
+    """Choose pool of the primary or the replica by intent of the caller."""
+
+    if intent is Intent.WRITE:
+        router.record_write()
+    if intent is not Intent.READ:
+        return pool
+
+    if replica is not None and not isinstance(replica, Pool):
+        replica = await replica
+    return await router.route_read(primary=pool, replica=replica)
+
+
+async def __cancel_query(conn: Any, name: str) -> None:
+    """Cancel the running query of the connection on the server.
+
+    Notes:
+        ``cancel`` of psycopg2 sends the request over a new socket and
+        blocks, so it runs in the default executor. A task cancelled
+        while aiopg waits for the query closes the connection instead,
+        and the server would run the query to the end.
+    """
+
+    if conn.closed or not conn.isexecuting():
+        return
+    await asyncio.get_running_loop().run_in_executor(None, conn.raw.cancel)
+    QUERY_CANCELS.inc(pool=name)
+
+
+async def __set_statement_timeout(conn: Any, cur: Cursor, begin: bool) -> None:
+    """Limit queries of the connection by the remaining budget of the
+    request, starting a transaction first if ``begin`` is True."""
+
+    budget = remaining()
+    if budget is not None and budget <= 0:
+        raise DeadlineExceeded
+
+    q, parameters = __statement_timeout(conn, budget, local=begin)
+    if begin:
+        q = f"BEGIN; {q}" if q else "BEGIN"
+    if q:
+        await cur.execute(q, parameters)
+
+
+def __statement_timeout(
+    conn: Any,
+    budget: Optional[float],
+    local: bool,
+) -> Tuple[str, Optional[Tuple[int]]]:
+    """Statement that sets ``statement_timeout`` to the budget, empty if the
+    connection already has it."""
+
+    if budget is None:
+        if _statement_timeouts.pop(conn, None) is None:
+            return "", None
+        return "RESET statement_timeout", None
+
+    # Zero would disable the timeout.
+    milliseconds = max(1, int(budget * 1000))
+    if local:
+        return "SET LOCAL statement_timeout = %s", (milliseconds,)
+    if _statement_timeouts.get(conn) == milliseconds:
+        return "", None
+    _statement_timeouts[conn] = milliseconds
+    return "SET statement_timeout = %s", (milliseconds,)
+
+
+@asynccontextmanager
+async def unit_of_work(
+    intent: Optional[Intent] = Intent.WRITE,
+) -> Union[Cursor, PreparedCursor]:
+    """Run all queries of the block in one transaction on one connection.
+
+    The connection is acquired once and bound to the current context, so
+    every :func:`.get_connection` inside the block returns its cursor. The
+    transaction is committed when the block exits and rolled back when it
+    raises. Nested units join the outer one and commit with it.
+
+    Args:
+        intent: :attr:`.Intent.WRITE` keeps following reads of the session
+            on the primary, like writes of :func:`.get_connection`. Units
+            that only read should pass None. The unit itself always runs
+            on the primary.
+
+    Examples:
+        Create a user and a profile atomically::
+
+            async def sign_up(user_cmd, profile_cmd) -> None:
+                async with unit_of_work():
+                    await user_repository.create(cmd=user_cmd)
+                    await profile_repository.create(cmd=profile_cmd)
+
+    Notes:
+        The pool is taken from :func:`.get_connection` instead of being
+        injected, because injected async generators do not receive
+        exceptions of the block and could not roll back.
+
+        The deadline of the request limits the queries of the unit with
+        ``SET LOCAL``, so the timeout ends with the transaction.
+
+    Warnings:
+        Queries of the block share one connection and must not run
+        concurrently (e.g. in :func:`asyncio.gather`), because a postgresql
+        connection executes one query at a time.
+
+    Returns:
+        Cursor of the bound connection.
+    """
+
+    if intent is Intent.WRITE:
+        router.record_write()
+    bound = _bound_cursor.get()
+    if bound is not None:
+        yield bound
+        return
+
+    async with get_connection(return_pool=True) as pool:
+        async with acquire_connection(
+            pool=pool,
+            cursor_factory=None,
+            prepared=settings.POSTGRES.PREPARED_STATEMENTS,
+            begin=True,
+        ) as cur:
+            async with __transaction(cur):
+                yield cur
+
+
+@asynccontextmanager
+async def __transaction(cur: Union[Cursor, PreparedCursor]) -> AsyncIterator[None]:
+    """Bind the cursor of a started transaction to the context for the
+    block and end the transaction with it."""
+
+    token = _bound_cursor.set(cur)
+    try:
+        yield
+    except BaseException:
+        try:
+            await cur.execute("ROLLBACK")
+        except psycopg2.Error:
+            # The pool closes a connection released inside a transaction.
+            pass
+        raise
+    else:
+        await cur.execute("COMMIT")
+    finally:
+        _bound_cursor.reset(token)
+
+
+async def warm_up(
+    pool: Pool,
+    size: int,
+    queries: Sequence[Callable[[], Awaitable[Any]]] = (),
+) -> None:
+    """Open connections of the pool and prepare hot queries on each of them.
+
+    ``size`` connections are checked out at once, so the pool has to open
+    them, and each one runs a validation query. Then ``queries`` are run
+    on every connection, which prepares their statements there, see
+    :mod:`app.internal.repository.postgresql.prepared`.
+
+    Args:
+        pool:
+            postgresql connection pool.
+        size:
+            number of connections to open, at most the maximum pool size.
+        queries:
+            repository calls of hot queries. They should be cheap reads,
+            their results and API exceptions (e.g. empty result) are
+            ignored.
+
+    Examples:
+        Prepare the profile query on two connections::
+
+            await warm_up(
+                pool,
+                size=2,
+                queries=[lambda: profile_repository.read(query=query)],
+            )
+
+    Raises:
+        psycopg2.Error: A connection failed the validation query.
+
+    Returns:
+        None
+    """
+
+    async with AsyncExitStack() as stack:
+        cursors = [
+            await stack.enter_async_context(
+                acquire_connection(
+                    pool=pool,
+                    prepared=settings.POSTGRES.PREPARED_STATEMENTS,
+                ),
+            )
+            for _ in range(min(size, pool.maxsize or size))
+        ]
+        # Every task binds its own connection, see :func:`.get_connection`.
+        await asyncio.gather(*(__warm_up_cursor(cur, queries) for cur in cursors))
+
+
+async def __warm_up_cursor(
+    cur: Union[Cursor, PreparedCursor],
+    queries: Sequence[Callable[[], Awaitable[Any]]],
+) -> None:
+    await cur.execute("select 1")
+    token = _bound_cursor.set(cur)
+    try:
+        for query in queries:
+            with suppress(BaseAPIException):
+                await query()
+    finally:
+        _bound_cursor.reset(token)
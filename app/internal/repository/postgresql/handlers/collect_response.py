@@ -1,19 +1,53 @@
-"""Collect response from aiopg and convert it to an annotated model."""
+"""Collect response from aiopg and convert it to an annotated model.
 
+Rows were validated on the way into the database, so models are created
+from them with :meth:`.BaseModel.from_trusted`, without validation, or
+as compact :class:`.Row` objects if the method is annotated so. Methods
+annotated with :class:`.Partial` may select some of the columns, their
+results are :func:`.projection` of the model on these columns. A
+share ``POSTGRES__ROW_VALIDATION_SAMPLE_RATE`` of responses is validated
+anyway, and differences are logged, to catch drift between the schema of
+the database and the models.
+"""
+
+import random
+import typing
 from functools import wraps
-from typing import List, Type, Union
+from typing import Any, Callable, List, Optional, Tuple, Type, Union
 
 import pydantic
-from psycopg2.extras import RealDictRow
+from psycopg2.extras import RealDictRow, register_uuid
 
 from app.internal.repository.postgresql.handlers.handle_exception import (
     handle_exception,
 )
-from app.pkg.models.base import Model
+from app.pkg.logger import get_logger
+from app.pkg.metrics import Counter
+from app.pkg.models.base import (
+    BaseModel,
+    Model,
+    Partial,
+    Row,
+    projection,
+    row_class,
+)
 from app.pkg.models.exceptions.repository import EmptyResult
+from app.pkg.settings import settings
 
 __all__ = ["collect_response"]
 
+logger = get_logger(__name__)
+
+ROW_VALIDATION_MISMATCHES = Counter(
+    "db_row_validation_mismatches_total",
+    "Sampled rows whose validated model differs from the trusted one.",
+    labelnames=("model",),
+)
+
+# ``uuid`` columns are read as ``UUID``, the type of the fields, and not
+# as ``str``, so that rows need no validation.
+register_uuid()
+
 
 def collect_response(fn):
     """Convert response from aiopg to an annotated model.
@@ -29,8 +63,12 @@ def collect_response(fn):
         EmptyResult: when a query of `fn` returns None.
     """
 
-    @wraps(fn)
+    annotation = fn.__annotations__["return"]
+    many, partial, result_type = __returned_type(annotation)
+    build, model = __builder(result_type)
+
     @handle_exception
+    @wraps(fn)
     async def inner(
         *args: object,
         **kwargs: object,
@@ -55,23 +93,164 @@ def collect_response(fn):
         if not response:
             raise EmptyResult
 
-        return pydantic.parse_obj_as(
-            (ann := fn.__annotations__["return"]),
-            await __convert_response(response=response, annotations=str(ann)),
-        )
+        response = await __convert_response(response=response, many=many)
+        if result_type is None:
+            return pydantic.parse_obj_as(annotation, response)
+
+        if partial:
+            columns = tuple(response[0] if many else response)
+            return __construct(*__builder(__projected(result_type, columns)), response)
+        return __construct(build, model, response)
 
     return inner
 
 
-async def __convert_response(response: RealDictRow, annotations: str):
+def __returned_type(annotation) -> Tuple[bool, bool, Optional[type]]:
+    """Get the model or the row class of the return annotation.
+
+    Args:
+        annotation:
+            Return annotation of the repository method, ``Model``,
+            ``List[Model]``, the same with a row class of a model, or with
+            ``Partial[...]`` of either.
+
+    Returns:
+        Whether a list is returned, whether the result is partial, and
+        the model or the row class. The class is None if the annotation
+        is not one of the above and the response must be parsed.
+    """
+
+    many = typing.get_origin(annotation) in (list, List)
+    result_type = typing.get_args(annotation)[0] if many else annotation
+    partial = typing.get_origin(result_type) is Partial
+    if partial:
+        result_type = typing.get_args(result_type)[0]
+    if isinstance(result_type, type) and issubclass(result_type, (Row, BaseModel)):
+        return many, partial, result_type
+    return many, partial, None
+
+
+def __builder(
+    result_type: Optional[type],
+) -> Tuple[Optional[Callable[[Any], Any]], Optional[Type[BaseModel]]]:
+    """Get the function that creates a result from a row, and the model.
+
+    Args:
+        result_type:
+            Model or row class of a model, see :func:`.__returned_type`.
+
+    Returns:
+        ``from_row`` or ``from_trusted`` of the class, and the model. Both
+        are None if ``result_type`` is None.
+    """
+
+    if result_type is None:
+        return None, None
+    if issubclass(result_type, Row):
+        return result_type.from_row, result_type.model_class()
+    return result_type.from_trusted, result_type
+
+
+def __projected(result_type: type, columns: Tuple[str, ...]) -> type:
+    """Get the model or the row class with the selected columns only.
+
+    Args:
+        result_type:
+            Model or row class of a model.
+        columns:
+            Columns of the rows of the response.
+
+    Returns:
+        ``result_type`` itself if all fields were selected.
+    """
+
+    if issubclass(result_type, Row):
+        return row_class(projection(result_type.model_class(), columns))
+    return projection(result_type, columns)
+
+
+def __construct(
+    build: Callable[[Any], Any],
+    model: Type[BaseModel],
+    response: Union[RealDictRow, List[RealDictRow]],
+) -> Any:
+    """Create the result from trusted rows, validating a sample of them.
+
+    Args:
+        build:
+            Function that creates a model or a row from a row.
+        model:
+            Model of the rows.
+        response:
+            Converted row or rows of the response.
+
+    Returns:
+        Model or row, or a list of them if ``response`` is a list.
+    """
+
+    rate = settings.POSTGRES.ROW_VALIDATION_SAMPLE_RATE
+    sampled = bool(rate) and random.random() < rate
+    if not isinstance(response, list):
+        result = build(response)
+        if sampled:
+            __validate_sample(model, response, result)
+        return result
+
+    result = [build(row) for row in response]
+    if sampled:
+        index = random.randrange(len(response))
+        __validate_sample(model, response[index], result[index])
+    return result
+
+
+def __validate_sample(
+    model: Type[BaseModel],
+    row: RealDictRow,
+    trusted: Union[Model, Row],
+):
+    """Validate a row and log if the model differs from the trusted one.
+
+    Args:
+        model:
+            Model of the row.
+        row:
+            Row of the response.
+        trusted:
+            Model or row created from the row without validation.
+
+    Returns:
+        None
+    """
+
+    if isinstance(trusted, Row):
+        trusted = trusted.to_model()
+
+    try:
+        validated = model.parse_obj(row)
+    except pydantic.ValidationError as error:
+        ROW_VALIDATION_MISMATCHES.inc(model=model.__name__)
+        logger.warning("Row of %s fails validation: %s", model.__name__, error)
+        return
+
+    if validated != trusted:
+        ROW_VALIDATION_MISMATCHES.inc(model=model.__name__)
+        logger.warning(
+            "Row of %s differs after validation: %r != %r",
+            model.__name__,
+            trusted,
+            validated,
+        )
+
+
+async def __convert_response(response: RealDictRow, many: bool):
     """Converts the response of the request to List of models or to a single
     model.
 
     Args:
         response:
             Response of an aiopg query.
-        annotations:
-            Annotations of `fn`.
+        many:
+            Whether List is specified in the type annotations of `fn`.
 
     Returns:
         List[`Model`] if List is specified in the type annotations,
@@ -80,7 +259,7 @@ async def __convert_response(response: RealDictRow, annotations: str):
 
     r = response.copy()
 
-    if annotations.replace("typing.", "").startswith("List"):
+    if many:
         return [await __convert_memory_viewer(item) for item in r]
     return await __convert_memory_viewer(r)
 
@@ -1,14 +1,23 @@
 """Handle Postgresql Query Exceptions."""
 
+import asyncio
+from functools import wraps
 from typing import Callable
 
 import psycopg2
+from psycopg2.extensions import QueryCanceledError
 
+from app.internal.repository.postgresql.profiling import profiler
 from app.pkg.logger import get_logger
 from app.pkg.models.base import Model
 from app.pkg.models.exceptions.association import __aiopg__, __constrains__
-from app.pkg.models.exceptions.repository import DriverError, EmptyResult
+from app.pkg.models.exceptions.repository import (
+    DeadlineExceeded,
+    DriverError,
+    EmptyResult,
+)
 from app.pkg.models.exceptions.users import UserNotFound
+from app.pkg.tracing import tracer
 
 __all__ = ["handle_exception"]
 
@@ -41,12 +50,26 @@ def handle_exception(func: Callable[..., Model]):  # noqa
     Returns:
         Result of call function.
 
+    Notes:
+        Every call is profiled, see
+        :mod:`app.internal.repository.postgresql.profiling`, and traced
+        in a span named after the repository method.
+
+        aiopg turns a query cancelled on the server, e.g. by
+        ``statement_timeout``, into :class:`asyncio.CancelledError`. It is
+        raised as :class:`.DeadlineExceeded`, so that only cancellation of
+        the task itself propagates as :class:`asyncio.CancelledError`.
+
     Raises:
         UniqueViolation: The query violates the domain uniqueness constraints
             of the database set.
+        DeadlineExceeded: The query was cancelled on the server.
         DriverError: Any error during execution query on a database.
     """
 
+    name = func.__qualname__
+
+    @wraps(func)
     async def wrapper(*args: object, **kwargs: object) -> Model:
         """Inner function. Catching Postgresql Query Exceptions.
 
@@ -66,7 +89,9 @@ def handle_exception(func: Callable[..., Model]):  # noqa
         """
 
         try:
-            return await func(*args, **kwargs)
+            with tracer.span(name, **{"db.system": "postgresql"}):
+                with profiler.profile(name):
+                    return await func(*args, **kwargs)
         except psycopg2.Error as error:
             logger.error(
                 "An error occurred while executing PostgreSQL query: %s", error
@@ -80,5 +105,9 @@ def handle_exception(func: Callable[..., Model]):  # noqa
             raise DriverError(details=error.diag.message_detail) from error
         except EmptyResult as e:
             raise UserNotFound from e
+        except asyncio.CancelledError as error:
+            if isinstance(error.__context__, QueryCanceledError):
+                raise DeadlineExceeded from error
+            raise
 
     return wrapper
@@ -0,0 +1,73 @@
+"""Репозиторий для уведомлений."""
+from typing import List
+
+from app.internal.repository.postgresql.connection import Intent, get_connection
+from app.internal.repository.postgresql.handlers.collect_response import (
+    collect_response,
+)
+from app.internal.repository.repository import Repository
+from app.pkg import models
+
+__all__ = ["NotificationRepository"]
+
+
+class NotificationRepository(Repository):
+    """Реализация репозитория уведомлений."""
+
+    async def create_many(
+        self,
+        cmds: List[models.CreateNotificationCommand],
+    ) -> List[models.Notification]:
+        """Вставляет пачку уведомлений одним запросом.
+
+        Notes:
+            Уведомления удаленных за это время поисков пропускаются. Для
+            пустой пачки запрос не выполняется.
+        """
+        if not cmds:
+            return []
+        return await self._create_many(cmds)
+
+    @collect_response
+    async def _create_many(
+        self,
+        cmds: List[models.CreateNotificationCommand],
+    ) -> List[models.Notification]:
+        q = """
+            insert into notifications(
+                user_id, saved_search_id, profile_user_id
+            )
+            select
+                n.user_id, n.saved_search_id, n.profile_user_id
+            from unnest(
+                %(user_id)s::uuid[],
+                %(saved_search_id)s::integer[],
+                %(profile_user_id)s::uuid[]
+            ) as n(user_id, saved_search_id, profile_user_id)
+            join saved_searches s on s.id = n.saved_search_id
+            returning id, user_id, saved_search_id, profile_user_id
+            """
+        rows = [cmd.to_dict() for cmd in cmds]
+        async with get_connection(intent=Intent.WRITE) as cur:
+            await cur.execute(
+                q,
+                {key: [row[key] for row in rows] for key in rows[0]},
+            )
+            return await cur.fetchall()
+
+    @collect_response
+    async def read(
+        self,
+        query: models.ReadNotificationsQuery,
+    ) -> List[models.Notification]:
+        q = """
+            select
+                id, user_id, saved_search_id, profile_user_id
+            from notifications
+            where user_id = %(user_id)s
+            order by id desc
+            limit %(limit)s
+            """
+        async with get_connection(intent=Intent.READ) as cur:
+            await cur.execute(q, query.to_dict())
+            return await cur.fetchall()
@@ -0,0 +1,434 @@
+"""Server-side prepared statements for repository queries.
+
+Queries of repositories are constant, so each distinct query is prepared
+once per pooled connection with ``PREPARE`` and executed by name
+afterwards. Postgres parses it once and may reuse a generic plan instead
+of planning it on every call.
+
+Warnings:
+    Prepared statements belong to a server session. Disable them with
+    ``POSTGRES__PREPARED_STATEMENTS=false`` when connecting through a
+    transaction-pooling proxy (e.g. PgBouncer in ``transaction`` mode),
+    because consecutive statements may run in different sessions there.
+"""
+
+from __future__ import annotations
+
+import datetime
+import decimal
+import functools
+import hashlib
+import re
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, FrozenSet, List, Mapping, Optional, Sequence, Tuple
+
+import psycopg2
+from aiopg import Connection
+from aiopg.pool import Cursor
+from psycopg2 import errorcodes, errors
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+__all__ = [
+    "PreparedCursor",
+    "Statement",
+    "StatementCache",
+    "get_statement_cache",
+    "invalidate_statement_caches",
+]
+
+_placeholder = re.compile(r"%\((\w+)\)s|%s|%%")
+_preparable = re.compile(r"^\s*(select|insert|update|delete|with|values)\b", re.I)
+_scalar = (
+    str,
+    int,
+    float,
+    bool,
+    bytes,
+    decimal.Decimal,
+    datetime.date,
+    datetime.time,
+    type(None),
+)
+
+#: int: Incremented by :func:`.invalidate_statement_caches`.
+_generation = 0
+
+_caches: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def invalidate_statement_caches() -> None:
+    """Drop statements prepared on all connections of this worker.
+
+    Notes:
+        Call it after a schema change made from this process. Every
+        connection deallocates its statements the next time it is used.
+        Statements invalidated by a schema change made elsewhere are
+        re-prepared automatically on the first error.
+
+    Returns:
+        None
+    """
+
+    global _generation
+    _generation += 1
+
+
+def get_statement_cache(connection: Connection, max_size: int) -> StatementCache:
+    """Get statement cache of the connection.
+
+    Args:
+        connection: Pooled aiopg connection.
+        max_size: Size of the cache, if it has to be created.
+
+    Returns:
+        Cache bound to the lifetime of ``connection``.
+    """
+
+    cache = _caches.get(connection)
+    if cache is None:
+        cache = _caches[connection] = StatementCache(max_size=max_size)
+    return cache
+
+
+@dataclass(frozen=True)
+class Statement:
+    """Query converted to the syntax of ``PREPARE``.
+
+    Attributes:
+        name: Name of the prepared statement, derived from the query text.
+        sql: Query with ``$n`` placeholders.
+        keys: Names of parameters in ``$n`` order for ``%(name)s`` queries.
+        positional: Number of ``%s`` placeholders.
+    """
+
+    name: str
+    sql: str
+    keys: Tuple[str, ...] = ()
+    positional: int = 0
+
+    @classmethod
+    def compile(cls, operation: str, with_parameters: bool) -> Statement:
+        """Convert psycopg2 placeholders to ``$n`` placeholders.
+
+        Args:
+            operation: Query text as passed to ``cursor.execute``.
+            with_parameters: False if the query is executed without
+                parameters, so ``%`` is not a placeholder in it.
+
+        Examples:
+            ::
+
+                >>> Statement.compile(
+                ...     "select * from users where id = %(id)s or %(id)s is null",
+                ...     with_parameters=True,
+                ... ).sql
+                'select * from users where id = $1 or $1 is null'
+
+        Returns:
+            Compiled statement.
+        """
+
+        digest = hashlib.sha1(f"{with_parameters}:{operation}".encode()).hexdigest()
+        name = f"ps_{digest[:20]}"
+        if not with_parameters:
+            return cls(name=name, sql=operation)
+
+        numbering = _Numbering()
+        sql = _placeholder.sub(numbering, operation)
+        if numbering.keys and numbering.positional:
+            raise ValueError("Named and positional placeholders are mixed.")
+        return cls(
+            name=name,
+            sql=sql,
+            keys=tuple(numbering.keys),
+            positional=numbering.positional,
+        )
+
+    def values(self, parameters: Any) -> List[Any]:
+        """Order parameters as ``$n`` placeholders.
+
+        Args:
+            parameters: Parameters as passed to ``cursor.execute``.
+
+        Returns:
+            Values for ``EXECUTE``.
+        """
+
+        if self.keys:
+            return [parameters[key] for key in self.keys]
+        if self.positional:
+            return list(parameters)
+        return []
+
+
+class _Numbering:
+    """Replacement of psycopg2 placeholders with ``$n`` in ``re.sub``."""
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self.positional = 0
+
+    def __call__(self, match: re.Match) -> str:
+        if match.group(0) == "%%":
+            return "%"
+        if match.group(1) is None:
+            self.positional += 1
+            return f"${self.positional}"
+        if match.group(1) not in self.keys:
+            self.keys.append(match.group(1))
+        return f"${self.keys.index(match.group(1)) + 1}"
+
+
+@functools.lru_cache(maxsize=1024)
+def _named_placeholders(operation: str) -> FrozenSet[str]:
+    return frozenset(name for name in _placeholder.findall(operation) if name)
+
+
+async def _try_prepare(cursor: Cursor, statement: Statement) -> bool:
+    try:
+        await cursor.execute(f"PREPARE {statement.name} AS {statement.sql}")
+    except errors.DuplicatePreparedStatement:
+        pass
+    except psycopg2.Error:
+        return False
+    return True
+
+
+class StatementCache:
+    """Bounded LRU cache of statements prepared on one connection.
+
+    Queries that Postgres refuses to prepare, e.g. ``%(x)s is null`` whose
+    parameter type cannot be inferred without a value, are cached as
+    well, so that they are executed as is without preparing them again.
+
+    Attributes:
+        max_size: Maximum number of prepared statements. The least recently
+            used statement is deallocated when the cache is full.
+        generation: Value of the global generation the cache is valid for.
+    """
+
+    max_size: int
+    generation: int
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.generation = _generation
+        self._statements: OrderedDict[
+            Tuple[str, bool],
+            Optional[Statement],
+        ] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    async def prepare(
+        self,
+        cursor: Cursor,
+        operation: str,
+        with_parameters: bool,
+        in_transaction: bool = False,
+    ) -> Optional[Statement]:
+        """Get prepared statement of the query, preparing it on a miss.
+
+        Args:
+            cursor: Cursor of the connection owning the cache.
+            operation: Query text.
+            with_parameters: See :meth:`.Statement.compile`.
+            in_transaction: True inside an explicit transaction. ``PREPARE``
+                is run in a savepoint then, so that its failure does not
+                abort the transaction.
+
+        Returns:
+            Prepared statement, or None if Postgres cannot prepare the query
+            and it has to be executed as is.
+        """
+
+        if self.generation != _generation:
+            await self.clear(cursor)
+
+        key = (operation, with_parameters)
+        if key in self._statements:
+            self._statements.move_to_end(key)
+            return self._statements[key]
+
+        statement: Optional[Statement] = Statement.compile(operation, with_parameters)
+        if not await self.__prepare(cursor, statement, in_transaction):
+            statement = None
+
+        self._statements[key] = statement
+        if len(self._statements) > self.max_size:
+            _, evicted = self._statements.popitem(last=False)
+            if evicted is not None:
+                await cursor.execute(f"DEALLOCATE {evicted.name}")
+        return statement
+
+    @staticmethod
+    async def __prepare(
+        cursor: Cursor,
+        statement: Statement,
+        in_transaction: bool,
+    ) -> bool:
+        if not in_transaction:
+            return await _try_prepare(cursor, statement)
+
+        await cursor.execute("SAVEPOINT prepare_statement")
+        prepared = await _try_prepare(cursor, statement)
+        if prepared:
+            await cursor.execute("RELEASE SAVEPOINT prepare_statement")
+        else:
+            await cursor.execute("ROLLBACK TO SAVEPOINT prepare_statement")
+        return prepared
+
+    async def forget(
+        self,
+        cursor: Cursor,
+        operation: str,
+        with_parameters: bool,
+    ) -> None:
+        """Deallocate statement of the query if it still exists.
+
+        Args:
+            cursor: Cursor of the connection owning the cache.
+            operation: Query text.
+            with_parameters: See :meth:`.Statement.compile`.
+
+        Returns:
+            None
+        """
+
+        statement = self._statements.pop((operation, with_parameters), None)
+        if statement is None:
+            return
+
+        try:
+            await cursor.execute(f"DEALLOCATE {statement.name}")
+        except errors.InvalidSqlStatementName:
+            pass
+
+    async def clear(self, cursor: Cursor) -> None:
+        """Deallocate all statements of the connection.
+
+        Args:
+            cursor: Cursor of the connection owning the cache.
+
+        Returns:
+            None
+        """
+
+        await cursor.execute("DEALLOCATE ALL")
+        self._statements.clear()
+        self.generation = _generation
+
+
+class PreparedCursor:
+    """Cursor proxy that executes repository queries by prepared name.
+
+    Queries that cannot be prepared (utility statements, several statements
+    in one string, array or composite parameters) are passed to the
+    wrapped cursor as is. All other attributes are taken from the wrapped
+    cursor.
+
+    Attributes:
+        cursor: Wrapped aiopg cursor.
+        cache: Statement cache of the cursor connection.
+    """
+
+    cursor: Cursor
+    cache: StatementCache
+
+    def __init__(self, cursor: Cursor, cache: StatementCache):
+        self.cursor = cursor
+        self.cache = cache
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self.cursor, item)
+
+    async def execute(self, operation: str, parameters: Any = None, **kwargs):
+        """Execute query by prepared name.
+
+        Notes:
+            If the statement disappeared from the session or its result
+            type was changed by a schema change, it is prepared again and
+            the query is retried once. Inside an explicit transaction the
+            error is raised, because the transaction is already aborted.
+
+        Args:
+            operation: Query text.
+            parameters: Query parameters.
+            **kwargs: Keyword arguments of ``cursor.execute``.
+
+        Returns:
+            None
+        """
+
+        if not self.__is_preparable(operation, parameters):
+            return await self.cursor.execute(operation, parameters, **kwargs)
+
+        with_parameters = parameters is not None
+        in_transaction = self.__in_transaction()
+        statement = await self.cache.prepare(
+            self.cursor,
+            operation,
+            with_parameters,
+            in_transaction=in_transaction,
+        )
+        try:
+            return await self.__execute(operation, statement, parameters, **kwargs)
+        except psycopg2.Error as error:
+            if not self.__is_stale(error) or in_transaction:
+                raise
+
+        await self.cache.forget(self.cursor, operation, with_parameters)
+        statement = await self.cache.prepare(self.cursor, operation, with_parameters)
+        return await self.__execute(operation, statement, parameters, **kwargs)
+
+    async def __execute(
+        self,
+        operation: str,
+        statement: Optional[Statement],
+        parameters: Any,
+        **kwargs,
+    ):
+        if statement is None:
+            return await self.cursor.execute(operation, parameters, **kwargs)
+
+        values = statement.values(parameters)
+        if not values:
+            return await self.cursor.execute(f"EXECUTE {statement.name}", **kwargs)
+
+        placeholders = ", ".join(["%s"] * len(values))
+        return await self.cursor.execute(
+            f"EXECUTE {statement.name}({placeholders})",
+            values,
+            **kwargs,
+        )
+
+    def __in_transaction(self) -> bool:
+        return (
+            self.cursor.connection.raw.get_transaction_status()
+            != TRANSACTION_STATUS_IDLE
+        )
+
+    @staticmethod
+    def __is_stale(error: psycopg2.Error) -> bool:
+        if error.pgcode == errorcodes.INVALID_SQL_STATEMENT_NAME:
+            return True
+        return (
+            error.pgcode == errorcodes.FEATURE_NOT_SUPPORTED
+            and "cached plan" in str(error)
+        )
+
+    @staticmethod
+    def __is_preparable(operation: str, parameters: Any) -> bool:
+        if not _preparable.match(operation) or ";" in operation.strip().rstrip(";"):
+            return False
+        if parameters is None:
+            return True
+        if isinstance(parameters, Mapping):
+            names = _named_placeholders(operation)
+            parameters = [parameters[name] for name in parameters if name in names]
+        elif not isinstance(parameters, Sequence):
+            return False
+        return all(isinstance(value, _scalar) for value in parameters)
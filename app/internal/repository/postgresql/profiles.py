@@ -1,78 +1,162 @@
 """Репозиторий для профиля."""
-from typing import List
+from typing import List, Optional, Union
 
-from app.internal.repository.postgresql.connection import get_connection
+from psycopg2.extras import RealDictRow
+
+from app.internal.repository.postgresql import compiler
+from app.internal.repository.postgresql.compiler import Table
+from app.internal.repository.postgresql.connection import Intent, get_connection
 from app.internal.repository.postgresql.handlers.collect_response import (
     collect_response,
 )
 from app.internal.repository.repository import Repository
 from app.pkg import models
+from app.pkg.models.base import Partial
+from app.pkg.models.exceptions.repository import VersionConflict
 
 __all__ = ["ProfileRepository"]
 
+#: Table: Таблица профилей, строки версионируются.
+PROFILES = Table("profiles", models.Profile, version="version")
+
+
+async def _read_unchanged(
+    cur,
+    cmd: Union[models.UpdateProfileCommand, models.PatchProfileCommand],
+) -> Optional[RealDictRow]:
+    """Читает профиль, который не был обновлен командой.
+
+    Args:
+        cur: Курсор соединения, на котором выполнялось обновление.
+        cmd: Команда обновления с версией, которую изменял клиент.
+
+    Raises:
+        VersionConflict: Профиль изменен другим запросом, в исключении
+         передается его текущее состояние.
+
+    Returns:
+        Текущий профиль, если версия совпадает, или None, если профиля нет.
+    """
+    await cur.execute(compiler.select(PROFILES, where=("user_id",)), cmd.to_dict())
+    profile = await cur.fetchone()
+    if profile is not None and profile["version"] != cmd.version:
+        raise VersionConflict(current=models.Profile.from_trusted(profile))
+    return profile
+
 
 class ProfileRepository(Repository):
     """Реализация репозитория профиля."""
 
     @collect_response
     async def create(self, cmd: models.CreateProfileCommand) -> models.Profile:
-        q = """
-            insert into profiles(
-                user_id, first_name, last_name, telegram, bio
-                ) values (
-                    %(user_id)s, %(first_name)s, %(last_name)s, %(telegram)s, %(bio)s
-                )
-                returning id, user_id, first_name, last_name, telegram, bio
-            """
-        async with get_connection() as cur:
+        q = compiler.insert(PROFILES, models.CreateProfileCommand)
+        async with get_connection(intent=Intent.WRITE) as cur:
             await cur.execute(q, cmd.to_dict())
             return await cur.fetchone()
 
     @collect_response
-    async def read(self, query: models.ReadProfileQuery) -> models.Profile:
-        q = """
-            select
-                id , user_id, first_name, last_name, telegram, bio
-            from profiles
-            where user_id = %(user_id)s
-            """
-        async with get_connection() as cur:
-            await cur.execute(q, query.to_dict())
+    async def read(self, query: models.ReadProfileQuery) -> Partial[models.Profile]:
+        q = compiler.select(PROFILES, where=("user_id",), fields=query.fields)
+        async with get_connection(intent=Intent.READ) as cur:
+            await cur.execute(q, query.to_dict(exclude={"fields"}))
             return await cur.fetchone()
 
+    async def read_many(
+        self,
+        query: models.ReadProfilesQuery,
+    ) -> List[Partial[models.Profile]]:
+        """Читает существующие профили из списка пользователей.
+
+        Notes:
+            Профили, которых нет, пропускаются. Для пустого списка запрос
+            не выполняется.
+        """
+        if not query.user_ids:
+            return []
+        return await self._read_many(query)
+
+    @collect_response
+    async def _read_many(
+        self,
+        query: models.ReadProfilesQuery,
+    ) -> List[Partial[models.Profile]]:
+        q = compiler.select(PROFILES, fields=query.fields)
+        async with get_connection(intent=Intent.READ) as cur:
+            await cur.execute(
+                f"{q} where user_id = any(%(user_ids)s::uuid[])",
+                query.to_dict(exclude={"fields"}),
+            )
+            return await cur.fetchall()
+
     @collect_response
-    async def read_all(self) -> List[models.Profile]:
-        q = """
-             select
-                id , user_id, first_name, last_name, telegram, bio
-            from profiles
-            """
-        async with get_connection() as cur:
+    async def read_all(
+        self,
+        query: Optional[models.ReadAllProfilesQuery] = None,
+    ) -> List[Partial[models.ProfileRow]]:
+        q = compiler.select(PROFILES, fields=query.fields if query else None)
+        async with get_connection(intent=Intent.READ) as cur:
             await cur.execute(q)
             return await cur.fetchall()
 
     @collect_response
     async def update(self, cmd: models.UpdateProfileCommand) -> models.Profile:
-        q = """
-            update profiles
-            set
-                first_name = %(first_name)s,
-                last_name = %(last_name)s,
-                bio = %(bio)s
-            where user_id = %(user_id)s
-            returning id, user_id, first_name, last_name, telegram, bio
-            """
-        async with get_connection() as cur:
+        """Обновляет имя, фамилию и биографию профиля.
+
+        Notes:
+            Строка не перезаписывается, если значения полей не изменились,
+            тогда возвращается текущий профиль с версией из команды.
+
+        Raises:
+            VersionConflict: Профиль изменен после чтения клиентом.
+        """
+        q = compiler.update(
+            PROFILES,
+            values=("first_name", "last_name", "bio"),
+            where=("user_id",),
+            only_changed=True,
+        )
+        async with get_connection(intent=Intent.WRITE) as cur:
             await cur.execute(q, cmd.to_dict())
-            return await cur.fetchone()
+            profile = await cur.fetchone()
+            if profile is None:
+                profile = await _read_unchanged(cur, cmd)
+            return profile
+
+    @collect_response
+    async def patch(self, cmd: models.PatchProfileCommand) -> models.Profile:
+        """Обновляет только переданные поля профиля.
+
+        Notes:
+            Строка не перезаписывается, если значения полей не изменились,
+            тогда возвращается текущий профиль с версией из команды.
+            Вариант запроса кешируется для каждого набора полей.
+
+        Raises:
+            VersionConflict: Профиль изменен после чтения клиентом.
+        """
+        values = tuple(
+            name
+            for name in cmd.__fields__
+            if name in cmd.__fields_set__ and name not in ("user_id", "version")
+        )
+        async with get_connection(intent=Intent.WRITE) as cur:
+            if values:
+                q = compiler.update(
+                    PROFILES,
+                    values=values,
+                    where=("user_id",),
+                    only_changed=True,
+                )
+                await cur.execute(q, cmd.to_dict())
+                profile = await cur.fetchone()
+                if profile is not None:
+                    return profile
+
+            return await _read_unchanged(cur, cmd)
 
     @collect_response
     async def delete(self, cmd: models.DeleteProfileCommand) -> models.Profile:
-        q = """
-            delete from profiles
-            where user_id = %(user_id)s
-            returning id, user_id, first_name, last_name, telegram, bio
-            """
-        async with get_connection() as cur:
+        q = compiler.delete(PROFILES, where=("user_id",))
+        async with get_connection(intent=Intent.WRITE) as cur:
             await cur.execute(q, cmd.to_dict())
             return await cur.fetchone()
@@ -0,0 +1,393 @@
+"""Profiling of repository queries.
+
+:func:`app.internal.repository.postgresql.handlers.handle_exception` runs
+every repository call in a :class:`.QueryProfile`. The profile collects
+statements of the call, number of affected rows and time spent waiting
+for a pool connection, and :data:`.profiler` passes it to its hooks when
+the call is done. The default hooks record metrics of all calls, annotate
+the span of the call and log calls slower than
+``POSTGRES__PROFILING__SLOW_QUERY_THRESHOLD`` seconds.
+A sample of slow statements is logged with its ``EXPLAIN ANALYZE`` plan.
+
+Warnings:
+    ``EXPLAIN ANALYZE`` executes the statement once more. It runs inside
+    a transaction that is always rolled back, on a separate connection of
+    the pool, one statement at a time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import contextvars
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, List, Mapping, Optional, Tuple
+
+import psycopg2
+from aiopg import Pool
+from psycopg2.extensions import cursor  # type: ignore
+
+from app.pkg.logger import get_logger
+from app.pkg.metrics import Counter, Histogram
+from app.pkg.models.exceptions.repository import EmptyResult
+from app.pkg.settings import settings
+from app.pkg.tracing import current_span
+
+__all__ = [
+    "QueryProfile",
+    "QueryProfiler",
+    "ProfiledCursor",
+    "current_profile",
+    "profiler",
+    "redact",
+]
+
+logger = get_logger(__name__)
+
+QUERY_SECONDS = Histogram(
+    "db_query_seconds",
+    "Duration of repository calls, including pool wait and parsing.",
+    labelnames=("query",),
+)
+QUERY_POOL_WAIT_SECONDS = Histogram(
+    "db_query_pool_wait_seconds",
+    "Time repository calls waited for a pool connection.",
+    labelnames=("query",),
+)
+QUERY_ROWS = Counter(
+    "db_query_rows_total",
+    "Rows returned or affected by repository calls.",
+    labelnames=("query",),
+)
+QUERY_ERRORS = Counter(
+    "db_query_errors_total",
+    "Repository calls that raised an exception.",
+    labelnames=("query",),
+)
+SLOW_QUERIES = Counter(
+    "db_slow_queries_total",
+    "Repository calls slower than the slow query threshold.",
+    labelnames=("query",),
+)
+
+#: re.Pattern: Names of parameters whose values are never logged.
+_secret = re.compile(r"password|secret|token|key|hash", re.IGNORECASE)
+
+#: int: Maximum length of a logged parameter value.
+_MAX_VALUE_LENGTH = 100
+
+#: Tuple[type, ...]: Positional parameters of these types are logged as is.
+_loggable = (bool, int, float, type(None))
+
+#: ContextVar: Profile of the innermost running repository call.
+_profile: contextvars.ContextVar[Optional[QueryProfile]] = contextvars.ContextVar(
+    "query_profile",
+    default=None,
+)
+
+
+@dataclass
+class QueryProfile:
+    """Measurements of one repository call.
+
+    Attributes:
+        name: Qualified name of the repository method.
+        duration: Duration of the call in seconds.
+        pool_wait: Time spent waiting for pool connections in seconds.
+        rows: Number of rows returned or affected by the statements.
+        statements: Executed statements with their parameters.
+        pool: Pool of the last acquired connection, used to explain slow
+            statements. None if the call ran on a bound connection.
+        error: Exception raised by the call, None if the call succeeded
+            or found nothing.
+    """
+
+    name: str
+    duration: float = 0.0
+    pool_wait: float = 0.0
+    rows: int = 0
+    statements: List[Tuple[str, Any]] = field(default_factory=list)
+    pool: Optional[Pool] = None
+    error: Optional[BaseException] = None
+
+
+def current_profile() -> Optional[QueryProfile]:
+    """Get profile of the running repository call.
+
+    Returns:
+        Profile, None outside of repository calls or if profiling is
+        disabled.
+    """
+
+    return _profile.get()
+
+
+class ProfiledCursor:
+    """Cursor proxy that records executed statements in a profile.
+
+    Attributes:
+        cursor: Wrapped cursor.
+        profile: Profile of the repository call.
+    """
+
+    cursor: Any
+    profile: QueryProfile
+
+    def __init__(self, cur: Any, profile: QueryProfile):
+        self.cursor = cur
+        self.profile = profile
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self.cursor, item)
+
+    async def execute(self, operation: str, parameters: Any = None, **kwargs):
+        """Execute statement and record it with its row count.
+
+        Args:
+            operation: Query text.
+            parameters: Query parameters.
+            **kwargs: Keyword arguments of ``cursor.execute``.
+
+        Returns:
+            None
+        """
+
+        self.profile.statements.append((operation, parameters))
+        result = await self.cursor.execute(operation, parameters, **kwargs)
+        if self.cursor.rowcount > 0:
+            self.profile.rows += self.cursor.rowcount
+        return result
+
+
+class QueryProfiler:
+    """Profile repository calls and pass the profiles to hooks.
+
+    Attributes:
+        enabled: Profile calls, else :meth:`.profile` only yields.
+        slow_threshold: Duration in seconds from which a call is slow.
+        explain_rate: Share of slow calls whose first statement is
+            explained, from 0 to 1.
+        explain_timeout: ``statement_timeout`` of explained statements
+            in seconds.
+        hooks: Functions called with the profile of every call.
+    """
+
+    enabled: bool
+    slow_threshold: float
+    explain_rate: float
+    explain_timeout: float
+    hooks: List[Callable[[QueryProfile], None]]
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        slow_threshold: float = 0.5,
+        explain_rate: float = 0.0,
+        explain_timeout: float = 5.0,
+    ):
+        self.enabled = enabled
+        self.slow_threshold = slow_threshold
+        self.explain_rate = explain_rate
+        self.explain_timeout = explain_timeout
+        self.hooks = [self.record_metrics, self.annotate_span, self.log_slow]
+        self._explaining: Optional[asyncio.Task] = None
+
+    def add_hook(self, hook: Callable[[QueryProfile], None]) -> None:
+        """Call ``hook`` with the profile of every repository call.
+
+        Args:
+            hook: Function that must not raise and must not block.
+
+        Returns:
+            None
+        """
+
+        self.hooks.append(hook)
+
+    @contextlib.contextmanager
+    def profile(self, name: str) -> Iterator[Optional[QueryProfile]]:
+        """Profile the repository call of the block.
+
+        Args:
+            name: Qualified name of the repository method.
+
+        Returns:
+            Profile of the call, None if profiling is disabled.
+        """
+
+        if not self.enabled:
+            yield None
+            return
+
+        profile = QueryProfile(name=name)
+        token = _profile.set(profile)
+        started = time.perf_counter()
+        try:
+            yield profile
+        except EmptyResult:
+            raise
+        except BaseException as error:
+            profile.error = error
+            raise
+        finally:
+            profile.duration = time.perf_counter() - started
+            _profile.reset(token)
+            for hook in self.hooks:
+                try:
+                    hook(profile)
+                except Exception as error:  # pylint: disable=broad-except
+                    logger.error("Query profiling hook failed: %s", error)
+
+    @staticmethod
+    def record_metrics(profile: QueryProfile) -> None:
+        """Record the profile in query metrics.
+
+        Args:
+            profile: Profile of a finished call.
+
+        Returns:
+            None
+        """
+
+        QUERY_SECONDS.observe(profile.duration, query=profile.name)
+        QUERY_POOL_WAIT_SECONDS.observe(profile.pool_wait, query=profile.name)
+        if profile.rows:
+            QUERY_ROWS.inc(profile.rows, query=profile.name)
+        if profile.error is not None:
+            QUERY_ERRORS.inc(query=profile.name)
+
+    @staticmethod
+    def annotate_span(profile: QueryProfile) -> None:
+        """Add measurements of the profile to the span of the call.
+
+        Args:
+            profile: Profile of a finished call.
+
+        Returns:
+            None
+        """
+
+        span = current_span()
+        if not span.recording:
+            return
+        span.set_attribute("db.rows", profile.rows)
+        span.set_attribute("db.pool_wait", profile.pool_wait)
+        if profile.statements:
+            span.set_attribute(
+                "db.statement",
+                " ".join(profile.statements[-1][0].split()),
+            )
+
+    def log_slow(self, profile: QueryProfile) -> None:
+        """Log the profile if the call was slow and explain a sample.
+
+        Args:
+            profile: Profile of a finished call.
+
+        Returns:
+            None
+        """
+
+        if profile.duration < self.slow_threshold:
+            return
+
+        SLOW_QUERIES.inc(query=profile.name)
+        logger.warning(
+            "Slow query %s: %.3fs, pool wait %.3fs, %d rows, statements: %s",
+            profile.name,
+            profile.duration,
+            profile.pool_wait,
+            profile.rows,
+            [
+                (" ".join(operation.split()), redact(parameters))
+                for operation, parameters in profile.statements
+            ],
+        )
+
+        if (
+            profile.pool is None
+            or not profile.statements
+            or random.random() >= self.explain_rate
+            or (self._explaining is not None and not self._explaining.done())
+        ):
+            return
+
+        operation, parameters = profile.statements[0]
+        # Without context of the request: no deadline, profile or
+        # cancellation of the request applies to the explain.
+        self._explaining = contextvars.Context().run(
+            asyncio.ensure_future,
+            self.__explain(profile.name, profile.pool, operation, parameters),
+        )
+
+    async def __explain(
+        self,
+        name: str,
+        pool: Pool,
+        operation: str,
+        parameters: Any,
+    ) -> None:
+        try:
+            async with pool.acquire() as conn:
+                async with conn.cursor(cursor_factory=cursor) as cur:
+                    await cur.execute("BEGIN")
+                    try:
+                        await cur.execute(
+                            "SET LOCAL statement_timeout = %s",
+                            (int(self.explain_timeout * 1000),),
+                        )
+                        await cur.execute(
+                            f"EXPLAIN (ANALYZE, BUFFERS) {operation}",
+                            parameters,
+                        )
+                        plan = "\n".join(row[0] for row in await cur.fetchall())
+                    finally:
+                        await cur.execute("ROLLBACK")
+        except (psycopg2.Error, OSError, asyncio.TimeoutError) as error:
+            logger.warning("Failed to explain slow query %s: %s", name, error)
+            return
+
+        logger.warning("Plan of slow query %s:\n%s", name, plan)
+
+
+def redact(parameters: Any) -> Any:
+    """Prepare query parameters for logs.
+
+    Values of named parameters that look like secrets are replaced with
+    ``***``, positional strings and other values of unknown meaning too.
+    Long values are truncated.
+
+    Args:
+        parameters: Parameters passed to ``cursor.execute``.
+
+    Returns:
+        Parameters safe to log.
+    """
+
+    if parameters is None:
+        return None
+    if isinstance(parameters, Mapping):
+        return {
+            key: "***" if _secret.search(str(key)) else _truncate(value)
+            for key, value in parameters.items()
+        }
+    return [value if isinstance(value, _loggable) else "***" for value in parameters]
+
+
+def _truncate(value: Any) -> str:
+    text = repr(value)
+    if len(text) > _MAX_VALUE_LENGTH:
+        return text[: _MAX_VALUE_LENGTH - 3] + "..."
+    return text
+
+
+#: QueryProfiler: Profiler of repository calls.
+profiler = QueryProfiler(
+    enabled=settings.POSTGRES.PROFILING.ENABLED,
+    slow_threshold=settings.POSTGRES.PROFILING.SLOW_QUERY_THRESHOLD,
+    explain_rate=settings.POSTGRES.PROFILING.EXPLAIN_SAMPLE_RATE,
+    explain_timeout=settings.POSTGRES.PROFILING.EXPLAIN_TIMEOUT,
+)
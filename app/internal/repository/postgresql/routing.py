@@ -0,0 +1,232 @@
+"""Routing of repository queries between the primary and a read replica.
+
+Writes always go to the primary. Reads go to the replica while it is
+healthy and its replication lag is below ``POSTGRES__REPLICA_MAX_LAG``,
+except for sessions that wrote recently: their reads stay on the primary
+for ``POSTGRES__READ_YOUR_WRITES_WINDOW`` seconds, so users see their own
+changes.
+
+Warnings:
+    Recent writes are remembered in memory of the worker. A read served by
+    another worker right after a write may still see the replica state.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import enum
+import math
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Optional
+
+import psycopg2
+from aiopg import Pool
+
+from app.pkg.logger import get_logger
+from app.pkg.settings import settings
+from app.pkg.utils.tasks import create_detached_task
+
+__all__ = ["Intent", "ReplicaRouter", "bind_session", "router"]
+
+logger = get_logger(__name__)
+
+#: ContextVar: Key of the client the current request belongs to.
+_session: ContextVar[Optional[str]] = ContextVar("session", default=None)
+
+#: ContextVar: True if the current request already wrote to the primary.
+_wrote: ContextVar[bool] = ContextVar("wrote", default=False)
+
+#: int: Maximum number of remembered sessions that wrote recently.
+_MAX_SESSIONS = 100_000
+
+
+class Intent(str, enum.Enum):
+    """Intent of a connection requested from :func:`.get_connection`."""
+
+    READ = "read"
+    WRITE = "write"
+
+
+def bind_session(key: object) -> None:
+    """Bind the current request to a client for read-your-writes.
+
+    Args:
+        key: Stable key of the client, e.g. id of the authorized user.
+
+    Returns:
+        None
+    """
+
+    _session.set(str(key))
+
+
+class ReplicaRouter:
+    """Choose the pool a repository query is executed on.
+
+    Attributes:
+        max_lag: Maximum replication lag in seconds for reads on the replica.
+        sticky_for: Number of seconds reads of a session stay on the primary
+            after its write.
+        check_interval: Minimum number of seconds between health checks of
+            the replica.
+        check_timeout: Number of seconds after which a health check fails.
+        healthy: Result of the last health check.
+        lag: Replication lag in seconds measured by the last health check.
+    """
+
+    max_lag: float
+    sticky_for: float
+    check_interval: float
+    check_timeout: float
+    healthy: bool
+    lag: float
+
+    def __init__(
+        self,
+        max_lag: float,
+        sticky_for: float,
+        check_interval: float,
+        check_timeout: float = 1.0,
+    ):
+        self.max_lag = max_lag
+        self.sticky_for = sticky_for
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self.healthy = False
+        self.lag = math.inf
+
+        self._checked_at = -math.inf
+        self._checking = False
+        self._check_task: Optional[asyncio.Task] = None
+        self._written: OrderedDict[str, float] = OrderedDict()
+
+    def record_write(self) -> None:
+        """Keep following reads of the request and its session on the
+        primary.
+
+        Returns:
+            None
+        """
+
+        _wrote.set(True)
+        session = _session.get()
+        if session is None or not self.sticky_for:
+            return
+
+        now = time.monotonic()
+        self._written[session] = now + self.sticky_for
+        self._written.move_to_end(session)
+        while self._written and (
+            len(self._written) > _MAX_SESSIONS
+            or next(iter(self._written.values())) <= now
+        ):
+            self._written.popitem(last=False)
+
+    def is_sticky(self) -> bool:
+        """Check whether reads of the current request must see its writes.
+
+        Returns:
+            True if the request or its session wrote recently.
+        """
+
+        if _wrote.get():
+            return True
+        session = _session.get()
+        if session is None:
+            return False
+        return self._written.get(session, -math.inf) > time.monotonic()
+
+    async def route_read(self, primary: Pool, replica: Optional[Pool]) -> Pool:
+        """Choose pool for a read.
+
+        Notes:
+            The read never waits for a health check. Once ``check_interval``
+            has passed, the next check runs in a background task, and
+            reads use the result of the last finished one. Until the first
+            check finishes, reads go to the primary.
+
+        Args:
+            primary: Pool of the primary.
+            replica: Pool of the replica, None if it is not configured.
+
+        Returns:
+            Pool of the replica if it can serve the read, else the primary.
+        """
+
+        if replica is None or self.is_sticky():
+            return primary
+
+        if (
+            not self._checking
+            and time.monotonic() - self._checked_at >= self.check_interval
+        ):
+            self._checking = True
+            self._check_task = create_detached_task(self.check(replica))
+
+        if self.healthy and self.lag <= self.max_lag:
+            return replica
+        return primary
+
+    async def check(self, replica: Pool) -> None:
+        """Measure availability and replication lag of the replica.
+
+        Notes:
+            Lag is zero while the replica replayed everything it received,
+            so an idle primary does not make the replica look stale.
+
+        Args:
+            replica: Pool of the replica.
+
+        Returns:
+            None
+        """
+
+        q = """
+            select coalesce(
+                case
+                    when pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+                        then 0
+                    else extract(epoch from now() - pg_last_xact_replay_timestamp())
+                end,
+                0
+            )
+            """
+
+        self._checking = True
+        try:
+            lag = await asyncio.wait_for(
+                self.__fetch_lag(replica, q),
+                timeout=self.check_timeout,
+            )
+        except (psycopg2.Error, OSError, asyncio.TimeoutError) as error:
+            if self.healthy:
+                logger.warning(
+                    "Replica is unavailable, reading from primary: %s",
+                    error,
+                )
+            self.healthy, self.lag = False, math.inf
+        else:
+            if self.healthy and lag > self.max_lag:
+                logger.warning("Replica lags %.3fs, reading from primary.", lag)
+            self.healthy, self.lag = True, lag
+        finally:
+            self._checked_at = time.monotonic()
+            self._checking = False
+
+    @staticmethod
+    async def __fetch_lag(replica: Pool, q: str) -> float:
+        async with replica.acquire() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(q)
+                (lag,) = await cur.fetchone()
+                return float(lag)
+
+
+#: ReplicaRouter: Router used by :func:`.get_connection`.
+router = ReplicaRouter(
+    max_lag=settings.POSTGRES.REPLICA_MAX_LAG,
+    sticky_for=settings.POSTGRES.READ_YOUR_WRITES_WINDOW,
+    check_interval=settings.POSTGRES.REPLICA_CHECK_INTERVAL,
+)
@@ -0,0 +1,41 @@
+"""Репозиторий для сохраненных поисков."""
+from typing import List
+
+from app.internal.repository.postgresql import compiler
+from app.internal.repository.postgresql.compiler import Table
+from app.internal.repository.postgresql.connection import Intent, get_connection
+from app.internal.repository.postgresql.handlers.collect_response import (
+    collect_response,
+)
+from app.internal.repository.repository import Repository
+from app.pkg import models
+
+__all__ = ["SavedSearchRepository"]
+
+#: Table: Таблица сохраненных поисков.
+SAVED_SEARCHES = Table("saved_searches", models.SavedSearch)
+
+
+class SavedSearchRepository(Repository):
+    """Реализация репозитория сохраненных поисков."""
+
+    @collect_response
+    async def create(self, cmd: models.CreateSavedSearchCommand) -> models.SavedSearch:
+        q = compiler.insert(SAVED_SEARCHES, models.CreateSavedSearchCommand)
+        async with get_connection(intent=Intent.WRITE) as cur:
+            await cur.execute(q, cmd.to_dict())
+            return await cur.fetchone()
+
+    @collect_response
+    async def read_all(self) -> List[models.SavedSearch]:
+        q = compiler.select(SAVED_SEARCHES)
+        async with get_connection(intent=Intent.READ) as cur:
+            await cur.execute(q)
+            return await cur.fetchall()
+
+    @collect_response
+    async def delete(self, cmd: models.DeleteSavedSearchCommand) -> models.SavedSearch:
+        q = compiler.delete(SAVED_SEARCHES, where=("id", "user_id"))
+        async with get_connection(intent=Intent.WRITE) as cur:
+            await cur.execute(q, cmd.to_dict())
+            return await cur.fetchone()
@@ -1,6 +1,8 @@
 """Репозиторий для пользователя."""
 
-from app.internal.repository.postgresql.connection import get_connection
+from app.internal.repository.postgresql import compiler
+from app.internal.repository.postgresql.compiler import Table
+from app.internal.repository.postgresql.connection import Intent, get_connection
 from app.internal.repository.postgresql.handlers.collect_response import (
     collect_response,
 )
@@ -9,33 +11,24 @@ from app.pkg import models
 
 __all__ = ["UserRepository"]
 
+#: Table: Таблица пользователей.
+USERS = Table("users", models.User, version="version")
+
 
 class UserRepository(Repository):
     """Реализация репозитория пользователя."""
 
     @collect_response
     async def create(self, cmd: models.AuthorizeUserCommand) -> models.User:
-        q = """
-            insert into users(
-                email, password
-            ) values (
-                %(email)s, %(password)s
-            )
-            returning id, email, password, is_activated
-        """
-        async with get_connection() as cur:
+        q = compiler.insert(USERS, models.AuthorizeUserCommand)
+        async with get_connection(intent=Intent.WRITE) as cur:
             await cur.execute(q, cmd.to_dict())
             return await cur.fetchone()
 
     @collect_response
     async def read(self, query: models.ReadUserQuery) -> models.User:
-        q = """
-            select
-                id, email, password, is_activated
-            from users
-            where id = %(id)s
-        """
-        async with get_connection() as cur:
+        q = compiler.select(USERS, where=("id",))
+        async with get_connection(intent=Intent.READ) as cur:
             await cur.execute(q, query.to_dict())
             return await cur.fetchone()
 
@@ -43,13 +36,7 @@ class UserRepository(Repository):
     async def read_email_password(
         self, cmd: models.AuthorizeUserCommand
     ) -> models.User:
-        q = """
-            select
-                id, email, password, is_activated
-            from users
-            where email = %(email)s
-            and password = %(password)s
-            """
-        async with get_connection() as cur:
+        q = compiler.select(USERS, where=("email", "password"))
+        async with get_connection(intent=Intent.READ) as cur:
             await cur.execute(q, cmd.to_dict())
             return await cur.fetchone()
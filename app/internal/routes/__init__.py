@@ -13,6 +13,9 @@ __all__ = [
     "user_router",
     "auth_router",
     "profile_router",
+    "saved_search_router",
+    "metrics_router",
+    "health_router",
 ]
 
 user_router = APIRouter(
@@ -27,10 +30,19 @@ auth_router = APIRouter(prefix="/v1/auth", tags=["Auth"])
 
 profile_router = APIRouter(prefix="/v1/profile", tags=["Profile"])
 
+saved_search_router = APIRouter(prefix="/v1/saved-search", tags=["Saved search"])
+
+metrics_router = APIRouter(tags=["Metrics"])
+
+health_router = APIRouter(tags=["Health"])
+
 __routes__ = Routes(
     routers=(
         user_router,
         auth_router,
         profile_router,
+        saved_search_router,
+        metrics_router,
+        health_router,
     ),
 )
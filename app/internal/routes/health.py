@@ -0,0 +1,20 @@
+"""Routes for health module."""
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+
+from app.internal.routes import health_router
+
+
+@health_router.get(
+    "/ready",
+    include_in_schema=False,
+    description="Readiness of the server to receive traffic.",
+)
+async def read_readiness(request: Request):
+    if getattr(request.app.state, "ready", False):
+        return JSONResponse({"ready": True}, status_code=status.HTTP_200_OK)
+    return JSONResponse(
+        {"ready": False},
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
@@ -0,0 +1,29 @@
+"""Routes for metrics module."""
+
+import typing
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import Depends
+from fastapi.responses import PlainTextResponse
+
+from app.internal.routes import metrics_router
+from app.internal.services import Services
+from app.pkg.metrics import MultiProcessExporter, registry
+
+
+@metrics_router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+    description="Metrics in the Prometheus text format.",
+)
+@inject
+async def read_metrics(
+    exporter: typing.Optional[MultiProcessExporter] = Depends(
+        Provide[Services.metrics_exporter]
+    ),
+):
+    return PlainTextResponse(
+        registry.render() if exporter is None else exporter.render(),
+        media_type="text/plain; version=0.0.4",
+    )
@@ -7,9 +7,11 @@ from dependency_injector.wiring import Provide, inject
 from fastapi import Depends
 from starlette import status
 
+from app.internal.pkg.responses import ModelResponse
 from app.internal.routes import profile_router
 from app.internal.services import ProfileService, Services
 from app.pkg import models
+from app.pkg.models.exceptions.repository import VersionConflict
 
 
 @profile_router.post(
@@ -42,12 +44,14 @@ async def create_profile(
 @profile_router.get(
     "/{user_id:uuid}",
     status_code=status.HTTP_200_OK,
-    description="Get profile user.",
+    response_model=models.Profile,
+    description="Get profile user, only the requested fields if any.",
 )
 @inject
 async def read_profile(
     response: fastapi.Response,
     user_id: uuid.UUID,
+    fields: typing.Optional[models.ProfileFields] = fastapi.Query(None),
     profile_service: ProfileService = Depends(Provide[Services.profile_service]),
     access_token_from_cookie: typing.Optional[str] = fastapi.Cookie(
         None, alias="access_token"
@@ -59,17 +63,53 @@ async def read_profile(
         None, alias="Authorization"
     ),
 ):
-    return await profile_service.read_profile(
-        query=models.ReadProfileQuery(user_id=user_id),
+    profile = await profile_service.read_profile(
+        query=models.ReadProfileQuery(user_id=user_id, fields=fields),
         response=response,
         access_token_from_cookie=access_token_from_cookie,
         refresh_token_from_cookie=refresh_token_from_cookie,
         access_token_from_header=access_token_from_header,
     )
+    return ModelResponse(profile, response=response)
+
+
+@profile_router.get(
+    "/{user_id:uuid}/recommendations/",
+    status_code=status.HTTP_200_OK,
+    response_model=typing.List[models.ProfileRecommendation],
+    description="Get profiles similar to the user profile.",
+)
+@inject
+async def read_recommendations(
+    response: fastapi.Response,
+    user_id: uuid.UUID,
+    limit: int = fastapi.Query(10, ge=1, le=100),
+    profile_service: ProfileService = Depends(Provide[Services.profile_service]),
+    access_token_from_cookie: typing.Optional[str] = fastapi.Cookie(
+        None, alias="access_token"
+    ),
+    refresh_token_from_cookie: typing.Optional[str] = fastapi.Cookie(
+        None, alias="refresh_token"
+    ),
+    access_token_from_header: typing.Optional[str] = fastapi.Header(
+        None, alias="Authorization"
+    ),
+):
+    recommendations = await profile_service.read_recommendations(
+        query=models.ReadProfileRecommendationsQuery(user_id=user_id, limit=limit),
+        response=response,
+        access_token_from_cookie=access_token_from_cookie,
+        refresh_token_from_cookie=refresh_token_from_cookie,
+        access_token_from_header=access_token_from_header,
+    )
+    return ModelResponse(recommendations, response=response)
 
 
 @profile_router.put(
-    "/", status_code=status.HTTP_200_OK, description="Update profile user."
+    "/",
+    status_code=status.HTTP_200_OK,
+    description="Update profile user.",
+    responses=VersionConflict.generate_openapi(),
 )
 @inject
 async def update_profile(
@@ -95,6 +135,38 @@ async def update_profile(
     )
 
 
+@profile_router.patch(
+    "/",
+    status_code=status.HTTP_200_OK,
+    response_model=models.Profile,
+    description="Update only the given fields of the profile user.",
+    responses=VersionConflict.generate_openapi(),
+)
+@inject
+async def patch_profile(
+    response: fastapi.Response,
+    cmd: models.PatchProfileCommand,
+    profile_service: ProfileService = Depends(Provide[Services.profile_service]),
+    access_token_from_cookie: typing.Optional[str] = fastapi.Cookie(
+        None, alias="access_token"
+    ),
+    refresh_token_from_cookie: typing.Optional[str] = fastapi.Cookie(
+        None, alias="refresh_token"
+    ),
+    access_token_from_header: typing.Optional[str] = fastapi.Header(
+        None, alias="Authorization"
+    ),
+):
+    profile = await profile_service.patch_profile(
+        cmd=cmd,
+        response=response,
+        access_token_from_cookie=access_token_from_cookie,
+        refresh_token_from_cookie=refresh_token_from_cookie,
+        access_token_from_header=access_token_from_header,
+    )
+    return ModelResponse(profile, response=response)
+
+
 @profile_router.delete(
     "/{user_id:uuid}/", status_code=status.HTTP_200_OK, description="Delete profile."
 )
@@ -125,10 +197,15 @@ async def delete_profile(
 @profile_router.get(
     "/",
     status_code=status.HTTP_200_OK,
-    description="Get all profile",
+    response_model=typing.List[models.Profile],
+    description="Get all profile, only the requested fields if any.",
 )
 @inject
 async def read_all(
+    fields: typing.Optional[models.ProfileFields] = fastapi.Query(None),
     profile_service: ProfileService = Depends(Provide[Services.profile_service]),
 ):
-    return await profile_service.read_all_profile()
+    profiles = await profile_service.read_all_profile(
+        query=models.ReadAllProfilesQuery(fields=fields),
+    )
+    return ModelResponse(profiles)
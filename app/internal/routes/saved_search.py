@@ -0,0 +1,112 @@
+"""Routes for saved search module."""
+import typing
+import uuid
+
+import fastapi
+from dependency_injector.wiring import Provide, inject
+from fastapi import Depends
+from starlette import status
+
+from app.internal.pkg.responses import ModelResponse
+from app.internal.routes import saved_search_router
+from app.internal.services import SavedSearchService, Services
+from app.pkg import models
+
+
+@saved_search_router.post(
+    "/",
+    status_code=status.HTTP_201_CREATED,
+    response_model=models.SavedSearch,
+    description="Save search and get notified about new matching profiles.",
+)
+@inject
+async def create_saved_search(
+    response: fastapi.Response,
+    cmd: models.CreateSavedSearchCommand,
+    saved_search_service: SavedSearchService = Depends(
+        Provide[Services.saved_search_service]
+    ),
+    access_token_from_cookie: typing.Optional[str] = fastapi.Cookie(
+        None, alias="access_token"
+    ),
+    refresh_token_from_cookie: typing.Optional[str] = fastapi.Cookie(
+        None, alias="refresh_token"
+    ),
+    access_token_from_header: typing.Optional[str] = fastapi.Header(
+        None, alias="Authorization"
+    ),
+):
+    return await saved_search_service.create_saved_search(
+        response=response,
+        cmd=cmd,
+        access_token_from_cookie=access_token_from_cookie,
+        refresh_token_from_cookie=refresh_token_from_cookie,
+        access_token_from_header=access_token_from_header,
+    )
+
+
+@saved_search_router.delete(
+    "/{user_id:uuid}/{saved_search_id:int}/",
+    status_code=status.HTTP_200_OK,
+    response_model=models.SavedSearch,
+    description="Delete saved search.",
+)
+@inject
+async def delete_saved_search(
+    response: fastapi.Response,
+    user_id: uuid.UUID,
+    saved_search_id: int,
+    saved_search_service: SavedSearchService = Depends(
+        Provide[Services.saved_search_service]
+    ),
+    access_token_from_cookie: typing.Optional[str] = fastapi.Cookie(
+        None, alias="access_token"
+    ),
+    refresh_token_from_cookie: typing.Optional[str] = fastapi.Cookie(
+        None, alias="refresh_token"
+    ),
+    access_token_from_header: typing.Optional[str] = fastapi.Header(
+        None, alias="Authorization"
+    ),
+):
+    return await saved_search_service.delete_saved_search(
+        response=response,
+        cmd=models.DeleteSavedSearchCommand(id=saved_search_id, user_id=user_id),
+        access_token_from_cookie=access_token_from_cookie,
+        refresh_token_from_cookie=refresh_token_from_cookie,
+        access_token_from_header=access_token_from_header,
+    )
+
+
+@saved_search_router.get(
+    "/{user_id:uuid}/notifications/",
+    status_code=status.HTTP_200_OK,
+    response_model=typing.List[models.Notification],
+    description="Get profiles that matched saved searches of the user.",
+)
+@inject
+async def read_notifications(
+    response: fastapi.Response,
+    user_id: uuid.UUID,
+    limit: int = fastapi.Query(100, ge=1, le=1000),
+    saved_search_service: SavedSearchService = Depends(
+        Provide[Services.saved_search_service]
+    ),
+    access_token_from_cookie: typing.Optional[str] = fastapi.Cookie(
+        None, alias="access_token"
+    ),
+    refresh_token_from_cookie: typing.Optional[str] = fastapi.Cookie(
+        None, alias="refresh_token"
+    ),
+    access_token_from_header: typing.Optional[str] = fastapi.Header(
+        None, alias="Authorization"
+    ),
+):
+    notifications = await saved_search_service.read_notifications(
+        response=response,
+        query=models.ReadNotificationsQuery(user_id=user_id, limit=limit),
+        access_token_from_cookie=access_token_from_cookie,
+        refresh_token_from_cookie=refresh_token_from_cookie,
+        access_token_from_header=access_token_from_header,
+    )
+    return ModelResponse(notifications, response=response)
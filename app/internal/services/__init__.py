@@ -6,8 +6,14 @@ from app.internal.repository import Repositories, postgresql
 from app.internal.services.auth import AuthService
 from app.internal.services.jwt import JWTService
 from app.internal.services.profile import ProfileService
+from app.internal.services.recommendation import RecommendationService
+from app.internal.services.saved_search import SavedSearchService
 from app.internal.services.users import UserService
+from app.pkg.metrics import MultiProcessExporter
+from app.pkg.search import HashingVectorizer, LSHIndex, Percolator
 from app.pkg.settings import settings
+from app.pkg.tracing import OTLPFileExporter
+from app.pkg.utils.batcher import AsyncBatcher
 
 
 class Services(containers.DeclarativeContainer):
@@ -38,8 +44,74 @@ class Services(containers.DeclarativeContainer):
         jwt_service=jwt_service,
     )
 
+    profile_index = providers.Singleton(
+        LSHIndex.open,
+        path=settings.RECOMMENDATIONS.INDEX_PATH,
+        dimensions=settings.RECOMMENDATIONS.DIMENSIONS,
+        tables=settings.RECOMMENDATIONS.TABLES,
+        bits=settings.RECOMMENDATIONS.BITS,
+        probes=settings.RECOMMENDATIONS.PROBES,
+        seed=settings.RECOMMENDATIONS.SEED,
+    )
+
+    profile_vectorizer = providers.Singleton(
+        HashingVectorizer,
+        dimensions=settings.RECOMMENDATIONS.DIMENSIONS,
+    )
+
+    recommendation_service = providers.Factory(
+        RecommendationService,
+        profile_repository=repositories.profile_repository,
+        index=profile_index,
+        vectorizer=profile_vectorizer,
+        index_path=settings.RECOMMENDATIONS.INDEX_PATH,
+    )
+
+    saved_search_percolator = providers.Singleton(Percolator)
+
+    metrics_exporter = (
+        providers.Singleton(
+            MultiProcessExporter,
+            path=settings.METRICS.MULTIPROCESS_DIR,
+            interval=settings.METRICS.FLUSH_INTERVAL,
+        )
+        if settings.METRICS.MULTIPROCESS_DIR is not None
+        else providers.Object(None)
+    )
+
+    tracing_exporter = (
+        providers.Singleton(
+            OTLPFileExporter,
+            path=settings.TRACING.EXPORT_PATH,
+            service_name=settings.API.INSTANCE_APP_NAME,
+            interval=settings.TRACING.FLUSH_INTERVAL,
+            max_queue=settings.TRACING.MAX_QUEUE,
+        )
+        if settings.TRACING.SAMPLE_RATE > 0
+        else providers.Object(None)
+    )
+
+    notification_batcher = providers.Singleton(
+        AsyncBatcher,
+        flush=repositories.notification_repository.provided.create_many,
+        max_size=settings.SAVED_SEARCHES.BATCH_SIZE,
+        max_delay=settings.SAVED_SEARCHES.FLUSH_INTERVAL,
+    )
+
+    saved_search_service = providers.Singleton(
+        SavedSearchService,
+        saved_search_repository=repositories.saved_search_repository,
+        notification_repository=repositories.notification_repository,
+        jwt_service=jwt_service,
+        percolator=saved_search_percolator,
+        notification_batcher=notification_batcher,
+        refresh_interval=settings.SAVED_SEARCHES.REFRESH_INTERVAL,
+    )
+
     profile_service = providers.Factory(
         ProfileService,
         profile_repository=repositories.profile_repository,
         jwt_service=jwt_service,
+        recommendation_service=recommendation_service,
+        saved_search_service=saved_search_service,
     )
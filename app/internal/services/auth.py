@@ -3,10 +3,12 @@ import fastapi
 
 from app.internal.repository.postgresql import users
 from app.pkg import models
+from app.pkg.tracing import trace_methods
 
 __all__ = ["AuthService"]
 
 
+@trace_methods
 class AuthService:
     """
     Сервис для аутентификации и авторизации пользователей.
@@ -8,7 +8,9 @@ import jwt
 import pydantic
 from pydantic import ValidationError
 
+from app.internal.repository.postgresql.routing import bind_session
 from app.pkg import models
+from app.pkg.tracing import tracer
 
 __all__ = ["JWTService"]
 
@@ -273,6 +275,7 @@ class JWTService:
             expires=self.refresh_token_expires_utc,
         )
 
+    @tracer.traced("auth.jwt")
     async def get_jwt_data(
         self,
         response: fastapi.Response,
@@ -297,4 +300,7 @@ class JWTService:
             if jwt_data is not None:
                 await self.refresh_tokens(response, jwt_data)
 
+        # Чтения пользователя после его записи идут в основную базу.
+        if jwt_data is not None:
+            bind_session(jwt_data.user_id)
         return jwt_data
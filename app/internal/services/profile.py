@@ -8,10 +8,12 @@ from starlette import status
 
 from app.internal.repository.repository import BaseRepository
 from app.pkg import models
+from app.pkg.tracing import trace_methods
 
 __all__ = ["ProfileService"]
 
 
+@trace_methods
 class ProfileService:
     """
     Сервис для работы с профилями пользователей.
@@ -19,15 +21,21 @@ class ProfileService:
     Args:
         profile_repository (BaseRepository): Репозиторий профилей пользователей.
         jwt_service: Сервис JWT.
+        recommendation_service: Сервис рекомендаций профилей.
+        saved_search_service: Сервис сохраненных поисков.
     """
 
     def __init__(
         self,
         profile_repository: BaseRepository,
         jwt_service,
+        recommendation_service,
+        saved_search_service,
     ):
         self.repository = profile_repository
         self.jwt_service = jwt_service
+        self.recommendation_service = recommendation_service
+        self.saved_search_service = saved_search_service
 
     async def create_profile(
         self,
@@ -68,7 +76,9 @@ class ProfileService:
 
         # TODO Добавить кастомные ошибки
         if user is not None and user.user_id == cmd.user_id:
-            return await self.repository.create(cmd=cmd)
+            profile = await self.repository.create(cmd=cmd)
+            await self._on_written(profile)
+            return profile
         else:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized"
@@ -140,7 +150,61 @@ class ProfileService:
         )
 
         if user is not None and user.user_id == cmd.user_id:
-            return await self.repository.update(cmd=cmd)
+            profile = await self.repository.update(cmd=cmd)
+            if profile.version != cmd.version:
+                await self._on_written(profile)
+            return profile
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized"
+            )
+
+    async def patch_profile(
+        self,
+        response: fastapi.Response,
+        cmd: models.PatchProfileCommand,
+        access_token_from_cookie: typing.Optional[str] = fastapi.Cookie(
+            None, alias="access_token"
+        ),
+        refresh_token_from_cookie: typing.Optional[str] = fastapi.Cookie(
+            None, alias="refresh_token"
+        ),
+        access_token_from_header: typing.Optional[str] = fastapi.Header(
+            None, alias="Authorization"
+        ),
+    ) -> models.Profile:
+        """
+        Обновляет только переданные поля профиля пользователя.
+
+        Notes:
+            Если значения полей не изменились, профиль не переиндексируется
+            и уведомления по сохраненным поискам не отправляются повторно.
+
+        Args:
+            response (fastapi.Response): HTTP-ответ.
+            cmd (models.PatchProfileCommand): Изменяемые поля профиля.
+            access_token_from_cookie (typing.Optional[str], optional):
+             Access токен из cookie. Defaults to None.
+            refresh_token_from_cookie (typing.Optional[str], optional):
+             Refresh токен из cookie. Defaults to None.
+            access_token_from_header (typing.Optional[str], optional):
+             Access токен из заголовка. Defaults to None.
+
+        Returns:
+            models.Profile: Профиль пользователя после изменения.
+        """
+        user = await self.jwt_service.get_jwt_data(
+            response=response,
+            access_token_from_cookie=access_token_from_cookie,
+            refresh_token_from_cookie=refresh_token_from_cookie,
+            access_token_from_header=access_token_from_header,
+        )
+
+        if user is not None and user.user_id == cmd.user_id:
+            profile = await self.repository.patch(cmd=cmd)
+            if profile.version != cmd.version:
+                await self._on_written(profile)
+            return profile
         else:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized"
@@ -168,11 +232,82 @@ class ProfileService:
         )
 
         if user is not None and user.user_id == cmd.user_id:
-            return await self.repository.delete(cmd=cmd)
+            profile = await self.repository.delete(cmd=cmd)
+            self.recommendation_service.remove_profile(profile.user_id)
+            return profile
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized"
+            )
+
+    async def read_recommendations(
+        self,
+        response: fastapi.Response,
+        query: models.ReadProfileRecommendationsQuery,
+        access_token_from_cookie: typing.Optional[str] = fastapi.Cookie(
+            None, alias="access_token"
+        ),
+        refresh_token_from_cookie: typing.Optional[str] = fastapi.Cookie(
+            None, alias="refresh_token"
+        ),
+        access_token_from_header: typing.Optional[str] = fastapi.Header(
+            None, alias="Authorization"
+        ),
+    ) -> typing.List[models.ProfileRecommendation]:
+        """
+        Возвращает профили, похожие на профиль пользователя.
+
+        Args:
+            response (fastapi.Response): HTTP-ответ.
+            query (models.ReadProfileRecommendationsQuery): Запрос рекомендаций.
+            access_token_from_cookie (typing.Optional[str], optional):
+             Access токен из cookie. Defaults to None.
+            refresh_token_from_cookie (typing.Optional[str], optional):
+             Refresh токен из cookie. Defaults to None.
+            access_token_from_header (typing.Optional[str], optional):
+             Access токен из заголовка. Defaults to None.
+
+        Returns:
+            typing.List[models.ProfileRecommendation]: Похожие профили.
+        """
+        user = await self.jwt_service.get_jwt_data(
+            response=response,
+            access_token_from_cookie=access_token_from_cookie,
+            refresh_token_from_cookie=refresh_token_from_cookie,
+            access_token_from_header=access_token_from_header,
+        )
+
+        if user is not None and user.user_id == query.user_id:
+            return await self.recommendation_service.recommend(query=query)
         else:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized"
             )
 
-    async def read_all_profile(self) -> typing.List[models.Profile]:
-        return await self.repository.read_all()
+    async def read_all_profile(
+        self,
+        query: typing.Optional[models.ReadAllProfilesQuery] = None,
+    ) -> typing.List[models.ProfileRow]:
+        """
+        Читает все профили.
+
+        Args:
+            query (typing.Optional[models.ReadAllProfilesQuery], optional):
+             Запрос с полями профилей. Defaults to None, все поля.
+
+        Returns:
+            typing.List[models.ProfileRow]: Профили, только с запрошенными
+             полями.
+        """
+        return await self.repository.read_all(query=query)
+
+    async def _on_written(self, profile: models.Profile) -> None:
+        """
+        Индексирует записанный профиль и уведомляет владельцев подходящих
+        поисков.
+
+        Args:
+            profile (models.Profile): Созданный или измененный профиль.
+        """
+        self.recommendation_service.index_profile(profile)
+        await self.saved_search_service.percolate(profile)
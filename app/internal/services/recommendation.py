@@ -0,0 +1,143 @@
+"""Service for profile recommendations."""
+
+import pathlib
+import typing
+import uuid
+
+from app.internal.repository.repository import BaseRepository
+from app.pkg import models
+from app.pkg.models.exceptions.users import UserNotFound
+from app.pkg.search import HashingVectorizer, LSHIndex, tokenize
+from app.pkg.tracing import trace_methods
+
+__all__ = ["RecommendationService"]
+
+
+@trace_methods
+class RecommendationService:
+    """
+    Сервис рекомендаций похожих профилей.
+
+    Профиль превращается в вектор признаков по словам имени, фамилии и
+    биографии. Векторы хранятся в приближенном индексе ближайших соседей,
+    который обновляется при каждой записи профиля.
+
+    Args:
+        profile_repository (BaseRepository): Репозиторий профилей пользователей.
+        index (LSHIndex): Индекс векторов профилей.
+        vectorizer (HashingVectorizer): Построитель векторов признаков.
+        index_path (pathlib.Path): Каталог снимка индекса.
+    """
+
+    def __init__(
+        self,
+        profile_repository: BaseRepository,
+        index: LSHIndex,
+        vectorizer: HashingVectorizer,
+        index_path: pathlib.Path,
+    ):
+        self.repository = profile_repository
+        self.index = index
+        self.vectorizer = vectorizer
+        self.index_path = index_path
+
+    def index_profile(
+        self,
+        profile: typing.Union[models.Profile, models.ProfileRow],
+    ) -> None:
+        """
+        Добавляет профиль в индекс или обновляет его вектор.
+
+        Args:
+            profile (typing.Union[models.Profile, models.ProfileRow]):
+             Сохраненный профиль.
+        """
+        self.index.add(str(profile.user_id), self._vectorize(profile))
+
+    def remove_profile(self, user_id: uuid.UUID) -> None:
+        """
+        Удаляет профиль из индекса.
+
+        Args:
+            user_id (uuid.UUID): Идентификатор пользователя.
+        """
+        self.index.remove(str(user_id))
+
+    async def recommend(
+        self,
+        query: models.ReadProfileRecommendationsQuery,
+    ) -> typing.List[models.ProfileRecommendation]:
+        """
+        Ищет профили, похожие на профиль пользователя.
+
+        Args:
+            query (models.ReadProfileRecommendationsQuery): Запрос рекомендаций.
+
+        Notes:
+            Индекс воркера не знает об удалениях, обработанных другими
+            воркерами, поэтому соседи сверяются с репозиторием. Удаленные
+            профили убираются и из индекса этого воркера.
+
+        Returns:
+            typing.List[models.ProfileRecommendation]: Похожие профили,
+             самые похожие первыми.
+        """
+        profile = await self.repository.read(
+            query=query.migrate(model=models.ReadProfileQuery),
+        )
+        neighbours = [
+            (key, score)
+            for key, score in self.index.query(
+                self._vectorize(profile),
+                limit=query.limit + 1,
+            )
+            if key != str(profile.user_id)
+        ]
+        existing = await self._existing([key for key, _ in neighbours])
+        for key, _ in neighbours:
+            if key not in existing:
+                self.index.remove(key)
+        return [
+            models.ProfileRecommendation(user_id=key, score=score)
+            for key, score in neighbours
+            if key in existing
+        ][: query.limit]
+
+    async def rebuild(self) -> int:
+        """
+        Перестраивает индекс по всем профилям и сохраняет снимок на диск.
+
+        Returns:
+            int: Количество проиндексированных профилей.
+        """
+        try:
+            profiles = await self.repository.read_all()
+        except UserNotFound:
+            profiles = []
+
+        self.index.clear()
+        for profile in profiles:
+            self.index_profile(profile)
+        self.save()
+        return len(profiles)
+
+    def save(self) -> None:
+        """Сохраняет снимок индекса, чтобы воркеры могли отобразить его в
+        память при старте."""
+        self.index.save(self.index_path)
+
+    async def _existing(self, keys: typing.List[str]) -> typing.Set[str]:
+        try:
+            profiles = await self.repository.read_many(
+                query=models.ReadProfilesQuery(user_ids=keys, fields="user_id"),
+            )
+        except UserNotFound:
+            profiles = []
+        return {str(profile.user_id) for profile in profiles}
+
+    def _vectorize(self, profile: typing.Union[models.Profile, models.ProfileRow]):
+        return self.vectorizer.transform(
+            tokenize(profile.first_name)
+            + tokenize(profile.last_name)
+            + tokenize(profile.bio),
+        )
@@ -0,0 +1,263 @@
+"""Service for manage saved searches."""
+
+import asyncio
+import contextlib
+import time
+import typing
+
+import fastapi
+from fastapi import HTTPException
+from starlette import status
+
+from app.internal.repository.repository import BaseRepository
+from app.pkg import models
+from app.pkg.logger import get_logger
+from app.pkg.models.exceptions.users import UserNotFound
+from app.pkg.search import Percolator, tokenize
+from app.pkg.tracing import trace_methods
+from app.pkg.utils.batcher import AsyncBatcher
+from app.pkg.utils.tasks import create_detached_task
+
+__all__ = ["SavedSearchService"]
+
+logger = get_logger(__name__)
+
+
+@trace_methods
+class SavedSearchService:
+    """
+    Сервис сохраненных поисков и уведомлений о подходящих профилях.
+
+    Сохраненные поиски хранятся в обратном индексе (:class:`.Percolator`),
+    поэтому новый профиль проверяется только против поисков-кандидатов,
+    а не против всех поисков. Совпадения пишутся в таблицу уведомлений
+    пачками через :class:`.AsyncBatcher`.
+
+    Notes:
+        Индекс хранится в памяти воркера и перечитывается из базы не реже,
+        чем раз в ``refresh_interval`` секунд, чтобы увидеть поиски,
+        созданные другими воркерами. Перечитывание идет в фоновой задаче,
+        запрос записи профиля ждет только первой загрузки индекса.
+        Поэтому сервис - синглтон воркера.
+
+    Args:
+        saved_search_repository (BaseRepository): Репозиторий сохраненных поисков.
+        notification_repository (BaseRepository): Репозиторий уведомлений.
+        jwt_service: Сервис JWT.
+        percolator (Percolator): Обратный индекс сохраненных поисков.
+        notification_batcher (AsyncBatcher): Пакетная запись уведомлений.
+        refresh_interval (float): Период перечитывания индекса в секундах.
+    """
+
+    def __init__(
+        self,
+        saved_search_repository: BaseRepository,
+        notification_repository: BaseRepository,
+        jwt_service,
+        percolator: Percolator,
+        notification_batcher: AsyncBatcher,
+        refresh_interval: float,
+    ):
+        self.repository = saved_search_repository
+        self.notification_repository = notification_repository
+        self.jwt_service = jwt_service
+        self.percolator = percolator
+        self.notification_batcher = notification_batcher
+        self.refresh_interval = refresh_interval
+        self._refresh_task: typing.Optional[asyncio.Task] = None
+
+    async def create_saved_search(
+        self,
+        response: fastapi.Response,
+        cmd: models.CreateSavedSearchCommand,
+        access_token_from_cookie: typing.Optional[str] = None,
+        refresh_token_from_cookie: typing.Optional[str] = None,
+        access_token_from_header: typing.Optional[str] = None,
+    ) -> models.SavedSearch:
+        """
+        Сохраняет поиск пользователя.
+
+        Args:
+            response (fastapi.Response): HTTP-ответ.
+            cmd (models.CreateSavedSearchCommand): Данные поиска.
+            access_token_from_cookie (typing.Optional[str], optional):
+             Access токен из cookie. Defaults to None.
+            refresh_token_from_cookie (typing.Optional[str], optional):
+             Refresh токен из cookie. Defaults to None.
+            access_token_from_header (typing.Optional[str], optional):
+             Access токен из заголовка. Defaults to None.
+
+        Returns:
+            models.SavedSearch: Сохраненный поиск.
+        """
+        await self._authorize(
+            user_id=cmd.user_id,
+            response=response,
+            access_token_from_cookie=access_token_from_cookie,
+            refresh_token_from_cookie=refresh_token_from_cookie,
+            access_token_from_header=access_token_from_header,
+        )
+
+        saved_search = await self.repository.create(cmd=cmd)
+        self.percolator.add(
+            saved_search.id,
+            tokenize(saved_search.query),
+            saved_search,
+        )
+        return saved_search
+
+    async def delete_saved_search(
+        self,
+        response: fastapi.Response,
+        cmd: models.DeleteSavedSearchCommand,
+        access_token_from_cookie: typing.Optional[str] = None,
+        refresh_token_from_cookie: typing.Optional[str] = None,
+        access_token_from_header: typing.Optional[str] = None,
+    ) -> models.SavedSearch:
+        """
+        Удаляет сохраненный поиск пользователя.
+
+        Args:
+            response (fastapi.Response): HTTP-ответ.
+            cmd (models.DeleteSavedSearchCommand): Идентификаторы поиска и
+             владельца.
+            access_token_from_cookie (typing.Optional[str], optional):
+             Access токен из cookie. Defaults to None.
+            refresh_token_from_cookie (typing.Optional[str], optional):
+             Refresh токен из cookie. Defaults to None.
+            access_token_from_header (typing.Optional[str], optional):
+             Access токен из заголовка. Defaults to None.
+
+        Returns:
+            models.SavedSearch: Удаленный поиск.
+        """
+        await self._authorize(
+            user_id=cmd.user_id,
+            response=response,
+            access_token_from_cookie=access_token_from_cookie,
+            refresh_token_from_cookie=refresh_token_from_cookie,
+            access_token_from_header=access_token_from_header,
+        )
+
+        saved_search = await self.repository.delete(cmd=cmd)
+        self.percolator.remove(saved_search.id)
+        return saved_search
+
+    async def read_notifications(
+        self,
+        response: fastapi.Response,
+        query: models.ReadNotificationsQuery,
+        access_token_from_cookie: typing.Optional[str] = None,
+        refresh_token_from_cookie: typing.Optional[str] = None,
+        access_token_from_header: typing.Optional[str] = None,
+    ) -> typing.List[models.Notification]:
+        """
+        Возвращает последние уведомления пользователя.
+
+        Args:
+            response (fastapi.Response): HTTP-ответ.
+            query (models.ReadNotificationsQuery): Запрос уведомлений.
+            access_token_from_cookie (typing.Optional[str], optional):
+             Access токен из cookie. Defaults to None.
+            refresh_token_from_cookie (typing.Optional[str], optional):
+             Refresh токен из cookie. Defaults to None.
+            access_token_from_header (typing.Optional[str], optional):
+             Access токен из заголовка. Defaults to None.
+
+        Returns:
+            typing.List[models.Notification]: Уведомления, новые первыми.
+        """
+        await self._authorize(
+            user_id=query.user_id,
+            response=response,
+            access_token_from_cookie=access_token_from_cookie,
+            refresh_token_from_cookie=refresh_token_from_cookie,
+            access_token_from_header=access_token_from_header,
+        )
+
+        try:
+            return await self.notification_repository.read(query=query)
+        except UserNotFound:
+            return []
+
+    async def percolate(self, profile: models.Profile) -> None:
+        """
+        Ставит в очередь уведомления владельцам поисков, которым подходит
+        профиль.
+
+        Args:
+            profile (models.Profile): Созданный или обновленный профиль.
+        """
+        refresh = self._schedule_refresh()
+        if refresh is not None and self.percolator.loaded_at is None:
+            await asyncio.shield(refresh)
+
+        terms = (
+            tokenize(profile.first_name)
+            + tokenize(profile.last_name)
+            + tokenize(profile.bio)
+        )
+        for saved_search in self.percolator.match(terms):
+            if saved_search.user_id == profile.user_id:
+                continue
+
+            self.notification_batcher.put(
+                models.CreateNotificationCommand(
+                    user_id=saved_search.user_id,
+                    saved_search_id=saved_search.id,
+                    profile_user_id=profile.user_id,
+                ),
+            )
+
+    async def close(self) -> None:
+        """
+        Останавливает фоновое перечитывание индекса.
+        """
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._refresh_task
+            self._refresh_task = None
+
+    def _schedule_refresh(self) -> typing.Optional[asyncio.Task]:
+        loaded_at = self.percolator.loaded_at
+        if loaded_at and time.monotonic() - loaded_at < self.refresh_interval:
+            return None
+
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = create_detached_task(self._refresh())
+        return self._refresh_task
+
+    async def _refresh(self) -> None:
+        try:
+            saved_searches = await self.repository.read_all()
+        except UserNotFound:
+            saved_searches = []
+        except Exception as error:  # pylint: disable=broad-except
+            logger.error("Failed to reload saved searches: %s", error)
+            return
+
+        self.percolator.replace(
+            (saved_search.id, tokenize(saved_search.query), saved_search)
+            for saved_search in saved_searches
+        )
+
+    async def _authorize(
+        self,
+        user_id,
+        response: fastapi.Response,
+        access_token_from_cookie: typing.Optional[str],
+        refresh_token_from_cookie: typing.Optional[str],
+        access_token_from_header: typing.Optional[str],
+    ) -> None:
+        user = await self.jwt_service.get_jwt_data(
+            response=response,
+            access_token_from_cookie=access_token_from_cookie,
+            refresh_token_from_cookie=refresh_token_from_cookie,
+            access_token_from_header=access_token_from_header,
+        )
+
+        if user is None or user.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized"
+            )
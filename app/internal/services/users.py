@@ -2,10 +2,12 @@
 
 from app.internal.repository.repository import BaseRepository
 from app.pkg import models
+from app.pkg.tracing import trace_methods
 
 __all__ = ["UserService"]
 
 
+@trace_methods
 class UserService:
     """Service for managing user."""
 
@@ -2,7 +2,7 @@
 
 from dependency_injector import containers, providers
 
-from app.pkg.connectors.postgresql.resource import Postgresql
+from app.pkg.connectors.postgresql.resource import Postgresql, PostgresqlReplica
 from app.pkg.settings import settings
 
 __all__ = ["PostgresSQL"]
@@ -21,4 +21,13 @@ class PostgresSQL(containers.DeclarativeContainer):
         dsn=configuration.POSTGRES.DSN,
         minsize=configuration.POSTGRES.MIN_CONNECTION,
         maxsize=configuration.POSTGRES.MAX_CONNECTION,
+        autoscaling=configuration.POSTGRES.AUTOSCALING,
+    )
+
+    replica = providers.Resource(
+        PostgresqlReplica,
+        dsn=configuration.POSTGRES.REPLICA_DSN,
+        minsize=configuration.POSTGRES.MIN_CONNECTION,
+        maxsize=configuration.POSTGRES.MAX_CONNECTION,
+        autoscaling=configuration.POSTGRES.AUTOSCALING,
     )
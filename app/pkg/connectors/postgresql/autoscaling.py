@@ -0,0 +1,371 @@
+"""Adaptive sizing of aiopg connection pools.
+
+:class:`.PoolController` periodically compares the time requests waited for
+a connection with a target. A saturated pool grows, a pool with idle
+connections shrinks after a cool-down, and all pools of the host stay
+within a shared :class:`.HostBudget`.
+
+Notes:
+    aiopg has no public API to resize a pool. The maximum size of
+    :class:`aiopg.Pool` is the ``maxlen`` of its deque of free connections,
+    so the controller replaces the deque and closes idle connections
+    itself. The maximum size never drops below the current number of
+    connections, otherwise a released connection would push another one
+    out of the full deque without closing it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import fcntl
+import math
+import os
+import pathlib
+import time
+from typing import Optional
+
+import aiopg
+
+from app.pkg.connectors.postgresql.metrics import (
+    POOL_ACQUIRE_SECONDS,
+    POOL_HOLD_SECONDS,
+    POOL_RESIZES,
+    POOL_WAITING,
+)
+from app.pkg.logger import get_logger
+
+__all__ = ["HostBudget", "PoolController"]
+
+logger = get_logger(__name__)
+
+
+class HostBudget:
+    """Number of connections shared by all pools of all workers of a host.
+
+    Every pool writes its current maximum size to a file named after the
+    process and the pool in ``path``. Claims are made under an exclusive
+    lock, and files of dead processes are ignored and removed.
+
+    Attributes:
+        path: Directory with the claims.
+        total: Maximum number of connections of the host.
+    """
+
+    path: pathlib.Path
+    total: int
+
+    def __init__(self, path: pathlib.Path, total: int):
+        self.path = pathlib.Path(path)
+        self.total = total
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def claim(self, name: str, size: int, minimum: int = 0) -> int:
+        """Claim up to ``size`` connections for the pool ``name``.
+
+        Args:
+            name: Name of the pool in this process.
+            size: Requested maximum size of the pool.
+            minimum: Size granted even if the budget is exceeded, e.g.
+                the number of connections the pool already holds.
+
+        Returns:
+            Granted maximum size, at most ``size``.
+        """
+
+        own = self.__file(os.getpid(), name)
+        with self.__locked():
+            others = 0
+            for file in self.path.glob("*.pool"):
+                if file == own:
+                    continue
+                pid = int(file.name.split("-", 1)[0])
+                if not _is_alive(pid):
+                    file.unlink(missing_ok=True)
+                    continue
+                with contextlib.suppress(OSError, ValueError):
+                    others += int(file.read_text())
+
+            granted = max(minimum, min(size, self.total - others))
+            own.write_text(str(granted))
+        return granted
+
+    def release(self, name: str) -> None:
+        """Drop the claim of the pool ``name``.
+
+        Args:
+            name: Name of the pool in this process.
+
+        Returns:
+            None
+        """
+
+        with self.__locked():
+            self.__file(os.getpid(), name).unlink(missing_ok=True)
+
+    def __file(self, pid: int, name: str) -> pathlib.Path:
+        return self.path / f"{pid}-{name}.pool"
+
+    @contextlib.contextmanager
+    def __locked(self):
+        with open(self.path / ".lock", "a", encoding="utf-8") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class PoolController:
+    """Grow and shrink an aiopg pool based on observed acquire waits.
+
+    Every ``interval`` seconds the controller reads the wait and hold time
+    histograms of the pool:
+
+    * The pool grows by a quarter, but at least by one connection, when it
+      is saturated and the mean wait exceeds ``target_wait`` or requests
+      are still waiting. It does not grow while the mean hold time exceeds
+      ``latency_tolerance`` times its moving average: slow queries mean
+      the database itself is the bottleneck, and more connections would
+      only add load.
+    * Idle connections are closed one step at a time once the pool has had
+      idle connections and no waits for ``cooldown`` seconds.
+
+    Attributes:
+        pool: Controlled pool.
+        name: Name of the pool in metrics and logs.
+        min_size: Lower bound of the maximum size.
+        max_size: Upper bound of the maximum size.
+        target_wait: Mean acquire wait in seconds the pool is sized for.
+        cooldown: Number of seconds a pool must stay idle before shrinking.
+        interval: Number of seconds between decisions.
+        latency_tolerance: Growth of the mean hold time, relative to its
+            moving average, at which the pool stops growing.
+        budget: Budget of connections of the host, None for no limit.
+    """
+
+    pool: aiopg.Pool
+    name: str
+    min_size: int
+    max_size: int
+    target_wait: float
+    cooldown: float
+    interval: float
+    latency_tolerance: float
+    budget: Optional[HostBudget]
+
+    def __init__(
+        self,
+        pool: aiopg.Pool,
+        name: str,
+        min_size: int,
+        max_size: int,
+        target_wait: float = 0.01,
+        cooldown: float = 60.0,
+        interval: float = 5.0,
+        latency_tolerance: float = 2.0,
+        budget: Optional[HostBudget] = None,
+    ):
+        self.pool = pool
+        self.name = name
+        self.min_size = max(1, min_size)
+        self.max_size = max(self.min_size, max_size)
+        self.target_wait = target_wait
+        self.cooldown = cooldown
+        self.interval = interval
+        self.latency_tolerance = latency_tolerance
+        self.budget = budget
+
+        self._task: Optional[asyncio.Task] = None
+        self._waits = self.__totals(POOL_ACQUIRE_SECONDS)
+        self._holds = self.__totals(POOL_HOLD_SECONDS)
+        self._hold_average: Optional[float] = None
+        self._idle_since: Optional[float] = None
+
+        if budget is not None:
+            self.resize(self.pool.maxsize)
+
+    def start(self) -> None:
+        """Run the controller in a background task.
+
+        Returns:
+            None
+        """
+
+        if self._task is None:
+            self._task = asyncio.create_task(self.__run())
+
+    async def stop(self) -> None:
+        """Stop the controller and release its budget claim.
+
+        Returns:
+            None
+        """
+
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self.budget is not None:
+            self.budget.release(self.name)
+
+    async def step(self) -> None:
+        """Make one sizing decision.
+
+        Returns:
+            None
+        """
+
+        mean_wait = self.__mean(POOL_ACQUIRE_SECONDS, "_waits")
+        mean_hold = self.__mean(POOL_HOLD_SECONDS, "_holds")
+        waiting = POOL_WAITING.get(pool=self.name) > 0
+        maxsize = self.pool.maxsize
+
+        if (mean_wait or 0.0) > self.target_wait or waiting:
+            self._idle_since = None
+            if self.pool.size >= maxsize and maxsize < self.max_size:
+                await self.__grow(maxsize, mean_wait, mean_hold)
+        elif self.pool.freesize:
+            await self.__cool_down(maxsize, mean_wait)
+        else:
+            self._idle_since = None
+
+        self.__track_hold(mean_hold)
+
+    def resize(self, maxsize: int) -> int:
+        """Set maximum size of the pool within bounds and budget.
+
+        Args:
+            maxsize: Requested maximum size.
+
+        Returns:
+            New maximum size.
+        """
+
+        # Connections that exist must fit into the deque.
+        existing = max(self.pool.size, self.pool.minsize, 1)
+        maxsize = min(max(maxsize, self.min_size), self.max_size)
+        if self.budget is not None:
+            maxsize = self.budget.claim(self.name, maxsize, minimum=existing)
+        maxsize = max(maxsize, existing)
+
+        if maxsize != self.pool.maxsize:
+            # aiopg has no public API to resize a pool, see the module notes.
+            # pylint: disable=protected-access
+            self.pool._free = collections.deque(self.pool._free, maxlen=maxsize)
+        return maxsize
+
+    async def __grow(
+        self,
+        maxsize: int,
+        mean_wait: Optional[float],
+        mean_hold: Optional[float],
+    ) -> None:
+        if self.__database_is_slow(mean_hold):
+            logger.info(
+                "Pool %s is saturated, but queries are slow "
+                "(mean hold %.3fs), keeping maxsize %d.",
+                self.name,
+                mean_hold,
+                maxsize,
+            )
+            return
+
+        grown = self.resize(maxsize + max(1, math.ceil(maxsize / 4))) - maxsize
+        if grown <= 0:
+            logger.warning(
+                "Pool %s is saturated, but the host budget is used up.",
+                self.name,
+            )
+            return
+
+        self.__log("Grew", maxsize, mean_wait)
+        # Waiters of aiopg are only woken by released connections, so they
+        # would not notice the new capacity until then.
+        # pylint: disable=protected-access
+        async with self.pool._cond:
+            self.pool._cond.notify(grown)
+
+    async def __cool_down(self, maxsize: int, mean_wait: Optional[float]) -> None:
+        now = time.monotonic()
+        if self._idle_since is None:
+            self._idle_since = now
+        elif now - self._idle_since >= self.cooldown:
+            await self.__shrink(max(1, math.ceil(maxsize / 4)))
+            if self.pool.maxsize < maxsize:
+                self.__log("Shrank", maxsize, mean_wait)
+
+    async def __shrink(self, count: int) -> None:
+        count = min(
+            count,
+            self.pool.freesize,
+            self.pool.size - max(self.pool.minsize, self.min_size),
+        )
+        for _ in range(max(0, count)):
+            # Idle connections are closed by the controller, see the module notes.
+            # pylint: disable=protected-access
+            conn = self.pool._free.pop()
+            await conn.close()
+        self.resize(self.pool.size)
+
+    async def __run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.step()
+            except Exception as error:  # pylint: disable=broad-except
+                logger.error("Pool %s sizing failed: %s", self.name, error)
+
+    def __database_is_slow(self, mean_hold: Optional[float]) -> bool:
+        return (
+            mean_hold is not None
+            and self._hold_average is not None
+            and mean_hold > self.latency_tolerance * self._hold_average
+        )
+
+    def __track_hold(self, mean_hold: Optional[float]) -> None:
+        if mean_hold is None:
+            return
+        if self._hold_average is None:
+            self._hold_average = mean_hold
+        else:
+            self._hold_average += 0.1 * (mean_hold - self._hold_average)
+
+    def __mean(self, histogram, attribute: str) -> Optional[float]:
+        """Mean of observations since the previous call, None if none."""
+
+        count, total = self.__totals(histogram)
+        previous_count, previous_total = getattr(self, attribute)
+        setattr(self, attribute, (count, total))
+        if count <= previous_count:
+            return None
+        return (total - previous_total) / (count - previous_count)
+
+    def __totals(self, histogram):
+        return histogram.count(pool=self.name), histogram.get(pool=self.name)
+
+    def __log(self, action: str, previous: int, mean_wait: Optional[float]):
+        direction = "up" if self.pool.maxsize > previous else "down"
+        POOL_RESIZES.inc(pool=self.name, direction=direction)
+        logger.info(
+            "%s pool %s: maxsize %d -> %d, size %d, idle %d, mean wait %.4fs.",
+            action,
+            self.name,
+            previous,
+            self.pool.maxsize,
+            self.pool.size,
+            self.pool.freesize,
+            mean_wait or 0.0,
+        )
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,100 @@
+"""Metrics of PostgresSQL connection pools.
+
+Pool size gauges are read from every tracked pool when metrics are
+collected, while wait and hold times are observed by
+:func:`app.internal.repository.postgresql.connection.acquire_connection`.
+"""
+
+import weakref
+
+import aiopg
+
+from app.pkg.metrics import Counter, Gauge, Histogram, registry
+
+__all__ = [
+    "POOL_CONNECTIONS",
+    "POOL_WAITING",
+    "POOL_ACQUIRE_SECONDS",
+    "POOL_HOLD_SECONDS",
+    "POOL_ACQUIRE_TIMEOUTS",
+    "POOL_RESIZES",
+    "QUERY_CANCELS",
+    "track_pool",
+    "pool_name",
+]
+
+POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Connections of the pool by state: idle, in_use, max.",
+    labelnames=("pool", "state"),
+)
+POOL_WAITING = Gauge(
+    "db_pool_waiting",
+    "Coroutines waiting for a connection of the pool.",
+    labelnames=("pool",),
+)
+POOL_ACQUIRE_SECONDS = Histogram(
+    "db_pool_acquire_seconds",
+    "Time spent waiting for a connection of the pool.",
+    labelnames=("pool",),
+)
+POOL_HOLD_SECONDS = Histogram(
+    "db_pool_hold_seconds",
+    "Time a connection stays checked out of the pool.",
+    labelnames=("pool",),
+)
+POOL_ACQUIRE_TIMEOUTS = Counter(
+    "db_pool_acquire_timeouts_total",
+    "Connection requests that were not served within the acquire timeout.",
+    labelnames=("pool",),
+)
+POOL_RESIZES = Counter(
+    "db_pool_resizes_total",
+    "Changes of the maximum pool size made by the pool controller.",
+    labelnames=("pool", "direction"),
+)
+QUERY_CANCELS = Counter(
+    "db_query_cancels_total",
+    "Running queries cancelled because the client of the request disconnected.",
+    labelnames=("pool",),
+)
+
+_pools: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def track_pool(pool: aiopg.Pool, name: str) -> None:
+    """Report size of the pool under the ``pool`` label ``name``.
+
+    Args:
+        pool: Connection pool.
+        name: Name of the pool, e.g. ``primary`` or ``replica``.
+
+    Returns:
+        None
+    """
+
+    _pools[pool] = name
+
+
+def pool_name(pool: aiopg.Pool) -> str:
+    """Get name of the tracked pool.
+
+    Args:
+        pool: Connection pool.
+
+    Returns:
+        Name passed to :func:`.track_pool` or ``untracked``.
+    """
+
+    return _pools.get(pool, "untracked")
+
+
+def _collect() -> None:
+    for pool, name in list(_pools.items()):
+        idle = pool.freesize
+        POOL_CONNECTIONS.set(idle, pool=name, state="idle")
+        POOL_CONNECTIONS.set(pool.size - idle, pool=name, state="in_use")
+        POOL_CONNECTIONS.set(pool.maxsize, pool=name, state="max")
+
+
+registry.on_collect(_collect)
@@ -1,26 +1,71 @@
 """Async resource for PostgresSQL connector."""
 
+import pathlib
+import re
+from typing import Any, Dict, Optional
+
 import aiopg
+from psycopg2.extensions import parse_dsn
 
+from app.pkg.connectors.postgresql.autoscaling import HostBudget, PoolController
+from app.pkg.connectors.postgresql.metrics import track_pool
 from app.pkg.connectors.resources import BaseAsyncResource
 
-__all__ = ["Postgresql"]
+__all__ = ["Postgresql", "PostgresqlReplica"]
 
 
 class Postgresql(BaseAsyncResource):
     """PostgresSQL connector using aiopg."""
 
-    async def init(self, dsn: str, *args, **kwargs) -> aiopg.Pool:
+    controller: Optional[PoolController] = None
+
+    async def init(
+        self,
+        dsn: str,
+        *args,
+        name: str = "primary",
+        autoscaling: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> aiopg.Pool:
         """Getting connection pool in asynchronous.
 
         Args:
             dsn: D.S.N - Data Source Name.
+            name: Name of the pool in metrics.
+            autoscaling: Settings of :class:`.PoolController`, see
+                :class:`app.pkg.settings.settings.PoolAutoscaling`.
+                The pool keeps a static size if they are not passed.
+                ``HOST_BUDGET`` is shared only by pools of the same
+                database server, so connections to the replica do not
+                count against the primary.
 
         Returns:
             Created connection pool.
         """
 
-        return await aiopg.create_pool(dsn=dsn, *args, **kwargs)
+        pool = await aiopg.create_pool(dsn=dsn, *args, **kwargs)
+        track_pool(pool, name=name)
+
+        if autoscaling and autoscaling["ENABLED"]:
+            budget = None
+            if autoscaling["HOST_BUDGET"]:
+                budget = HostBudget(
+                    path=pathlib.Path(autoscaling["BUDGET_PATH"]) / _server_of(dsn),
+                    total=autoscaling["HOST_BUDGET"],
+                )
+            self.controller = PoolController(
+                pool=pool,
+                name=name,
+                min_size=pool.minsize,
+                max_size=pool.maxsize,
+                target_wait=autoscaling["TARGET_WAIT"],
+                cooldown=autoscaling["COOLDOWN"],
+                interval=autoscaling["INTERVAL"],
+                latency_tolerance=autoscaling["LATENCY_TOLERANCE"],
+                budget=budget,
+            )
+            self.controller.start()
+        return pool
 
     async def shutdown(self, resource: aiopg.Pool):
         """Close connection.
@@ -35,5 +80,51 @@ class Postgresql(BaseAsyncResource):
             ``Closing`` provider is used.
         """
 
+        if self.controller is not None:
+            await self.controller.stop()
         resource.close()
         await resource.wait_closed()
+
+
+class PostgresqlReplica(Postgresql):
+    """Optional PostgresSQL read replica connector using aiopg."""
+
+    async def init(
+        self,
+        dsn: Optional[str],
+        *args,
+        name: str = "replica",
+        **kwargs,
+    ) -> Optional[aiopg.Pool]:
+        """Getting connection pool of the replica in asynchronous.
+
+        Args:
+            dsn: D.S.N - Data Source Name of the replica.
+            name: Name of the pool in metrics.
+
+        Returns:
+            Created connection pool or None, if the replica is not configured.
+        """
+
+        if dsn is None:
+            return None
+        return await super().init(dsn, *args, name=name, **kwargs)
+
+    async def shutdown(self, resource: Optional[aiopg.Pool]):
+        """Close connection.
+
+        Args:
+            resource: Resource returned by
+                :meth:`.PostgresqlReplica.init()` method.
+        """
+
+        if resource is not None:
+            await super().shutdown(resource)
+
+
+def _server_of(dsn: str) -> str:
+    """Name of the database server of ``dsn`` usable as a directory name."""
+
+    parameters = parse_dsn(dsn)
+    server = f"{parameters.get('host', 'localhost')}:{parameters.get('port', 5432)}"
+    return re.sub(r"[^\w.-]", "_", server)
@@ -0,0 +1,137 @@
+"""Rate limiting of repeated exception records.
+
+Routine exceptions, e.g. :class:`.UserNotFound` on every unknown profile,
+and database errors during an incident are logged on every request. The
+filter keeps the first records of every exception class and message of a
+window in full and replaces the rest with one summary per window.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+__all__ = ["DeduplicationFilter"]
+
+Key = Tuple[str, str]
+
+
+class _Entry:
+    """Records of one exception in the current window."""
+
+    __slots__ = ("logger", "level", "count")
+
+    def __init__(self, logger: str, level: int):
+        self.logger = logger
+        self.level = level
+        self.count = 0
+
+
+class DeduplicationFilter(logging.Filter):
+    """Let through the first records of every exception per window.
+
+    Records are keyed by the class and the message of their exception,
+    taken from ``exc_info``, from the message itself, e.g.
+    ``logger.info(exc)``, or from its arguments. Records without an
+    exception are never filtered.
+
+    Notes:
+        Summaries are logged by the first exception record after the end
+        of the window, and by :meth:`.flush` on shutdown. No thread is
+        needed, and a quiet server logs nothing.
+
+    Attributes:
+        interval: Length of the window in seconds.
+        burst: Number of records of every key logged in full per window.
+        level: Records of this level and above are always logged.
+    """
+
+    interval: float
+    burst: int
+    level: int
+
+    def __init__(self, interval: float = 10.0, burst: int = 1, level: int = 50):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self.level = level
+        self._lock = threading.Lock()
+        self._entries: Dict[Key, _Entry] = {}
+        self._window_start = time.monotonic()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Count the record and decide whether it is logged.
+
+        Args:
+            record: Log record.
+
+        Returns:
+            False if the record is only counted in the summary.
+        """
+
+        if record.levelno >= self.level:
+            return True
+        key = _key(record)
+        if key is None:
+            return True
+
+        summaries = None
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._window_start + self.interval:
+                summaries = self.__take(now)
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(record.name, record.levelno)
+            entry.count += 1
+            allowed = entry.count <= self.burst
+        if summaries:
+            self.__log(summaries)
+        return allowed
+
+    def flush(self) -> None:
+        """Log summaries of the current window and start a new one.
+
+        Returns:
+            None
+        """
+
+        with self._lock:
+            summaries = self.__take(time.monotonic())
+        self.__log(summaries)
+
+    def __take(self, now: float) -> List[Tuple[Key, _Entry, float]]:
+        entries, self._entries = self._entries, {}
+        window, self._window_start = now - self._window_start, now
+        return [
+            (key, entry, window)
+            for key, entry in entries.items()
+            if entry.count > self.burst
+        ]
+
+    @staticmethod
+    def __log(summaries: List[Tuple[Key, _Entry, float]]) -> None:
+        for (name, message), entry, window in summaries:
+            # Summaries have no exception, so they pass the filter.
+            logging.getLogger(entry.logger).log(
+                entry.level,
+                "%s x %s in last %.0fs: %s",
+                name,
+                f"{entry.count:,}",
+                window,
+                message,
+            )
+
+
+def _key(record: logging.LogRecord) -> Optional[Key]:
+    if record.exc_info and record.exc_info[1] is not None:
+        error = record.exc_info[1]
+    elif isinstance(record.msg, BaseException):
+        error = record.msg
+    else:
+        args = record.args if isinstance(record.args, tuple) else ()
+        error = next((a for a in args if isinstance(a, BaseException)), None)
+        if error is None:
+            return None
+    # HTTP exceptions of starlette have an empty ``str``.
+    return type(error).__name__, str(error) or repr(error)
@@ -1,16 +1,100 @@
-"""Methods for working with logger."""
+"""Methods for working with logger.
 
+Loggers only put records on a queue, so that logging never blocks the
+event loop on disk or terminal I/O. Records are formatted and written to
+the file and the stream by a listener thread, which is started once, the
+first time a logger is requested.
+"""
+
+import atexit
+import copy
+import datetime
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Optional
 
+from app.pkg.logger.deduplication import DeduplicationFilter
+from app.pkg.models.core.logger import LoggerFormat
 from app.pkg.settings import settings
 
+__all__ = [
+    "JSONFormatter",
+    "configure_logging",
+    "get_logger",
+    "shutdown_logging",
+]
+
 _log_format = (
     "%(asctime)s - [%(levelname)s] - %(name)s - (%(filename)s).%("
     "funcName)s(%(lineno)d) - %(message)s "
 )
 
+#: QueueListener: Listener thread that writes the records of all loggers.
+_listener: Optional[QueueListener] = None
+
+#: QueueHandler: The only handler of loggers, shared by all of them.
+_handler: Optional[QueueHandler] = None
+
+_lock = threading.Lock()
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line.
+
+    Examples:
+        ::
+
+            {"time": "2021-01-01T00:00:00.000000+00:00", "level": "INFO",
+            "logger": "app.pkg.logger", "module": "logger",
+            "function": "get_logger", "line": 43, "message": "Hello, World!"}
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.datetime.fromtimestamp(
+                record.created,
+                tz=datetime.timezone.utc,
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "function": record.funcName,
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            data["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(QueueHandler):
+    """Queue handler that leaves formatting to the listener thread.
+
+    :class:`logging.handlers.QueueHandler` formats the record, traceback
+    included, in the thread that logs it. Here only the message is merged
+    with its arguments, so that later changes of the arguments do not
+    change the message.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _get_formatter() -> logging.Formatter:
+    if settings.API.LOGGER.FORMAT == LoggerFormat.JSON:
+        return JSONFormatter()
+    return logging.Formatter(_log_format)
+
 
 def get_file_handler(file_name: str) -> RotatingFileHandler:
     """Get file handler for logger.
@@ -42,7 +126,7 @@ def get_file_handler(file_name: str) -> RotatingFileHandler:
         maxBytes=5242880,
         backupCount=10,
     )
-    file_handler.setFormatter(logging.Formatter(_log_format))
+    file_handler.setFormatter(_get_formatter())
     return file_handler
 
 
@@ -50,10 +134,103 @@ def get_stream_handler():
     """Get stream handler for logger."""
 
     stream_handler = logging.StreamHandler()
-    stream_handler.setFormatter(logging.Formatter(_log_format))
+    stream_handler.setFormatter(_get_formatter())
     return stream_handler
 
 
+def configure_logging() -> QueueHandler:
+    """Start the listener thread, once per process.
+
+    Notes:
+        Repeated exception records are filtered before they are queued,
+        see :class:`.DeduplicationFilter`.
+
+        The listener is stopped, and the queued records are written, when
+        the process exits, see :func:`.shutdown_logging`. A forked worker
+        starts its own listener, threads do not survive ``fork``.
+
+    Returns:
+        Queue handler that passes records to the listener.
+    """
+
+    global _listener, _handler  # pylint: disable=global-statement
+
+    with _lock:
+        if _handler is not None:
+            return _handler
+
+        file_path = str(
+            Path(
+                settings.API.LOGGER.FOLDER_PATH,
+                f"{settings.API.INSTANCE_APP_NAME}.log",
+            ).absolute(),
+        )
+        records = queue.SimpleQueue()
+        _listener = QueueListener(
+            records,
+            get_file_handler(file_name=file_path),
+            get_stream_handler(),
+            respect_handler_level=True,
+        )
+        _listener.start()
+        _handler = _QueueHandler(records)
+        deduplication = settings.API.LOGGER.DEDUPLICATION
+        if deduplication.ENABLED:
+            _handler.addFilter(
+                DeduplicationFilter(
+                    interval=deduplication.INTERVAL,
+                    burst=deduplication.BURST,
+                    level=logging.getLevelName(deduplication.LEVEL.upper()),
+                ),
+            )
+        atexit.register(shutdown_logging)
+        return _handler
+
+
+def shutdown_logging() -> None:
+    """Write the queued records and stop the listener thread.
+
+    Summaries of filtered records of the current window are logged first.
+    Records logged after that are not written.
+
+    Returns:
+        None
+    """
+
+    global _listener  # pylint: disable=global-statement
+
+    if _listener is None:
+        return
+    for log_filter in _handler.filters:
+        if isinstance(log_filter, DeduplicationFilter):
+            log_filter.flush()
+    with _lock:
+        listener, _listener = _listener, None
+    if listener is None:
+        return
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+def _restart_listener() -> None:
+    global _listener, _lock  # pylint: disable=global-statement
+
+    _lock = threading.Lock()
+    if _listener is not None:
+        # Records queued before the fork are written by the parent.
+        _handler.queue = queue.SimpleQueue()
+        _listener = QueueListener(
+            _handler.queue,
+            *_listener.handlers,
+            respect_handler_level=True,
+        )
+        _listener.start()
+
+
+os.register_at_fork(after_in_child=_restart_listener)
+
+
 def get_logger(name):
     """Get logger.
 
@@ -61,6 +238,11 @@ def get_logger(name):
         name:
             Name of the logger.
 
+    Notes:
+        The queue handler is added to the top-level logger of the package,
+        e.g. ``app`` for ``app.pkg.logger``, so repeated calls do not add
+        handlers and every record is written once.
+
     Returns:
         LoggerLevel instance.
 
@@ -72,14 +254,11 @@ def get_logger(name):
             >>> logger.info("Hello, World!")
             2021-01-01 00:00:00,000 - [INFO] - app.pkg.logger - (logger.py).get_logger(43) - Hello, World!  # pylint: disable=line-too-long
     """
-    logger = logging.getLogger(name)
-    file_path = str(
-        Path(
-            settings.API.LOGGER.FOLDER_PATH,
-            f"{settings.API.INSTANCE_APP_NAME}.log",
-        ).absolute(),
-    )
-    logger.addHandler(get_file_handler(file_name=file_path))
-    logger.addHandler(get_stream_handler())
-    logger.setLevel(settings.API.LOGGER.LEVEL.upper())
-    return logger
+
+    handler = configure_logging()
+    package = logging.getLogger(name.split(".", 1)[0])
+    if handler not in package.handlers:
+        package.addHandler(handler)
+        package.setLevel(settings.API.LOGGER.LEVEL.upper())
+        package.propagate = False
+    return logging.getLogger(name)
@@ -0,0 +1,20 @@
+"""Application metrics exposed in the Prometheus text format.
+
+Metrics are registered in :data:`.registry` when they are created, so
+define them once at module level and update them where the measured code
+runs. With several worker processes, :class:`.MultiProcessExporter`
+sums metrics of all workers of the host.
+"""
+# ruff: noqa
+
+from app.pkg.metrics.metrics import (
+    Counter,
+    Family,
+    Gauge,
+    Histogram,
+    Metric,
+    Registry,
+    registry,
+    render,
+)
+from app.pkg.metrics.multiprocess import MultiProcessExporter, aggregate
@@ -0,0 +1,399 @@
+"""Counters, gauges and histograms in the Prometheus text format."""
+
+from __future__ import annotations
+
+import bisect
+import math
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+__all__ = [
+    "Counter",
+    "Family",
+    "Gauge",
+    "Histogram",
+    "Metric",
+    "Registry",
+    "registry",
+    "render",
+]
+
+#: Tuple[float, ...]: Default buckets of :class:`.Histogram` in seconds.
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+class Family(NamedTuple):
+    """Collected samples of one metric."""
+
+    name: str
+    type: str
+    documentation: str
+    samples: List[Sample]
+
+
+class Registry:
+    """Collection of metrics rendered together by the metrics endpoint."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._callbacks: List[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> None:
+        """Add metric to the registry.
+
+        Args:
+            metric: Metric with a name unique in the registry.
+
+        Raises:
+            ValueError: Metric with the same name is already registered.
+
+        Returns:
+            None
+        """
+
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+
+    def on_collect(self, callback: Callable[[], None]) -> None:
+        """Call ``callback`` before every collection.
+
+        Notes:
+            Use it for gauges that mirror the state of another object, e.g.
+            a connection pool, instead of updating them on every change.
+
+        Args:
+            callback: Function that updates metrics of the registry.
+
+        Returns:
+            None
+        """
+
+        self._callbacks.append(callback)
+
+    def collect(self) -> List[Metric]:
+        """Run callbacks and get all registered metrics.
+
+        Returns:
+            Registered metrics in the order of registration.
+        """
+
+        for callback in self._callbacks:
+            callback()
+        return list(self._metrics.values())
+
+    def families(self) -> List[Family]:
+        """Collect samples of all metrics.
+
+        Returns:
+            Name, type, help text and samples of every metric.
+        """
+
+        return [
+            Family(
+                name=metric.name,
+                type=metric.type,
+                documentation=metric.documentation,
+                samples=list(metric.samples()),
+            )
+            for metric in self.collect()
+        ]
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            Text of the metrics endpoint.
+        """
+
+        return render(self.families())
+
+
+def render(families: Iterable[Family]) -> str:
+    """Render metric families in the Prometheus text exposition format.
+
+    Args:
+        families: Collected metrics, e.g. of :meth:`.Registry.families`.
+
+    Returns:
+        Text of the metrics endpoint.
+    """
+
+    lines = []
+    for family in families:
+        lines.append(f"# HELP {family.name} {_escape_help(family.documentation)}")
+        lines.append(f"# TYPE {family.name} {family.type}")
+        for name, labels, value in family.samples:
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+#: Registry: Registry rendered by the metrics endpoint.
+registry = _default_registry = Registry()
+
+
+class Metric:
+    """Base class of metrics with an optional set of labels.
+
+    Attributes:
+        name: Name of the metric.
+        documentation: Help text of the metric.
+        labelnames: Names of labels every observation must have.
+    """
+
+    type: str = "untyped"
+
+    name: str
+    documentation: str
+    labelnames: Tuple[str, ...]
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        metrics_registry: Optional[Registry] = None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        if metrics_registry is None:
+            metrics_registry = _default_registry
+        metrics_registry.register(self)
+
+    def samples(self) -> Iterator[Sample]:
+        """Get samples of the metric.
+
+        Returns:
+            Triples of sample name, labels and value.
+        """
+
+        for key, value in self._values.items():
+            yield self.name, self._labels(key), value
+
+    def get(self, **labels: object) -> float:
+        """Get current value of the label set.
+
+        Args:
+            **labels: Values of :attr:`.labelnames`.
+
+        Returns:
+            Value of the label set, sum of observations for histograms.
+        """
+
+        return self._values.get(self._key(labels), 0.0)
+
+    def clear(self) -> None:
+        """Forget values of all label sets.
+
+        Returns:
+            None
+        """
+
+        self._values.clear()
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Metric {self.name} expects labels {self.labelnames}, "
+                f"got {tuple(labels)}.",
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+
+class Counter(Metric):
+    """Monotonically increasing value, e.g. number of timeouts."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        """Increase the counter.
+
+        Args:
+            amount: Non-negative increment.
+            **labels: Values of :attr:`.labelnames`.
+
+        Raises:
+            ValueError: ``amount`` is negative.
+
+        Returns:
+            None
+        """
+
+        if amount < 0:
+            raise ValueError("Counter can only be increased.")
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    """Value that can go up and down, e.g. number of idle connections."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels: object) -> None:
+        """Set the gauge.
+
+        Args:
+            value: New value.
+            **labels: Values of :attr:`.labelnames`.
+
+        Returns:
+            None
+        """
+
+        self._values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        """Increase the gauge.
+
+        Args:
+            amount: Increment, may be negative.
+            **labels: Values of :attr:`.labelnames`.
+
+        Returns:
+            None
+        """
+
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: object) -> None:
+        """Decrease the gauge.
+
+        Args:
+            amount: Decrement, may be negative.
+            **labels: Values of :attr:`.labelnames`.
+
+        Returns:
+            None
+        """
+
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """Distribution of observed values, e.g. of connection wait time.
+
+    Attributes:
+        buckets: Upper bounds of buckets in ascending order, ``+Inf`` is
+            added implicitly.
+    """
+
+    type = "histogram"
+
+    buckets: Tuple[float, ...]
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        metrics_registry: Optional[Registry] = None,
+    ):
+        super().__init__(name, documentation, labelnames, metrics_registry)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        """Record an observation.
+
+        Args:
+            value: Observed value.
+            **labels: Values of :attr:`.labelnames`.
+
+        Returns:
+            None
+        """
+
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._values[key] = self._values.get(key, 0.0) + value
+
+    def count(self, **labels: object) -> int:
+        """Get number of observations of the label set.
+
+        Args:
+            **labels: Values of :attr:`.labelnames`.
+
+        Returns:
+            Number of observations.
+        """
+
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def samples(self) -> Iterator[Sample]:
+        for key, counts in self._counts.items():
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": bound}, cumulative
+            yield f"{self.name}_sum", labels, self._values[key]
+            yield f"{self.name}_count", labels, cumulative
+
+    def clear(self) -> None:
+        super().clear()
+        self._counts.clear()
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def _format_labels(labels: Dict[str, object]) -> str:
+    if not labels:
+        return ""
+    pairs = (f'{name}="{_escape_label(value)}"' for name, value in labels.items())
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape_label(value: object) -> str:
+    if isinstance(value, float):
+        value = _format_value(value)
+    return str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", r"\\").replace("\n", r"\n")
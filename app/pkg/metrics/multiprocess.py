@@ -0,0 +1,181 @@
+"""Aggregation of metrics of several worker processes.
+
+Every worker updates its own :class:`.Registry` in memory, without locks,
+and :class:`.MultiProcessExporter` periodically writes a snapshot of it
+to ``{pid}.json`` in a directory shared by the workers of the host. The
+metrics endpoint of any worker sums samples of all snapshots with
+:func:`.aggregate`, so Prometheus sees the host as one target.
+
+Warnings:
+    Clear the directory before the server starts. Counters of workers
+    that exited stay in the sum, so totals do not drop when a worker is
+    restarted, while their gauges are dropped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import pathlib
+from typing import Dict, List, Optional, Tuple
+
+from app.pkg.metrics.metrics import Family, Registry, Sample, registry, render
+
+__all__ = ["MultiProcessExporter", "aggregate"]
+
+
+class MultiProcessExporter:
+    """Write snapshots of the registry of this process to a directory.
+
+    Attributes:
+        path: Directory shared by the workers.
+        interval: Number of seconds between snapshots.
+        registry: Registry of this process.
+    """
+
+    path: pathlib.Path
+    interval: float
+    registry: Registry
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        interval: float = 5.0,
+        metrics_registry: Optional[Registry] = None,
+    ):
+        self.path = pathlib.Path(path)
+        self.interval = interval
+        self.registry = registry if metrics_registry is None else metrics_registry
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Write snapshots in a background task.
+
+        Returns:
+            None
+        """
+
+        if self._task is None:
+            self._task = asyncio.create_task(self.__run())
+
+    async def stop(self) -> None:
+        """Stop the background task and write the last snapshot.
+
+        Returns:
+            None
+        """
+
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        self.write()
+
+    def write(self, families: Optional[List[Family]] = None) -> None:
+        """Write snapshot of the registry of this process.
+
+        The file is replaced atomically, so readers never see a partial
+        snapshot.
+
+        Args:
+            families: Collected metrics of the registry, collected now if
+                not passed.
+
+        Returns:
+            None
+        """
+
+        if families is None:
+            families = self.registry.families()
+        snapshot = json.dumps([family._asdict() for family in families])
+        target = self.path / f"{os.getpid()}.json"
+        temporary = target.with_suffix(".tmp")
+        temporary.write_text(snapshot)
+        os.replace(temporary, target)
+
+    def render(self) -> str:
+        """Render metrics of all workers.
+
+        Notes:
+            The snapshot of this process is written first, so its own
+            metrics are always current.
+
+        Returns:
+            Text of the metrics endpoint.
+        """
+
+        self.write()
+        return aggregate(self.path)
+
+    async def __run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            # Metrics are collected in the event loop, which updates them,
+            # and only written in the executor.
+            families = self.registry.families()
+            await asyncio.get_running_loop().run_in_executor(
+                None,
+                self.write,
+                families,
+            )
+
+
+def aggregate(path: pathlib.Path) -> str:
+    """Sum samples of snapshots of all workers.
+
+    Args:
+        path: Directory with snapshots.
+
+    Returns:
+        Text of the metrics endpoint.
+    """
+
+    families: Dict[str, Family] = {}
+    sums: Dict[str, Dict[Tuple, Sample]] = {}
+    for file in sorted(pathlib.Path(path).glob("*.json")):
+        for family in _read(file):
+            if family.name not in families:
+                families[family.name] = family._replace(samples=[])
+            _add(sums.setdefault(family.name, {}), family.samples)
+
+    return render(
+        family._replace(samples=list(sums[name].values()))
+        for name, family in families.items()
+    )
+
+
+def _read(file: pathlib.Path) -> List[Family]:
+    """Read families of a snapshot, without gauges of a dead worker."""
+
+    try:
+        alive = _is_alive(int(file.stem))
+        snapshot = json.loads(file.read_text())
+    except (OSError, ValueError):
+        return []
+
+    families = [Family(**data) for data in snapshot]
+    return [family for family in families if alive or family.type != "gauge"]
+
+
+def _add(sums: Dict[Tuple, Sample], samples: List[Sample]) -> None:
+    """Add samples to the sums of samples with equal names and labels."""
+
+    for name, labels, value in samples:
+        key = (name, *sorted(labels.items()))
+        if key in sums:
+            value += sums[key][2]
+        sums[key] = (name, labels, value)
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
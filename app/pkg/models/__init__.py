@@ -4,14 +4,30 @@ from app.pkg.models.app.jwt import JWTData
 from app.pkg.models.app.profile import (
     CreateProfileCommand,
     DeleteProfileCommand,
+    PatchProfileCommand,
     Profile,
+    ProfileFields,
+    ProfileRow,
+    ProfileRecommendation,
+    ReadAllProfilesQuery,
     ReadProfileQuery,
+    ReadProfileRecommendationsQuery,
+    ReadProfilesQuery,
     UpdateProfileCommand,
 )
+from app.pkg.models.app.saved_search import (
+    CreateNotificationCommand,
+    CreateSavedSearchCommand,
+    DeleteSavedSearchCommand,
+    Notification,
+    ReadNotificationsQuery,
+    SavedSearch,
+)
 from app.pkg.models.app.user import (
     AuthorizeUser,
     AuthorizeUserCommand,
     ReadUserEmailQuery,
     ReadUserQuery,
     User,
+    UserRow,
 )
@@ -2,17 +2,24 @@
 import typing
 import uuid
 
-from pydantic import PositiveInt
+from pydantic import PositiveInt, conint
 from pydantic.fields import Field
 
-from app.pkg.models.base import BaseModel
+from app.pkg.models.base import BaseModel, FieldNames, row_class
 
 __all__ = [
     "CreateProfileCommand",
     "Profile",
+    "ProfileFields",
+    "ProfileRow",
+    "ReadAllProfilesQuery",
     "ReadProfileQuery",
+    "ReadProfilesQuery",
     "UpdateProfileCommand",
+    "PatchProfileCommand",
     "DeleteProfileCommand",
+    "ProfileRecommendation",
+    "ReadProfileRecommendationsQuery",
 ]
 
 
@@ -31,6 +38,8 @@ class ProfileField:
         last_name (typing.Optional[str]): Фамилия пользователя.
         telegram (typing.Optional[str]): Телеграм пользователя.
         bio (typing.Optional[str]): Биография пользователя.
+        version (PositiveInt): Версия профиля, увеличивается при каждом
+         изменении.
     """
 
     id: PositiveInt = Field()
@@ -58,6 +67,15 @@ class ProfileField:
         " что помогает мне быстро реагировать на изменения в"
         " процессе разработки.",
     )
+    version: PositiveInt = Field(
+        description="Версия профиля, увеличивается при каждом изменении.",
+        example=1,
+        default=1,
+    )
+    expected_version: PositiveInt = Field(
+        description="Версия профиля, которую изменяет клиент.",
+        example=1,
+    )
 
 
 class _Profile(BaseModel):
@@ -70,6 +88,17 @@ class _Profile(BaseModel):
 
 class Profile(_Profile):
     id: PositiveInt = ProfileField.id
+    version: PositiveInt = ProfileField.version
+
+
+#: Компактная строка профиля для массового чтения, см. :func:`.row_class`.
+ProfileRow = row_class(Profile)
+
+
+class ProfileFields(FieldNames):
+    """Поля профиля через запятую, например ``user_id,first_name,last_name``."""
+
+    model = Profile
 
 
 class CreateProfileCommand(_Profile):
@@ -77,7 +106,23 @@ class CreateProfileCommand(_Profile):
 
 
 class UpdateProfileCommand(_Profile):
-    ...
+    version: PositiveInt = ProfileField.expected_version
+
+
+class PatchProfileCommand(BaseModel):
+    """
+    Частичное обновление профиля.
+
+    Notes:
+        Обновляются только поля, переданные в запросе, см.
+        ``__fields_set__``. Переданный ``null`` очищает поле.
+    """
+
+    user_id: uuid.UUID = ProfileField.user_id
+    first_name: typing.Optional[str] = ProfileField.first_name
+    last_name: typing.Optional[str] = ProfileField.last_name
+    bio: typing.Optional[str] = ProfileField.bio
+    version: PositiveInt = ProfileField.expected_version
 
 
 class DeleteProfileCommand(BaseModel):
@@ -86,3 +131,40 @@ class DeleteProfileCommand(BaseModel):
 
 class ReadProfileQuery(BaseModel):
     user_id: uuid.UUID = ProfileField.user_id
+    fields: typing.Optional[ProfileFields] = Field(
+        description="Поля профиля в ответе, по умолчанию все.",
+        default=None,
+    )
+
+
+class ReadProfilesQuery(BaseModel):
+    user_ids: typing.List[uuid.UUID] = Field(
+        description="Идентификаторы пользователей, чьи профили нужно прочитать.",
+    )
+    fields: typing.Optional[ProfileFields] = Field(
+        description="Поля профилей в ответе, по умолчанию все.",
+        default=None,
+    )
+
+
+class ReadAllProfilesQuery(BaseModel):
+    fields: typing.Optional[ProfileFields] = Field(
+        description="Поля профилей в ответе, по умолчанию все.",
+        default=None,
+    )
+
+
+class ReadProfileRecommendationsQuery(BaseModel):
+    user_id: uuid.UUID = ProfileField.user_id
+    limit: conint(ge=1, le=100) = Field(
+        description="Максимальное количество рекомендаций.",
+        default=10,
+    )
+
+
+class ProfileRecommendation(BaseModel):
+    user_id: uuid.UUID = ProfileField.user_id
+    score: float = Field(
+        description="Косинусное сходство с профилем пользователя.",
+        example=0.87,
+    )
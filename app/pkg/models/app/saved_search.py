@@ -0,0 +1,93 @@
+"""Models of saved search object."""
+import typing
+import uuid
+
+from pydantic import PositiveInt
+from pydantic.fields import Field
+
+from app.pkg.models.base import BaseModel
+
+__all__ = [
+    "SavedSearch",
+    "CreateSavedSearchCommand",
+    "DeleteSavedSearchCommand",
+    "Notification",
+    "CreateNotificationCommand",
+    "ReadNotificationsQuery",
+]
+
+
+class SavedSearchFields:
+    """
+    Поля модели сохраненного поиска.
+
+    Attributes:
+        id (PositiveInt): Идентификатор сохраненного поиска.
+        user_id (uuid.UUID): Идентификатор владельца поиска.
+        query (str): Текст запроса. Профиль подходит, если содержит все слова
+         запроса.
+    """
+
+    id: PositiveInt = Field()
+    user_id: uuid.UUID = Field()
+    query: str = Field(
+        description="Текст запроса.",
+        example="python backend postgresql",
+        min_length=1,
+        max_length=256,
+    )
+
+
+class NotificationFields:
+    """
+    Поля модели уведомления.
+
+    Attributes:
+        id (PositiveInt): Идентификатор уведомления.
+        user_id (uuid.UUID): Идентификатор получателя.
+        saved_search_id (PositiveInt): Идентификатор сработавшего поиска.
+        profile_user_id (uuid.UUID): Идентификатор пользователя найденного
+         профиля.
+    """
+
+    id: PositiveInt = Field()
+    user_id: uuid.UUID = Field()
+    saved_search_id: PositiveInt = Field()
+    profile_user_id: uuid.UUID = Field()
+
+
+class _SavedSearch(BaseModel):
+    user_id: uuid.UUID = SavedSearchFields.user_id
+    query: str = SavedSearchFields.query
+
+
+class SavedSearch(_SavedSearch):
+    id: PositiveInt = SavedSearchFields.id
+
+
+class CreateSavedSearchCommand(_SavedSearch):
+    ...
+
+
+class DeleteSavedSearchCommand(BaseModel):
+    id: PositiveInt = SavedSearchFields.id
+    user_id: uuid.UUID = SavedSearchFields.user_id
+
+
+class _Notification(BaseModel):
+    user_id: uuid.UUID = NotificationFields.user_id
+    saved_search_id: PositiveInt = NotificationFields.saved_search_id
+    profile_user_id: uuid.UUID = NotificationFields.profile_user_id
+
+
+class Notification(_Notification):
+    id: PositiveInt = NotificationFields.id
+
+
+class CreateNotificationCommand(_Notification):
+    ...
+
+
+class ReadNotificationsQuery(BaseModel):
+    user_id: uuid.UUID = NotificationFields.user_id
+    limit: typing.Optional[PositiveInt] = Field(default=100)
@@ -2,13 +2,14 @@
 import typing
 import uuid
 
-from pydantic import EmailStr
+from pydantic import EmailStr, PositiveInt
 from pydantic.fields import Field
 
-from app.pkg.models.base import BaseModel
+from app.pkg.models.base import BaseModel, row_class
 
 __all__ = [
     "User",
+    "UserRow",
     "ReadUserQuery",
     "AuthorizeUserCommand",
     "ReadUserEmailQuery",
@@ -29,6 +30,7 @@ class UserFields:
         email (typing.Optional[EmailStr]): Емаил пользователя.
         password (str): Пароль пользователя.
         is_activated (bool): Статус активации пользователя.
+        version (PositiveInt): Версия строки пользователя.
     """
 
     id: uuid.UUID = Field()
@@ -43,6 +45,11 @@ class UserFields:
         regex=r"^[\w\(\)\[\]\{\}\^\$\+\*@#%!&]{8,}$",
     )
     is_activated: bool = Field(description="Is activated.", example=False)
+    version: PositiveInt = Field(
+        description="Версия строки, увеличивается при каждом изменении.",
+        example=1,
+        default=1,
+    )
 
 
 class _User(BaseUser):
@@ -53,6 +60,11 @@ class _User(BaseUser):
 
 class User(_User):
     id: uuid.UUID = UserFields.id
+    version: PositiveInt = UserFields.version
+
+
+#: Compact row of user for bulk reads, see :func:`.row_class`.
+UserRow = row_class(User)
 
 
 class ReadUserQuery(BaseUser):
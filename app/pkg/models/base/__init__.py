@@ -6,3 +6,5 @@ All models **must** inherit from them.
 from app.pkg.models.base.enum import BaseEnum
 from app.pkg.models.base.exception import BaseAPIException
 from app.pkg.models.base.model import BaseModel, Model
+from app.pkg.models.base.rows import Row, row_class
+from app.pkg.models.base.projection import FieldNames, Partial, projection
@@ -2,22 +2,39 @@
 
 from __future__ import annotations
 
+import functools
+import operator
 import time
 import typing
 from datetime import date, datetime
-from typing import Any, Dict, List, Tuple, TypeVar
-from uuid import UUID
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
 import pydantic
 from jsf import JSF
-from pydantic import UUID4
+from pydantic.fields import (
+    SHAPE_LIST,
+    SHAPE_SINGLETON,
+    SHAPE_TUPLE_ELLIPSIS,
+    ModelField,
+)
 
-__all__ = ["BaseModel", "Model"]
+__all__ = ["BaseModel", "Model", "get_faker"]
 
 from app.pkg.models import types
+from app.pkg.models.base.serializer import _field_caster, cast_value, get_serializer
 
 Model = TypeVar("Model", bound="BaseModel")
-_T = TypeVar("_T")
+Reader = Callable[[pydantic.BaseModel], Any]
 
 
 class BaseModel(pydantic.BaseModel):
@@ -44,65 +61,40 @@ class BaseModel(pydantic.BaseModel):
         Raises:
             TypeError: If ``values`` are not a Dict object.
 
+        Notes:
+            Values of ``dict()`` are converted by a serializer compiled
+            once per class from the types of its fields, see
+            :mod:`app.pkg.models.base.serializer`.
+
         Returns:
             Dict object with reveal password filed.
         """
 
-        values = self.dict(**kwargs).items() if not values else values.items()
-        r = {}
-        for k, v in values:
-            v = self.__cast_values(v=v, show_secrets=show_secrets)
-            r[k] = v
-        return r
+        if values:
+            return {k: cast_value(v, show_secrets) for k, v in values.items()}
+        return get_serializer(type(self), show_secrets)(self.dict(**kwargs))
 
-    def __cast_values(self, v: _T, show_secrets: bool, **kwargs) -> _T:
-        """Cast value for dict object.
+    @classmethod
+    def from_trusted(cls: Type[Model], data: typing.Mapping[str, Any]) -> Model:
+        """Create a model from data that was validated before, e.g. a row
+        of the database.
 
         Args:
-            v:
-                Any value.
-            show_secrets:
-                If True, then the secret will be revealed.
+            data:
+                Values of fields by their names. Keys that are not fields
+                of the model are ignored.
 
         Warnings:
-            This method is not memory optimized.
-        """
-
-        if isinstance(v, (List, Tuple)):
-            return [
-                self.__cast_values(v=ve, show_secrets=show_secrets, **kwargs)
-                for ve in v
-            ]
-
-        elif isinstance(v, (pydantic.SecretBytes, pydantic.SecretStr)):
-            return self.__cast_secret(v=v, show_secrets=show_secrets)
-
-        elif isinstance(v, Dict) and v:
-            return self.to_dict(show_secrets=show_secrets, values=v, **kwargs)
-
-        elif isinstance(v, (UUID, UUID4)):
-            return str(v)
-
-        elif isinstance(v, datetime):
-            return v.timestamp()
-
-        return v
-
-    @staticmethod
-    def __cast_secret(v, show_secrets: bool) -> str:
-        """Cast secret value to str.
-
-        Args:
-            v: pydantic.Secret* object.
-            show_secrets: bool value. If True, then the secret will be revealed.
+            Values are not validated or converted, they must already have
+            the types of the fields, e.g. ``UUID`` and not ``str``. Nested
+            models are not created from dicts.
 
-        Returns: str value of ``v``.
+        Returns:
+            Model instance, fields missing in ``data`` have default values.
         """
 
-        if isinstance(v, pydantic.SecretBytes):
-            return v.get_secret_value().decode() if show_secrets else str(v)
-        elif isinstance(v, pydantic.SecretStr):
-            return v.get_secret_value() if show_secrets else str(v)
+        fields = cls.__fields__
+        return cls.construct(**{k: v for k, v in data.items() if k in fields})
 
     def delete_attribute(self, attr: str) -> BaseModel:
 
@@ -159,9 +151,84 @@ class BaseModel(pydantic.BaseModel):
         if not random_fill:
             return pydantic.parse_obj_as(model, self_dict_model)
 
-        faker = JSF(model.schema()).generate()
-        faker.update(self_dict_model)
-        return pydantic.parse_obj_as(model, faker)
+        return model.fake(**self_dict_model)
+
+    @staticmethod
+    def migrate_many(
+        items: typing.Sequence[BaseModel],
+        model: Type[Model],
+        random_fill: bool = False,
+        match_keys: dict[str, str] | None = None,
+        extra_fields: dict[str, typing.Any] | None = None,
+    ) -> List[Model]:
+        """Migrate models to another model.
+
+        Arguments are the same as of :meth:`.migrate`, and values are
+        converted like :meth:`.to_dict` with secrets revealed, as there.
+        Which field of the source model fills which field of ``model``,
+        and how its value is converted, is decided once per pair of
+        classes. Only the planned attributes of every item are read,
+        without building its whole dict.
+
+        Args:
+            items:
+                Models to migrate.
+            model:
+                Heir BaseModel object.
+            random_fill:
+                If True, then the fields that are not in the
+                model will be filled with random values.
+            match_keys:
+                Key: name of field in a target model.
+                Value: name of field in a source model.
+            extra_fields:
+                Key: name of field in a target model.
+                Value: value of field in a target model.
+
+        Examples:
+            ::
+
+                queries = BaseModel.migrate_many(
+                    profiles,
+                    model=models.ReadProfileQuery,
+                )
+
+        Returns:
+            List of ``model`` instances, in the order of ``items``.
+        """
+
+        match_keys = match_keys or {}
+        extra_fields = extra_fields or {}
+        renames = tuple(sorted(match_keys.items()))
+        extra = frozenset(extra_fields)
+
+        result = []
+        for item in items:
+            plan = _migration_plan(type(item), model, renames, extra)
+            values = {target: read(item) for target, read in plan}
+            values.update(extra_fields)
+            result.append(model.fake(**values) if random_fill else model(**values))
+        return result
+
+    @classmethod
+    def fake(cls: Type[Model], **values: typing.Any) -> Model:
+        """Create a model filled with random values.
+
+        Args:
+            **values:
+                Values of fields that are not random.
+
+        Notes:
+            The JSON schema generator of the model is created once per
+            class, see :func:`.get_faker`.
+
+        Returns:
+            Model instance.
+        """
+
+        data = get_faker(cls).generate()
+        data.update(values)
+        return pydantic.parse_obj_as(cls, data)
 
     class Config:
         """Pydantic config class.
@@ -191,3 +258,80 @@ class BaseModel(pydantic.BaseModel):
 
         # Remove trailing whitespace
         anystr_strip_whitespace = True
+
+
+@functools.lru_cache(maxsize=None)
+def get_faker(model: Type[pydantic.BaseModel]) -> JSF:
+    """Get generator of random instances of the model.
+
+    Building ``JSF`` parses the JSON schema of the model, which takes
+    much longer than generating data, so generators are cached per class.
+
+    Args:
+        model: Model class.
+
+    Returns:
+        ``JSF`` generator of the model schema.
+    """
+
+    return JSF(model.schema())
+
+
+@functools.lru_cache(maxsize=None)
+def _migration_plan(
+    source: Type[pydantic.BaseModel],
+    target: Type[pydantic.BaseModel],
+    renames: Tuple[Tuple[str, str], ...],
+    extra: FrozenSet[str],
+) -> Tuple[Tuple[str, Reader], ...]:
+    """Get pairs of target field and reader of its value of a migration.
+
+    Matches :meth:`.BaseModel.migrate`: renamed source fields are not
+    copied under their own name, extra fields override everything.
+    """
+
+    match_keys: Dict[str, str] = dict(renames)
+    renamed = set(match_keys.values())
+    plan = []
+    for name in target.__fields__:
+        source_name: Optional[str] = match_keys.get(name)
+        if source_name is None and name in source.__fields__ and name not in renamed:
+            source_name = name
+        if source_name is not None and name not in extra:
+            plan.append((name, _field_reader(source, source_name)))
+    return tuple(plan)
+
+
+def _field_reader(model: Type[pydantic.BaseModel], name: str) -> Reader:
+    """Get reader of the field value as in ``to_dict(show_secrets=True)``.
+
+    Values of flat fields are cast from the attribute. Nested models are
+    converted by ``dict()`` first, as ``to_dict`` does, but only for the
+    field.
+    """
+
+    field = model.__fields__[name]
+    if not _is_flat(field):
+        serializer = get_serializer(model, True)
+        return lambda item: serializer(item.dict(include={name}))[name]
+
+    attribute = operator.attrgetter(name)
+    caster = _field_caster(field, True)
+    if caster is None:
+        return attribute
+    return lambda item: caster(attribute(item))
+
+
+def _is_flat(field: ModelField) -> bool:
+    """Check that ``dict()`` returns values of the field as they are."""
+
+    if field.shape not in (SHAPE_SINGLETON, SHAPE_LIST, SHAPE_TUPLE_ELLIPSIS):
+        return False
+    type_ = field.type_
+    # ``Any`` is a class since python 3.11, values of these types may
+    # contain models.
+    if type_ in (Any, object) or not isinstance(type_, type):
+        return False
+    if issubclass(type_, (pydantic.BaseModel, dict, list, tuple, set, frozenset)):
+        return False
+    return all(_is_flat(sub_field) for sub_field in field.sub_fields or ())
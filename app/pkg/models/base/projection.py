@@ -0,0 +1,131 @@
+"""Partial models with a subset of the fields of a model.
+
+Clients that need a few fields of a model, e.g. ``?fields=user_id,bio``,
+get rows with only these columns from the database. The rows are
+converted to a partial model generated once per model and set of fields,
+so that the response has no keys of fields that were not selected.
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import Any, Callable, ClassVar, Dict, Generic, Iterable, Tuple, Type
+
+import pydantic
+from pydantic.utils import update_not_none
+
+from app.pkg.models.base.model import BaseModel, Model
+
+__all__ = ["FieldNames", "Partial", "projection"]
+
+
+class Partial(Generic[Model]):
+    """Return annotation of repository methods that select some columns.
+
+    ``Partial[Profile]`` is a :class:`.Profile`, or its :func:`.projection`
+    on the columns of the row if not all of them were selected. Rows of
+    models are supported too, e.g. ``List[Partial[ProfileRow]]``.
+    """
+
+
+def projection(model: Type[Model], fields: Iterable[str]) -> Type[Model]:
+    """Get partial model with the fields of the model.
+
+    Args:
+        model: Model class.
+        fields: Names of fields of the model, other names are ignored.
+
+    Examples:
+        ::
+
+            ProfileName = projection(Profile, ["user_id", "first_name"])
+            ProfileName(user_id=user_id, first_name="Alexandr").dict()
+            # {'user_id': UUID('...'), 'first_name': 'Alexandr'}
+
+    Returns:
+        ``model`` itself if all of its fields are selected, otherwise a
+        model with the selected fields, in the order of ``model``.
+    """
+
+    fields = set(fields)
+    names = tuple(name for name in model.__fields__ if name in fields)
+    if len(names) == len(model.__fields__):
+        return model
+    return _partial(model, names)
+
+
+@functools.lru_cache(maxsize=None)
+def _partial(model: Type[Model], names: Tuple[str, ...]) -> Type[Model]:
+    definitions: Dict[str, Any] = {
+        name: (model.__fields__[name].annotation, model.__fields__[name].field_info)
+        for name in names
+    }
+    return pydantic.create_model(
+        f"Partial{model.__name__}",
+        __base__=BaseModel,
+        __module__=model.__module__,
+        **definitions,
+    )
+
+
+class FieldNames:
+    """Names of fields of :attr:`model`, separated by commas.
+
+    Subclasses set :attr:`model`. Values are validated to a tuple of
+    unique names in the order of the fields of the model, so that equal
+    sets of fields give the same query and partial model.
+
+    Examples:
+        ::
+
+            class ProfileFields(FieldNames):
+                model = Profile
+
+            pydantic.parse_obj_as(ProfileFields, "bio, user_id,bio")
+            # ('user_id', 'bio')
+    """
+
+    #: Type[pydantic.BaseModel]: Model whose fields may be named.
+    model: ClassVar[Type[pydantic.BaseModel]]
+
+    @classmethod
+    def __modify_schema__(cls, field_schema: Dict[str, Any]) -> None:
+        names = list(cls.model.__fields__)
+        update_not_none(
+            field_schema,
+            type="string",
+            description=f"Comma separated fields: {', '.join(names)}.",
+            example=",".join(names[:3]),
+        )
+
+    @classmethod
+    def __get_validators__(cls) -> Iterable[Callable[..., Any]]:
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, value: Any) -> Tuple[str, ...]:
+        """Validate names of fields.
+
+        Args:
+            value: Names separated by commas, or a sequence of names.
+
+        Raises:
+            TypeError: If ``value`` is neither a string nor a sequence.
+            ValueError: If no names are given or some are not fields.
+
+        Returns:
+            Names in the order of the fields of :attr:`model`.
+        """
+
+        if isinstance(value, str):
+            value = value.split(",")
+        elif not isinstance(value, (list, tuple, set, frozenset)):
+            raise TypeError("string or sequence of field names required")
+
+        names = {str(name).strip() for name in value} - {""}
+        if not names:
+            raise ValueError("at least one field is required")
+        unknown = names - cls.model.__fields__.keys()
+        if unknown:
+            raise ValueError(f"unknown fields: {', '.join(sorted(unknown))}")
+        return tuple(name for name in cls.model.__fields__ if name in names)
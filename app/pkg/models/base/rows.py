@@ -0,0 +1,114 @@
+"""Compact rows of models for bulk reads.
+
+A model instance keeps its values in a ``__dict__`` and the names of set
+fields in ``__fields_set__``, several hundred bytes per instance on top
+of the values. Bulk reads, e.g. all profiles, use rows instead: slotted
+dataclasses with the fields of the model, generated once per model. They
+support attribute access like the model, and ``orjson`` serializes them
+to the same JSON objects natively.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+from typing import Any, ClassVar, Dict, Mapping, Tuple, Type
+
+import pydantic
+
+__all__ = ["Row", "row_class"]
+
+
+class Row:
+    """Base class of rows generated by :func:`.row_class`."""
+
+    __slots__ = ()
+
+    #: Type[pydantic.BaseModel]: Model the row was generated from.
+    _model: ClassVar[Type[pydantic.BaseModel]]
+
+    #: tuple: Names of the fields, in the order of the model.
+    _fields: ClassVar[Tuple[str, ...]]
+
+    #: tuple: Values of fields missing in rows of the database.
+    _defaults: ClassVar[Tuple[Any, ...]]
+
+    @classmethod
+    def from_row(cls, data: Mapping[str, Any]) -> Row:
+        """Create a row from a row of the database.
+
+        Args:
+            data: Values of fields by their names, values are not
+                validated. Keys that are not fields are ignored.
+
+        Returns:
+            Row instance.
+        """
+
+        return cls(*map(data.get, cls._fields, cls._defaults))
+
+    @classmethod
+    def model_class(cls) -> Type[pydantic.BaseModel]:
+        """Get the model the row class was generated from.
+
+        Returns:
+            Model class.
+        """
+
+        return cls._model
+
+    def dict(self) -> Dict[str, Any]:
+        """Get values of fields by their names.
+
+        Returns:
+            Dict like ``dict()`` of the model.
+        """
+
+        return {name: getattr(self, name) for name in self._fields}
+
+    def to_model(self) -> pydantic.BaseModel:
+        """Convert the row to an instance of its model, without validation.
+
+        Returns:
+            Model instance.
+        """
+
+        return self._model.construct(**self.dict())
+
+
+@functools.lru_cache(maxsize=None)
+def row_class(model: Type[pydantic.BaseModel]) -> Type[Row]:
+    """Generate the row class of the model.
+
+    Args:
+        model: Model class, its fields become slots of the row.
+
+    Examples:
+        ::
+
+            ProfileRow = row_class(Profile)
+            row = ProfileRow.from_row({"id": 1, "user_id": user_id})
+            orjson.dumps(row)
+            # b'{"user_id":"...","first_name":null,...,"id":1}'
+
+    Returns:
+        Slotted dataclass named ``<Model>Row``.
+    """
+
+    fields = tuple(model.__fields__)
+    defaults = tuple(
+        None if field.default_factory else field.default
+        for field in model.__fields__.values()
+    )
+    return dataclasses.make_dataclass(
+        f"{model.__name__}Row",
+        [(name, Any) for name in fields],
+        bases=(Row,),
+        namespace={
+            "__slots__": fields,
+            "__module__": model.__module__,
+            "_model": model,
+            "_fields": fields,
+            "_defaults": defaults,
+        },
+    )
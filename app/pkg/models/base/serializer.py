@@ -0,0 +1,194 @@
+"""Serializers of :meth:`.BaseModel.to_dict` compiled per model class.
+
+``to_dict`` converts the output of ``dict()``: ``UUID`` to ``str``,
+``datetime`` to a timestamp, secrets to strings, tuples to lists. Which
+fields need a conversion follows from their types, so it is decided once
+per class and ``show_secrets``, instead of running an ``isinstance``
+chain on every value of every call. Values of types that cannot be
+decided in advance, e.g. ``Any`` or ``Union``, go through
+:func:`.cast_value`, which produces the same output.
+"""
+
+from __future__ import annotations
+
+import datetime
+import decimal
+import enum
+import functools
+import uuid
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple, Type
+
+import pydantic
+from pydantic.fields import (
+    SHAPE_LIST,
+    SHAPE_SINGLETON,
+    SHAPE_TUPLE_ELLIPSIS,
+    ModelField,
+)
+
+__all__ = ["cast_value", "get_serializer"]
+
+Caster = Callable[[Any], Any]
+Serializer = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+#: tuple: Types whose values ``to_dict`` returns unchanged.
+_PLAIN_TYPES = (str, int, float, bool, bytes, decimal.Decimal, enum.Enum)
+
+_serializers: Dict[Tuple[Type[pydantic.BaseModel], bool], Serializer] = {}
+
+
+def cast_value(v: Any, show_secrets: bool) -> Any:
+    """Cast value for dict object.
+
+    Args:
+        v:
+            Any value.
+        show_secrets:
+            If True, then the secret will be revealed.
+
+    Returns:
+        JSON-compatible value.
+    """
+
+    if isinstance(v, (List, Tuple)):
+        return [cast_value(ve, show_secrets) for ve in v]
+
+    elif isinstance(v, (pydantic.SecretBytes, pydantic.SecretStr)):
+        return _cast_secret(v, show_secrets)
+
+    elif isinstance(v, Dict) and v:
+        return {k: cast_value(ve, show_secrets) for k, ve in v.items()}
+
+    elif isinstance(v, uuid.UUID):
+        return str(v)
+
+    elif isinstance(v, datetime.datetime):
+        return v.timestamp()
+
+    return v
+
+
+def get_serializer(
+    model: Type[pydantic.BaseModel],
+    show_secrets: bool,
+) -> Serializer:
+    """Get serializer of the output of ``model.dict()``.
+
+    Args:
+        model: Model class.
+        show_secrets: If True, then the secrets will be revealed.
+
+    Notes:
+        The serializer converts the dict in place, it must be created
+        by ``dict()`` for this call.
+
+    Returns:
+        Function that converts the dict and returns it.
+    """
+
+    key = (model, show_secrets)
+    serializer = _serializers.get(key)
+    if serializer is None:
+        serializer = _serializers[key] = _compile(model, show_secrets)
+    return serializer
+
+
+def _compile(model: Type[pydantic.BaseModel], show_secrets: bool) -> Serializer:
+    casters: Dict[str, Caster] = {}
+    for field in model.__fields__.values():
+        caster = _field_caster(field, show_secrets)
+        if caster is not None:
+            casters[field.name] = caster
+            casters[field.alias] = caster
+    known = frozenset(
+        name
+        for field in model.__fields__.values()
+        for name in (field.name, field.alias)
+    )
+    return functools.partial(
+        _serialize,
+        tuple(casters.items()),
+        known,
+        show_secrets,
+    )
+
+
+def _serialize(
+    casters: Tuple[Tuple[str, Caster], ...],
+    known: FrozenSet[str],
+    show_secrets: bool,
+    data: Dict[str, Any],
+) -> Dict[str, Any]:
+    for name, caster in casters:
+        if name in data:
+            data[name] = caster(data[name])
+    # Fields of subclasses of the declared type of a nested model.
+    for name in data.keys() - known:
+        data[name] = cast_value(data[name], show_secrets)
+    return data
+
+
+def _field_caster(field: ModelField, show_secrets: bool) -> Optional[Caster]:
+    """Get caster of the field values, None if they are left unchanged."""
+
+    if field.shape == SHAPE_SINGLETON and not field.sub_fields:
+        return _type_caster(field.type_, show_secrets)
+
+    if field.shape in (SHAPE_LIST, SHAPE_TUPLE_ELLIPSIS) and field.sub_fields:
+        item = _field_caster(field.sub_fields[0], show_secrets)
+        if item is None:
+            return lambda v: v if v is None else list(v)
+        return lambda v: v if v is None else [item(ve) for ve in v]
+
+    return lambda v: cast_value(v, show_secrets)
+
+
+def _type_caster(type_: Any, show_secrets: bool) -> Optional[Caster]:
+    if not isinstance(type_, type):
+        return lambda v: cast_value(v, show_secrets)
+
+    if issubclass(type_, pydantic.BaseModel):
+        return _model_caster(type_, show_secrets)
+
+    for bases, cast in _TYPE_CASTS:
+        if issubclass(type_, bases):
+            if cast is None:
+                return None
+            return lambda v: v if v is None else cast(v, show_secrets)
+
+    return lambda v: cast_value(v, show_secrets)
+
+
+def _model_caster(model: Type[pydantic.BaseModel], show_secrets: bool) -> Caster:
+    # Looked up on call, models may refer to themselves.
+    def nested(v: Any) -> Any:
+        return v if v is None else get_serializer(model, show_secrets)(v)
+
+    return nested
+
+
+def _cast_secret(v: Any, show_secrets: bool) -> str:
+    """Cast secret value to str.
+
+    Args:
+        v: pydantic.Secret* object.
+        show_secrets: bool value. If True, then the secret will be revealed.
+
+    Returns: str value of ``v``.
+    """
+
+    if isinstance(v, pydantic.SecretBytes):
+        return v.get_secret_value().decode() if show_secrets else str(v)
+    elif isinstance(v, pydantic.SecretStr):
+        return v.get_secret_value() if show_secrets else str(v)
+
+
+#: tuple: Casts of values by base types of the field type, checked in
+#: order, None for values ``to_dict`` returns unchanged.
+_TYPE_CASTS: Tuple[Tuple[Any, Optional[Callable[[Any, bool], Any]]], ...] = (
+    ((pydantic.SecretStr, pydantic.SecretBytes), _cast_secret),
+    (uuid.UUID, lambda v, show_secrets: str(v)),
+    (datetime.datetime, lambda v, show_secrets: v.timestamp()),
+    # ``date`` fields of ``construct``-ed models may hold ``datetime``.
+    (_PLAIN_TYPES, None),
+)
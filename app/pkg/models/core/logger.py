@@ -1,8 +1,8 @@
-"""LoggerLevel model."""
+"""Logger models."""
 
 from app.pkg.models.base import BaseEnum
 
-__all__ = ["LoggerLevel"]
+__all__ = ["LoggerFormat", "LoggerLevel"]
 
 
 class LoggerLevel(str, BaseEnum):
@@ -12,3 +12,8 @@ class LoggerLevel(str, BaseEnum):
     DEBUG = "DEBUG"
     CRITICAL = "CRITICAL"
     NOTSET = "NOTSET"
+
+
+class LoggerFormat(str, BaseEnum):
+    TEXT = "TEXT"
+    JSON = "JSON"
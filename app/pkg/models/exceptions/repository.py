@@ -1,14 +1,19 @@
 """Exceptions for repository layer."""
 
 
+from typing import Optional
+
 from fastapi import status
 
-from app.pkg.models.base import BaseAPIException
+from app.pkg.models.base import BaseAPIException, BaseModel
 
 __all__ = [
     "UniqueViolation",
     "EmptyResult",
     "DriverError",
+    "PoolTimeout",
+    "DeadlineExceeded",
+    "VersionConflict",
 ]
 
 
@@ -40,3 +45,43 @@ class DriverError(BaseAPIException):
             self.details = details
 
         super().__init__()
+
+
+class PoolTimeout(BaseAPIException):
+    """Exception for requests that did not get a database connection in
+    time."""
+
+    message = "Database is overloaded, try again later."
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+class DeadlineExceeded(BaseAPIException):
+    """Exception for requests that ran out of their deadline before or
+    during a database query."""
+
+    message = "Request deadline exceeded."
+    status_code = status.HTTP_504_GATEWAY_TIMEOUT
+
+
+class VersionConflict(BaseAPIException):
+    """Exception for updates of a row that was changed by another request
+    since the client read it.
+
+    Attributes:
+        current: Current state of the row, returned to the client so that
+            it can merge its changes and retry with the current version.
+    """
+
+    message = "The row was changed by another request."
+    status_code = status.HTTP_409_CONFLICT
+    current: Optional[BaseModel]
+
+    def __init__(self, current: Optional[BaseModel] = None):
+        """Init VersionConflict.
+
+        Args:
+            current: Current state of the row.
+        """
+
+        self.current = current
+        super().__init__()
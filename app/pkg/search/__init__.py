@@ -0,0 +1,12 @@
+"""Search primitives that are not bound to a specific business model.
+
+Here you can find text tokenization, feature hashing, the approximate
+nearest-neighbour index used by profile recommendations and the
+percolator used by saved searches.
+"""
+# ruff: noqa
+
+from app.pkg.search.lsh import LSHIndex
+from app.pkg.search.percolator import Percolator
+from app.pkg.search.tokenizer import tokenize
+from app.pkg.search.vectorizer import HashingVectorizer
@@ -0,0 +1,412 @@
+"""Approximate nearest-neighbour index based on random-projection LSH."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+__all__ = ["LSHIndex"]
+
+_META_FILE = "meta.json"
+
+#: int: Rows hashed at once while building a snapshot.
+_CHUNK_SIZE = 65536
+
+
+class LSHIndex:
+    """Random-projection LSH index with exact re-ranking of candidates.
+
+    Every table hashes a vector into the signs of ``bits`` random
+    hyperplanes. Vectors sharing a bucket with the query in at least one
+    table are candidates, which are re-ranked by exact cosine similarity.
+    Vectors are expected to be L2-normalized.
+
+    Recall/latency trade-off:
+        * ``tables`` - more tables find more neighbours, but give more
+          candidates to re-rank.
+        * ``bits`` - more bits make buckets smaller and queries faster, but
+          miss more neighbours.
+        * ``probes`` - also look into the buckets that differ from the query
+          bucket in one of the ``probes`` least confident bits. Raises recall
+          without rebuilding the index and may be overridden per query.
+
+    Persistence:
+        :meth:`.save` writes a consolidated snapshot as ``.npy`` files and
+        :meth:`.load` memory-maps them, so workers share the same pages
+        instead of rebuilding the index at boot. Inserts and deletes made
+        after loading are kept in memory on top of the snapshot until the
+        next :meth:`.save`.
+
+    Examples:
+        ::
+
+            >>> index = LSHIndex(dimensions=3, tables=4, bits=2)
+            >>> index.add("a", np.array([1, 0, 0], dtype=np.float32))
+            >>> index.query(np.array([1, 0, 0], dtype=np.float32), limit=1)
+            [('a', 1.0)]
+
+    Attributes:
+        dimensions: Size of indexed vectors.
+        tables: Number of hash tables.
+        bits: Number of hyperplanes per table.
+        probes: Default number of extra buckets probed per table.
+        seed: Seed of random hyperplanes. Snapshots are only compatible with
+            an index built with the same seed.
+    """
+
+    dimensions: int
+    tables: int
+    bits: int
+    probes: int
+    seed: int
+
+    def __init__(
+        self,
+        dimensions: int,
+        tables: int = 8,
+        bits: int = 12,
+        probes: int = 0,
+        seed: int = 0,
+    ):
+        if not 0 < bits < 63:
+            raise ValueError("bits must be in range [1; 62].")
+
+        self.dimensions = dimensions
+        self.tables = tables
+        self.bits = bits
+        self.probes = probes
+        self.seed = seed
+
+        self._planes = (
+            np.random.default_rng(seed)
+            .standard_normal((tables, bits, dimensions))
+            .astype(np.float32)
+        )
+        self._weights = np.left_shift(np.int64(1), np.arange(bits, dtype=np.int64))
+        self.clear()
+
+    def clear(self) -> None:
+        """Remove all vectors from the index.
+
+        Returns:
+            None
+        """
+
+        self._set_snapshot(
+            keys=np.empty(0, dtype=str),
+            vectors=np.empty((0, self.dimensions), dtype=np.float32),
+            sorted_codes=np.empty((self.tables, 0), dtype=np.int64),
+            order=np.empty((self.tables, 0), dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self._keys) + len(self._delta_keys) - len(self._deleted)
+
+    def add(self, key: str, vector: np.ndarray) -> None:
+        """Insert or replace vector of ``key``.
+
+        Args:
+            key: Unique key of the vector.
+            vector: Vector of shape ``(dimensions,)``.
+
+        Returns:
+            None
+        """
+
+        self.remove(key)
+
+        vector = np.asarray(vector, dtype=np.float32)
+        row = len(self._keys) + len(self._delta_keys)
+        self._delta_keys.append(key)
+        self._delta_vectors.append(vector)
+        self._row_of[key] = row
+
+        for table, code in enumerate(self._hash(vector[None, :])[0].tolist()):
+            self._delta_buckets[table].setdefault(code, []).append(row)
+
+    def remove(self, key: str) -> bool:
+        """Remove vector of ``key``.
+
+        Args:
+            key: Key of the vector.
+
+        Returns:
+            True if the key was indexed, False otherwise.
+        """
+
+        row = self._row_of.pop(key, None)
+        if row is None:
+            return False
+
+        self._deleted.add(row)
+        return True
+
+    def query(
+        self,
+        vector: np.ndarray,
+        limit: int = 10,
+        probes: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """Find approximate nearest neighbours of ``vector``.
+
+        Args:
+            vector: Query vector of shape ``(dimensions,)``.
+            limit: Maximum number of neighbours.
+            probes: Override of :attr:`.probes` for this query.
+
+        Returns:
+            Pairs of key and cosine similarity, the most similar first.
+        """
+
+        if limit < 1:
+            return []
+
+        vector = np.asarray(vector, dtype=np.float32)
+        rows = self._candidates(vector, self.probes if probes is None else probes)
+        if not rows.size:
+            return []
+
+        scores = self._vectors_of(rows) @ vector
+        if rows.size > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            rows, scores = rows[top], scores[top]
+
+        ranked = np.argsort(-scores, kind="stable")
+        return [(self._key_of(int(rows[i])), float(scores[i])) for i in ranked.tolist()]
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Consolidate the index and write it to ``path`` atomically.
+
+        Notes:
+            ``path`` is a symbolic link to a directory of the snapshot. The
+            new snapshot is written to a directory next to it, and the link
+            is switched by one :func:`os.replace`, so a crash leaves either
+            the previous or the new snapshot on disk. Workers that still
+            memory-map the previous snapshot keep reading consistent data.
+
+        Args:
+            path: Directory of the snapshot.
+
+        Returns:
+            None
+        """
+
+        keys, vectors = self._alive()
+        codes = np.empty((self.tables, len(keys)), dtype=np.int64)
+        for start in range(0, len(keys), _CHUNK_SIZE):
+            chunk = vectors[start : start + _CHUNK_SIZE]
+            codes[:, start : start + len(chunk)] = self._hash(chunk).T
+
+        order = np.argsort(codes, axis=1, kind="stable")
+        sorted_codes = np.take_along_axis(codes, order, axis=1)
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        snapshot = Path(tempfile.mkdtemp(dir=path.parent, prefix=f".{path.name}."))
+        np.save(snapshot / "keys.npy", keys)
+        np.save(snapshot / "vectors.npy", vectors)
+        np.save(snapshot / "codes.npy", sorted_codes)
+        np.save(snapshot / "order.npy", order)
+        meta = {**self._params(), "size": len(keys)}
+        (snapshot / _META_FILE).write_text(json.dumps(meta))
+        _switch(path, snapshot)
+
+        self._set_snapshot(keys, vectors, sorted_codes, order)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> LSHIndex:
+        """Load snapshot written by :meth:`.save`.
+
+        Args:
+            path: Directory of the snapshot.
+            mmap: If True, memory-map the arrays instead of reading them.
+
+        Returns:
+            Loaded index.
+        """
+
+        # Resolved once, so all files are read from the same snapshot.
+        path = Path(path).resolve()
+        meta = json.loads((path / _META_FILE).read_text())
+        size = meta.pop("size")
+
+        index = cls(**meta)
+        mode = "r" if mmap and size else None
+        index._set_snapshot(
+            keys=np.load(path / "keys.npy", mmap_mode=mode),
+            vectors=np.load(path / "vectors.npy", mmap_mode=mode),
+            sorted_codes=np.load(path / "codes.npy", mmap_mode=mode),
+            order=np.load(path / "order.npy", mmap_mode=mode),
+        )
+        return index
+
+    @classmethod
+    def open(cls, path: Union[str, Path], dimensions: int, **kwargs) -> LSHIndex:
+        """Load snapshot from ``path`` or create an empty index.
+
+        Notes:
+            A snapshot built with other hashing parameters is ignored,
+            because its codes are not comparable with the requested ones.
+            ``probes`` is a query time parameter and never invalidates it.
+
+        Args:
+            path: Directory of the snapshot.
+            dimensions: Size of indexed vectors.
+            **kwargs: Other arguments of :class:`.LSHIndex`.
+
+        Returns:
+            Loaded or empty index.
+        """
+
+        index = cls(dimensions=dimensions, **kwargs)
+        meta_file = Path(path) / _META_FILE
+        if not meta_file.exists():
+            return index
+
+        meta = json.loads(meta_file.read_text())
+        meta.pop("size")
+        if {**meta, "probes": index.probes} != index._params():
+            return index
+
+        loaded = cls.load(path)
+        loaded.probes = index.probes
+        return loaded
+
+    def _params(self) -> Dict[str, int]:
+        return {
+            "dimensions": self.dimensions,
+            "tables": self.tables,
+            "bits": self.bits,
+            "probes": self.probes,
+            "seed": self.seed,
+        }
+
+    def _set_snapshot(
+        self,
+        keys: np.ndarray,
+        vectors: np.ndarray,
+        sorted_codes: np.ndarray,
+        order: np.ndarray,
+    ) -> None:
+        self._keys = keys
+        self._vectors = vectors
+        self._sorted_codes = sorted_codes
+        self._order = order
+
+        self._delta_keys: List[str] = []
+        self._delta_vectors: List[np.ndarray] = []
+        self._delta_buckets: List[Dict[int, List[int]]] = [
+            {} for _ in range(self.tables)
+        ]
+        self._deleted: Set[int] = set()
+        self.__row_of: Optional[Dict[str, int]] = None
+
+    @property
+    def _row_of(self) -> Dict[str, int]:
+        """Mapping of keys to rows, built on the first write after loading."""
+
+        if self.__row_of is None:
+            self.__row_of = {key: row for row, key in enumerate(self._keys.tolist())}
+        return self.__row_of
+
+    def _hash(self, vectors: np.ndarray) -> np.ndarray:
+        """Hash vectors of shape ``(n, dimensions)`` into ``(n, tables)``
+        codes."""
+
+        signs = np.einsum("tbd,nd->ntb", self._planes, vectors) > 0
+        return signs.astype(np.int64) @ self._weights
+
+    def _candidates(self, vector: np.ndarray, probes: int) -> np.ndarray:
+        projections = self._planes @ vector
+        codes = (projections > 0).astype(np.int64) @ self._weights
+        unsure = np.argsort(np.abs(projections), axis=1)[:, :probes]
+
+        found = []
+        for table, code in enumerate(codes.tolist()):
+            for probe in [code, *(code ^ self._weights[unsure[table]]).tolist()]:
+                left, right = np.searchsorted(
+                    self._sorted_codes[table], [probe, probe + 1]
+                )
+                found.append(np.asarray(self._order[table, left:right]))
+                found.append(
+                    np.asarray(
+                        self._delta_buckets[table].get(probe, ()), dtype=np.int64
+                    )
+                )
+
+        rows = np.unique(np.concatenate(found))
+        if self._deleted:
+            rows = rows[~np.isin(rows, list(self._deleted))]
+        return rows
+
+    def _vectors_of(self, rows: np.ndarray) -> np.ndarray:
+        base = len(self._keys)
+        in_base = rows < base
+        vectors = np.empty((len(rows), self.dimensions), dtype=np.float32)
+        vectors[in_base] = self._vectors[rows[in_base]]
+        for i in np.flatnonzero(~in_base).tolist():
+            vectors[i] = self._delta_vectors[int(rows[i]) - base]
+        return vectors
+
+    def _key_of(self, row: int) -> str:
+        base = len(self._keys)
+        return str(self._keys[row]) if row < base else self._delta_keys[row - base]
+
+    def _alive(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Keys and vectors of all rows that are not deleted."""
+
+        base = len(self._keys)
+        keep = np.ones(base, dtype=bool)
+        keep[[row for row in self._deleted if row < base]] = False
+        delta = [
+            i for i in range(len(self._delta_keys)) if base + i not in self._deleted
+        ]
+
+        keys = np.concatenate(
+            [
+                np.asarray(self._keys[keep], dtype=str),
+                np.asarray([self._delta_keys[i] for i in delta], dtype=str),
+            ]
+        )
+        vectors = np.concatenate(
+            [
+                np.asarray(self._vectors[keep], dtype=np.float32),
+                np.asarray(
+                    [self._delta_vectors[i] for i in delta], dtype=np.float32
+                ).reshape(-1, self.dimensions),
+            ]
+        )
+        return keys, vectors
+
+
+def _switch(path: Path, snapshot: Path) -> None:
+    """Point the link ``path`` to ``snapshot`` and remove the previous one.
+
+    Args:
+        path: Link to the current snapshot, or a snapshot directory written
+            before snapshots were linked.
+        snapshot: Directory of the new snapshot next to ``path``.
+
+    Returns:
+        None
+    """
+
+    previous = path.resolve() if path.is_symlink() else None
+    if path.is_dir() and not path.is_symlink():
+        # A directory cannot be replaced by a link, move it aside once.
+        stale = path.with_name(f".{path.name}.stale")
+        shutil.rmtree(stale, ignore_errors=True)
+        previous = path.rename(stale)
+
+    link = snapshot.with_name(f"{snapshot.name}.link")
+    link.symlink_to(snapshot.name)
+    os.replace(link, path)
+
+    if previous is not None and previous != snapshot:
+        shutil.rmtree(previous, ignore_errors=True)
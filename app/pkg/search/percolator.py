@@ -0,0 +1,123 @@
+"""Reverse index of stored queries for matching incoming documents."""
+
+import time
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple
+
+__all__ = ["Percolator"]
+
+
+class Percolator:
+    """Match documents against stored queries instead of the other way round.
+
+    A query matches a document when the document contains all terms of the
+    query. Every query is indexed only under its most selective term (the
+    longest one), because a matching document must contain that term
+    anyway. A document therefore evaluates only the queries anchored at
+    its own terms, not every stored query.
+
+    Examples:
+        ::
+
+            >>> percolator = Percolator()
+            >>> percolator.add(1, ["python", "backend"], value="search-1")
+            >>> percolator.add(2, ["golang"], value="search-2")
+            >>> percolator.match(["senior", "python", "backend", "developer"])
+            ['search-1']
+
+    Attributes:
+        loaded_at: ``time.monotonic()`` of the last :meth:`.replace` call.
+            ``None`` if the percolator was never loaded.
+    """
+
+    loaded_at: Optional[float]
+
+    def __init__(self):
+        self._queries: Dict[Hashable, Tuple[FrozenSet[str], Any]] = {}
+        self._anchors: Dict[str, Set[Hashable]] = {}
+        self.loaded_at = None
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    def add(self, key: Hashable, terms: Iterable[str], value: Any) -> None:
+        """Insert or replace query.
+
+        Notes:
+            A query without terms would match every document, so it is not
+            indexed.
+
+        Args:
+            key: Unique key of the query.
+            terms: Terms that a document must contain.
+            value: Object returned by :meth:`.match` for this query.
+
+        Returns:
+            None
+        """
+
+        self.remove(key)
+
+        terms = frozenset(terms)
+        if not terms:
+            return
+
+        self._queries[key] = (terms, value)
+        self._anchors.setdefault(self.__anchor(terms), set()).add(key)
+
+    def remove(self, key: Hashable) -> None:
+        """Remove query if it is indexed.
+
+        Args:
+            key: Key of the query.
+
+        Returns:
+            None
+        """
+
+        query = self._queries.pop(key, None)
+        if query is None:
+            return
+
+        anchor = self.__anchor(query[0])
+        self._anchors[anchor].discard(key)
+        if not self._anchors[anchor]:
+            del self._anchors[anchor]
+
+    def replace(self, queries: Iterable[Tuple[Hashable, Iterable[str], Any]]) -> None:
+        """Replace all queries and update :attr:`.loaded_at`.
+
+        Args:
+            queries: Triples of key, terms and value, see :meth:`.add`.
+
+        Returns:
+            None
+        """
+
+        self._queries.clear()
+        self._anchors.clear()
+        for key, terms, value in queries:
+            self.add(key, terms, value)
+        self.loaded_at = time.monotonic()
+
+    def match(self, terms: Iterable[str]) -> List[Any]:
+        """Find queries matching a document.
+
+        Args:
+            terms: Terms of the document.
+
+        Returns:
+            Values of all matched queries.
+        """
+
+        terms = set(terms)
+        matched = []
+        for term in terms:
+            for key in self._anchors.get(term, ()):
+                query_terms, value = self._queries[key]
+                if query_terms <= terms:
+                    matched.append(value)
+        return matched
+
+    @staticmethod
+    def __anchor(terms: FrozenSet[str]) -> str:
+        return max(terms, key=lambda term: (len(term), term))
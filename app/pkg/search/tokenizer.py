@@ -0,0 +1,29 @@
+"""Split free text into normalized terms."""
+
+import re
+from typing import List, Optional
+
+__all__ = ["tokenize"]
+
+_word = re.compile(r"[^\W_]{2,}", re.UNICODE)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lower-cased terms.
+
+    Args:
+        text: Any text. ``None`` is treated as an empty string.
+
+    Examples:
+        ::
+
+            >>> tokenize("Python, FastAPI и PostgreSQL!")
+            ['python', 'fastapi', 'postgresql']
+
+    Returns:
+        List of terms in the order they occur in ``text``.
+    """
+
+    if not text:
+        return []
+    return _word.findall(text.lower())
@@ -0,0 +1,49 @@
+"""Feature hashing of terms into dense vectors."""
+
+from hashlib import blake2b
+from typing import Iterable
+
+import numpy as np
+
+__all__ = ["HashingVectorizer"]
+
+
+class HashingVectorizer:
+    """Map a bag of terms into a fixed size L2-normalized vector.
+
+    Each term is hashed into one of ``dimensions`` buckets with a random
+    sign, so vectors of different documents are comparable by cosine
+    similarity without keeping a vocabulary.
+
+    Attributes:
+        dimensions: Size of produced vectors.
+    """
+
+    dimensions: int
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+
+    def transform(self, terms: Iterable[str]) -> np.ndarray:
+        """Build a vector from terms.
+
+        Args:
+            terms: Terms of a single document.
+
+        Returns:
+            ``float32`` vector of shape ``(dimensions,)``. Zero vector for an
+            empty document.
+        """
+
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for term in terms:
+            digest = int.from_bytes(
+                blake2b(term.encode(), digest_size=8).digest(),
+                "little",
+            )
+            vector[(digest >> 1) % self.dimensions] += 1.0 if digest & 1 else -1.0
+
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+        return vector
@@ -3,16 +3,23 @@
 
 import datetime
 import pathlib
+import tempfile
 import urllib.parse
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, Optional
 
 from dotenv import find_dotenv
-from pydantic import PostgresDsn, root_validator, validator
+from pydantic import Field, PostgresDsn, confloat, root_validator, validator
 from pydantic.env_settings import BaseSettings
-from pydantic.types import PositiveInt, SecretStr
-
-from app.pkg.models.core.logger import LoggerLevel
+from pydantic.types import (
+    NonNegativeFloat,
+    NonNegativeInt,
+    PositiveFloat,
+    PositiveInt,
+    SecretStr,
+)
+
+from app.pkg.models.core.logger import LoggerFormat, LoggerLevel
 from app.pkg.utils.generate_rsa_keys import generate_rsa_keys
 
 __all__ = ["Settings", "get_settings"]
@@ -37,6 +44,46 @@ class _Settings(BaseSettings):
         env_nested_delimiter = "__"
 
 
+class PoolAutoscaling(_Settings):
+    """Настройки адаптивного размера пула соединений PostgreSQL.
+
+    Пул растет, пока среднее ожидание соединения больше ``TARGET_WAIT``,
+    и закрывает простаивающие соединения через ``COOLDOWN`` секунд без
+    ожиданий. Размер пула остается в пределах ``MIN_CONNECTION`` и
+    ``MAX_CONNECTION``, а сумма размеров пулов всех воркеров хоста к
+    одному серверу базы - в пределах ``HOST_BUDGET``. У основной базы и
+    реплики бюджеты отдельные.
+    """
+
+    ENABLED: bool = True
+    TARGET_WAIT: PositiveFloat = 0.01
+    COOLDOWN: PositiveFloat = 60.0
+    INTERVAL: PositiveFloat = 5.0
+    #: Во сколько раз время удержания соединения может превысить среднее,
+    #: прежде чем пул перестанет расти: медленные запросы означают, что
+    #: узкое место - сама база.
+    LATENCY_TOLERANCE: PositiveFloat = 2.0
+    #: Максимальное число соединений всех воркеров хоста к одному серверу
+    #: базы. Не ограничено, если не задано.
+    HOST_BUDGET: Optional[PositiveInt] = None
+    BUDGET_PATH: pathlib.Path = pathlib.Path(tempfile.gettempdir()) / "pg-pool-budget"
+
+
+class QueryProfiling(_Settings):
+    """Настройки профилирования запросов репозиториев.
+
+    Вызовы дольше ``SLOW_QUERY_THRESHOLD`` секунд пишутся в лог с
+    параметрами без секретов. Для доли ``EXPLAIN_SAMPLE_RATE`` медленных
+    вызовов в лог пишется план ``EXPLAIN ANALYZE``, см.
+    :mod:`app.internal.repository.postgresql.profiling`.
+    """
+
+    ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD: NonNegativeFloat = 0.5
+    EXPLAIN_SAMPLE_RATE: confloat(ge=0, le=1) = 0.0  # type: ignore
+    EXPLAIN_TIMEOUT: PositiveFloat = 5.0
+
+
 class Postgresql(_Settings):
     """Настройки для работы с PostgreSQL."""
 
@@ -48,10 +95,35 @@ class Postgresql(_Settings):
     DSN: Optional[str] = None
     MIN_CONNECTION: PositiveInt = 1
     MAX_CONNECTION: PositiveInt = 16
+    #: Сколько секунд запрос ждет свободное соединение пула.
+    ACQUIRE_TIMEOUT: PositiveFloat = 10.0
+    AUTOSCALING: PoolAutoscaling = Field(default_factory=PoolAutoscaling)
+    PROFILING: QueryProfiling = Field(default_factory=QueryProfiling)
+    #: Выполнять запросы репозиториев как подготовленные выражения.
+    #: Отключите при работе через пулер в режиме транзакций (PgBouncer).
+    PREPARED_STATEMENTS: bool = True
+    PREPARED_STATEMENTS_CACHE_SIZE: PositiveInt = 128
+    #: Модели из строк базы создаются без валидации. Доля ответов, строка
+    #: которых все же проверяется, чтобы заметить расхождение схемы базы
+    #: и моделей. Для отладки, в продакшене 0.
+    ROW_VALIDATION_SAMPLE_RATE: confloat(ge=0, le=1) = 0.0  # type: ignore
+    #: Реплика для запросов на чтение. Если не задана, все запросы
+    #: выполняются в основной базе.
+    REPLICA_HOST: Optional[str] = None
+    REPLICA_PORT: Optional[PositiveInt] = None
+    REPLICA_DSN: Optional[str] = None
+    #: Максимальное отставание реплики в секундах, при котором на нее
+    #: еще отправляются чтения.
+    REPLICA_MAX_LAG: NonNegativeFloat = 1.0
+    #: Период проверки доступности и отставания реплики в секундах.
+    REPLICA_CHECK_INTERVAL: PositiveFloat = 1.0
+    #: Сколько секунд после записи чтения пользователя выполняются в
+    #: основной базе, чтобы он видел свои изменения.
+    READ_YOUR_WRITES_WINDOW: NonNegativeFloat = 5.0
 
     @root_validator(pre=True)
     def build_dsn(cls, values: dict):  # pylint: disable=no-self-argument
-        """Создает строку подключения к PostgreSQL."""
+        """Создает строки подключения к PostgreSQL и к реплике."""
 
         values["DSN"] = PostgresDsn.build(
             scheme="postgresql",
@@ -61,14 +133,42 @@ class Postgresql(_Settings):
             port=f"{values.get('PORT')}",
             path=f"/{values.get('DATABASE_NAME')}",
         )
+        if values.get("REPLICA_HOST"):
+            values["REPLICA_DSN"] = PostgresDsn.build(
+                scheme="postgresql",
+                user=f"{values.get('USER')}",
+                password=f"{urllib.parse.quote_plus(values.get('PASSWORD'))}",
+                host=f"{values.get('REPLICA_HOST')}",
+                port=f"{values.get('REPLICA_PORT') or values.get('PORT')}",
+                path=f"/{values.get('DATABASE_NAME')}",
+            )
         return values
 
 
+class LogDeduplication(_Settings):
+    """Настройки дедупликации исключений в логе.
+
+    Записи с одинаковыми классом и сообщением исключения пишутся целиком
+    не больше ``BURST`` раз за ``INTERVAL`` секунд, остальные только
+    подсчитываются и попадают в сводку вида ``UserNotFound x 12,345 in
+    last 10s``. Записи уровня ``LEVEL`` и выше пишутся всегда.
+    """
+
+    ENABLED: bool = True
+    INTERVAL: PositiveFloat = 10.0
+    BURST: PositiveInt = 1
+    LEVEL: LoggerLevel = LoggerLevel.CRITICAL
+
+
 class Logging(_Settings):
     """Настройки логирования."""
 
     LEVEL: LoggerLevel = LoggerLevel.DEBUG
     FOLDER_PATH: pathlib.Path = pathlib.Path("./src/logs")
+    #: ``TEXT`` для чтения человеком, ``JSON`` - по одному объекту на
+    #: строку для сборщиков логов.
+    FORMAT: LoggerFormat = LoggerFormat.TEXT
+    DEDUPLICATION: LogDeduplication = Field(default_factory=LogDeduplication)
 
     @validator("FOLDER_PATH")
     def __create_dir_if_not_exist(  # pylint: disable=unused-private-member, no-self-argument
@@ -82,6 +182,23 @@ class Logging(_Settings):
         return v
 
 
+class RequestDeadline(_Settings):
+    """Настройки дедлайна запроса.
+
+    Клиент задает бюджет запроса в секундах заголовком
+    ``X-Request-Timeout``, но не больше ``MAX``. Без заголовка действует
+    значение ``ROUTES`` для самого длинного совпавшего префикса пути,
+    затем ``DEFAULT``. Оставшийся бюджет ограничивает ожидание соединения
+    пула и ``statement_timeout`` запросов к базе.
+    """
+
+    #: Бюджет запроса без заголовка. Не ограничен, если не задан.
+    DEFAULT: Optional[PositiveFloat] = None
+    MAX: PositiveFloat = 60.0
+    #: Бюджеты по префиксам путей, например ``{"/v1/profile/": 2.0}``.
+    ROUTES: Dict[str, PositiveFloat] = Field(default_factory=dict)
+
+
 class APIServer(_Settings):
     """Настройки API."""
 
@@ -89,6 +206,7 @@ class APIServer(_Settings):
     HOST: str = "localhost"
     PORT: PositiveInt = 5000
     LOGGER: Logging
+    DEADLINE: RequestDeadline = Field(default_factory=RequestDeadline)
 
 
 class Jwt(_Settings):
@@ -115,12 +233,71 @@ class Jwt(_Settings):
         return values
 
 
+class Recommendations(_Settings):
+    """Настройки индекса рекомендаций профилей.
+
+    ``TABLES``, ``BITS`` и ``PROBES`` задают баланс между полнотой и
+    задержкой поиска, см. :class:`app.pkg.search.LSHIndex`.
+    """
+
+    INDEX_PATH: pathlib.Path = pathlib.Path("./src/index/profiles")
+    DIMENSIONS: PositiveInt = 256
+    TABLES: PositiveInt = 8
+    BITS: PositiveInt = 12
+    PROBES: NonNegativeInt = 2
+    SEED: int = 0
+
+
+class SavedSearches(_Settings):
+    """Настройки сохраненных поисков.
+
+    Уведомления пишутся в базу пачками по ``BATCH_SIZE`` штук или через
+    ``FLUSH_INTERVAL`` секунд после первого совпадения.
+    """
+
+    BATCH_SIZE: PositiveInt = 100
+    FLUSH_INTERVAL: PositiveFloat = 1.0
+    REFRESH_INTERVAL: PositiveFloat = 30.0
+
+
+class Metrics(_Settings):
+    """Настройки метрик.
+
+    Если задан ``MULTIPROCESS_DIR``, каждый воркер раз в
+    ``FLUSH_INTERVAL`` секунд пишет туда свои метрики, а ``/metrics``
+    отдает их сумму по всем воркерам хоста. Каталог нужно очищать перед
+    запуском сервера.
+    """
+
+    MULTIPROCESS_DIR: Optional[pathlib.Path] = None
+    FLUSH_INTERVAL: PositiveFloat = 5.0
+
+
+class Tracing(_Settings):
+    """Настройки трассировки запросов.
+
+    Записывается доля ``SAMPLE_RATE`` запросов, а также запросы, которые
+    клиент пометил как записываемые в заголовке ``traceparent``. Спаны
+    раз в ``FLUSH_INTERVAL`` секунд дописываются в ``EXPORT_PATH`` в
+    формате OTLP/JSON.
+    """
+
+    SAMPLE_RATE: confloat(ge=0, le=1) = 0.0  # type: ignore
+    EXPORT_PATH: pathlib.Path = pathlib.Path("./src/traces/spans.jsonl")
+    FLUSH_INTERVAL: PositiveFloat = 5.0
+    MAX_QUEUE: PositiveInt = 10_000
+
+
 class Settings(_Settings):
     """Настройки сервера."""
 
     API: APIServer
     POSTGRES: Postgresql
     JWT: Jwt
+    RECOMMENDATIONS: Recommendations = Field(default_factory=Recommendations)
+    SAVED_SEARCHES: SavedSearches = Field(default_factory=SavedSearches)
+    METRICS: Metrics = Field(default_factory=Metrics)
+    TRACING: Tracing = Field(default_factory=Tracing)
 
 
 @lru_cache
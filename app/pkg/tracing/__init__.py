@@ -0,0 +1,20 @@
+"""Lightweight tracing of requests.
+
+Spans are opened with :data:`.tracer` around the route, the auth
+dependency, service methods, repository calls and serialization, and
+exported in the OTLP/JSON format by :class:`.OTLPFileExporter`. Only
+``TRACING__SAMPLE_RATE`` of requests are recorded.
+"""
+# ruff: noqa
+
+from app.pkg.tracing.exporter import OTLPFileExporter, to_otlp
+from app.pkg.tracing.tracing import (
+    AnySpan,
+    Span,
+    Tracer,
+    current_span,
+    format_traceparent,
+    parse_traceparent,
+    trace_methods,
+    tracer,
+)
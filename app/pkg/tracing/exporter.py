@@ -0,0 +1,189 @@
+"""Export of finished spans in the OTLP/JSON format.
+
+Spans are buffered in memory and written in batches by a background
+task, one ``ExportTraceServiceRequest`` per line. The file can be sent to
+an OpenTelemetry collector with its ``otlpjsonfile`` receiver or read by
+any tool that understands OTLP/JSON.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import pathlib
+from typing import Any, Dict, List, Optional
+
+from app.pkg.metrics import Counter
+from app.pkg.tracing.tracing import Span
+
+__all__ = ["OTLPFileExporter", "to_otlp"]
+
+SPANS_DROPPED = Counter(
+    "tracing_spans_dropped_total",
+    "Finished spans dropped because the export buffer was full.",
+)
+
+#: int: OTLP span kind of spans of this server.
+_SPAN_KIND_INTERNAL = 1
+
+#: int: OTLP status code of failed spans.
+_STATUS_ERROR = 2
+
+
+class OTLPFileExporter:
+    """Append batches of finished spans to a file.
+
+    Attributes:
+        path: File the spans are appended to.
+        service_name: ``service.name`` resource attribute.
+        interval: Number of seconds between writes.
+        max_queue: Maximum number of buffered spans, further spans are
+            dropped until the next write.
+    """
+
+    path: pathlib.Path
+    service_name: str
+    interval: float
+    max_queue: int
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        service_name: str,
+        interval: float = 5.0,
+        max_queue: int = 10_000,
+    ):
+        self.path = pathlib.Path(path)
+        self.service_name = service_name
+        self.interval = interval
+        self.max_queue = max_queue
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._spans: List[Span] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def export(self, span: Span) -> None:
+        """Buffer finished span.
+
+        Args:
+            span: Finished span.
+
+        Returns:
+            None
+        """
+
+        if len(self._spans) >= self.max_queue:
+            SPANS_DROPPED.inc()
+            return
+        self._spans.append(span)
+
+    def start(self) -> None:
+        """Write buffered spans in a background task.
+
+        Returns:
+            None
+        """
+
+        if self._task is None:
+            self._task = asyncio.create_task(self.__run())
+
+    async def stop(self) -> None:
+        """Stop the background task and write the remaining spans.
+
+        Returns:
+            None
+        """
+
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        self.write(self.__take())
+
+    def write(self, spans: List[Span]) -> None:
+        """Append spans to the file as one line.
+
+        Args:
+            spans: Finished spans.
+
+        Returns:
+            None
+        """
+
+        if not spans:
+            return
+        line = json.dumps(to_otlp(spans, self.service_name), separators=(",", ":"))
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(line + "\n")
+
+    def __take(self) -> List[Span]:
+        spans, self._spans = self._spans, []
+        return spans
+
+    async def __run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.interval)
+            # Spans are taken in the event loop, only written in the executor.
+            await loop.run_in_executor(None, self.write, self.__take())
+
+
+def to_otlp(spans: List[Span], service_name: str) -> Dict[str, Any]:
+    """Convert spans to an OTLP/JSON ``ExportTraceServiceRequest``.
+
+    Args:
+        spans: Finished spans.
+        service_name: ``service.name`` resource attribute.
+
+    Returns:
+        JSON-serializable request.
+    """
+
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _attributes({"service.name": service_name}),
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "app"},
+                        "spans": [_span(span) for span in spans],
+                    },
+                ],
+            },
+        ],
+    }
+
+
+def _span(span: Span) -> Dict[str, Any]:
+    data = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": _SPAN_KIND_INTERNAL,
+        "startTimeUnixNano": str(span.start),
+        "endTimeUnixNano": str(span.end),
+        "attributes": _attributes(span.attributes),
+        "status": {},
+    }
+    if span.parent_id:
+        data["parentSpanId"] = span.parent_id
+    if span.error is not None:
+        data["status"] = {"code": _STATUS_ERROR, "message": span.error}
+    return data
+
+
+def _attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _value(value)} for key, value in attributes.items()]
+
+
+def _value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
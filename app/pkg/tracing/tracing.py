@@ -0,0 +1,324 @@
+"""Spans propagated through a context variable.
+
+A span is opened with :meth:`.Tracer.span` and becomes the parent of all
+spans opened inside it, including spans of tasks created inside it. The
+first span of a request decides whether the whole trace is recorded, so
+children of an unsampled trace cost one context variable lookup.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import inspect
+import random
+import time
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    Optional,
+    Protocol,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from app.pkg.settings import settings
+
+__all__ = [
+    "AnySpan",
+    "Span",
+    "Tracer",
+    "current_span",
+    "format_traceparent",
+    "parse_traceparent",
+    "trace_methods",
+    "tracer",
+]
+
+_T = TypeVar("_T")
+
+
+class Exporter(Protocol):
+    """Receiver of finished spans."""
+
+    def export(self, span: Span) -> None:
+        """Queue finished span for export."""
+
+
+class Span:
+    """Timed operation of a trace.
+
+    Attributes:
+        name: Name of the operation.
+        trace_id: 32 hex digits shared by all spans of the trace.
+        span_id: 16 hex digits of the span.
+        parent_id: Id of the parent span, None for the root span.
+        start: Start time in nanoseconds since the epoch.
+        end: End time in nanoseconds since the epoch, 0 while running.
+        attributes: Attributes of the operation.
+        error: Description of the exception that ended the span.
+    """
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "start",
+        "end",
+        "attributes",
+        "error",
+    )
+
+    #: bool: True for spans that are exported.
+    recording = True
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = _random_id(64)
+        self.parent_id = parent_id
+        self.start = time.time_ns()
+        self.end = 0
+        self.attributes = attributes or {}
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set attribute of the span.
+
+        Args:
+            key: Name of the attribute, e.g. ``http.status_code``.
+            value: String, number or boolean.
+
+        Returns:
+            None
+        """
+
+        self.attributes[key] = value
+
+
+class _NonRecordingSpan:
+    """Span of an unsampled trace, all operations do nothing."""
+
+    __slots__ = ()
+
+    recording = False
+    name = trace_id = span_id = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+#: _NonRecordingSpan: Current span of unsampled traces.
+_NON_RECORDING = _NonRecordingSpan()
+
+#: ContextVar: Innermost open span.
+_current: ContextVar[Optional[Union[Span, _NonRecordingSpan]]] = ContextVar(
+    "span",
+    default=None,
+)
+
+AnySpan = Union[Span, _NonRecordingSpan]
+
+
+def current_span() -> AnySpan:
+    """Get innermost open span.
+
+    Returns:
+        Open span, a span that records nothing outside of sampled traces.
+    """
+
+    return _current.get() or _NON_RECORDING
+
+
+class Tracer:
+    """Open spans and pass finished ones to the exporter.
+
+    Attributes:
+        sample_rate: Share of traces that are recorded, from 0 to 1.
+        exporter: Receiver of finished spans, no span is recorded if None.
+    """
+
+    sample_rate: float
+    exporter: Optional[Exporter]
+
+    def __init__(self, sample_rate: float = 0.0, exporter: Optional[Exporter] = None):
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any trace can be recorded."""
+
+        return self.exporter is not None and self.sample_rate > 0
+
+    @contextlib.contextmanager
+    def span(
+        self,
+        name: str,
+        traceparent: Optional[str] = None,
+        **attributes: Any,
+    ) -> Iterator[AnySpan]:
+        """Open a span for the block.
+
+        Args:
+            name: Name of the operation.
+            traceparent: ``traceparent`` header of the client, used by
+                the root span of a request to continue its trace.
+            **attributes: Attributes of the span.
+
+        Examples:
+            Trace a block and annotate it::
+
+                with tracer.span("search", query=text) as span:
+                    span.set_attribute("results", len(results))
+
+        Returns:
+            Open span, a span that records nothing if the trace is not
+            sampled.
+        """
+
+        parent = _current.get()
+        if parent is _NON_RECORDING or not self.enabled:
+            yield _NON_RECORDING
+            return
+
+        span = self.__start(name, parent, traceparent, attributes)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as error:
+            if span.recording:
+                span.error = _describe(error)
+            raise
+        finally:
+            _current.reset(token)
+            if span.recording:
+                span.end = time.time_ns()
+                self.exporter.export(span)
+
+    def __start(
+        self,
+        name: str,
+        parent: Optional[Span],
+        traceparent: Optional[str],
+        attributes: Dict[str, Any],
+    ) -> AnySpan:
+        """Open a child of ``parent``, or a root span if it is sampled."""
+
+        if parent is not None:
+            return Span(name, parent.trace_id, parent.span_id, attributes)
+
+        remote = parse_traceparent(traceparent) if traceparent else None
+        if remote is not None:
+            trace_id, parent_id, sampled = remote
+        else:
+            trace_id, parent_id = _random_id(128), None
+            sampled = random.random() < self.sample_rate
+        if not sampled:
+            return _NON_RECORDING
+        return Span(name, trace_id, parent_id, attributes)
+
+    def traced(self, name: Optional[str] = None) -> Callable:
+        """Decorate coroutine function to run in a span.
+
+        Args:
+            name: Name of the span, qualified name of the function if None.
+
+        Returns:
+            Decorator.
+        """
+
+        def decorator(func: Callable) -> Callable:
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.span(span_name):
+                    return await func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+
+def _describe(error: BaseException) -> str:
+    """Error of a span: name of the exception type and its message."""
+
+    return f"{type(error).__name__}: {error}" if str(error) else type(error).__name__
+
+
+#: Tracer: Tracer of the server, its exporter is set on startup.
+tracer = Tracer(sample_rate=settings.TRACING.SAMPLE_RATE)
+
+
+def trace_methods(cls: Type[_T]) -> Type[_T]:
+    """Run every public coroutine method of the class in a span.
+
+    Spans are named after the class and the method, e.g.
+    ``ProfileService.update_profile``.
+
+    Args:
+        cls: Class, e.g. a service.
+
+    Returns:
+        The same class with decorated methods.
+    """
+
+    for name, method in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.iscoroutinefunction(method):
+            setattr(cls, name, tracer.traced(f"{cls.__name__}.{name}")(method))
+    return cls
+
+
+def parse_traceparent(header: str) -> Optional[Tuple[str, str, bool]]:
+    """Parse W3C ``traceparent`` header.
+
+    Args:
+        header: Value like ``00-<trace id>-<parent id>-<flags>``.
+
+    Returns:
+        Trace id, parent span id and sampled flag, None if the header is
+        invalid.
+    """
+
+    parts = header.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    version, trace_id, parent_id, flags = parts
+    try:
+        if version == "ff" or not int(trace_id, 16) or not int(parent_id, 16):
+            return None
+        return trace_id.lower(), parent_id.lower(), bool(int(flags, 16) & 1)
+    except ValueError:
+        return None
+
+
+def format_traceparent(span: AnySpan) -> Optional[str]:
+    """Format W3C ``traceparent`` header of the span.
+
+    Args:
+        span: Recording span.
+
+    Returns:
+        Header value, None for spans that record nothing.
+    """
+
+    if not span.recording:
+        return None
+    return f"00-{span.trace_id}-{span.span_id}-01"
+
+
+def _random_id(bits: int) -> str:
+    return f"{random.getrandbits(bits) or 1:0{bits // 4}x}"
@@ -0,0 +1,100 @@
+"""Collect items and write them in batches out of the request path."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, List, Optional, Set, TypeVar
+
+from app.pkg.logger import get_logger
+from app.pkg.utils.tasks import call_later_detached, create_detached_task
+
+__all__ = ["AsyncBatcher"]
+
+_T = TypeVar("_T")
+
+logger = get_logger(__name__)
+
+
+class AsyncBatcher(Generic[_T]):
+    """Buffer items and pass them to ``flush`` in batches.
+
+    A batch is written when ``max_size`` items are collected or
+    ``max_delay`` seconds after the first buffered item, whichever comes
+    first. Writes run in background tasks, so :meth:`.put` never waits for
+    the database. The tasks do not inherit the context of the request that
+    filled the batch, so its deadline does not apply to the write.
+
+    Warnings:
+        Buffered items live in memory of the worker. Call :meth:`.close` on
+        shutdown to write what is left.
+
+    Attributes:
+        max_size: Maximum number of items in one batch.
+        max_delay: Maximum number of seconds an item waits in the buffer.
+    """
+
+    max_size: int
+    max_delay: float
+
+    def __init__(
+        self,
+        flush: Callable[[List[_T]], Awaitable[Any]],
+        max_size: int = 100,
+        max_delay: float = 1.0,
+    ):
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._flush = flush
+        self._items: List[_T] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def put(self, item: _T) -> None:
+        """Add item to the current batch.
+
+        Args:
+            item: Any item accepted by ``flush``.
+
+        Returns:
+            None
+        """
+
+        self._items.append(item)
+        if len(self._items) >= self.max_size:
+            self.__schedule_flush()
+        elif self._timer is None:
+            self._timer = call_later_detached(self.max_delay, self.__schedule_flush)
+
+    async def flush(self) -> None:
+        """Write the current batch immediately.
+
+        Returns:
+            None
+        """
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        items, self._items = self._items, []
+        if not items:
+            return
+
+        try:
+            await self._flush(items)
+        except Exception as error:  # pylint: disable=broad-except
+            logger.error("Failed to write batch of %s items: %s", len(items), error)
+
+    async def close(self) -> None:
+        """Write buffered items and wait for running writes.
+
+        Returns:
+            None
+        """
+
+        await self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+
+    def __schedule_flush(self) -> None:
+        task = create_detached_task(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
@@ -0,0 +1,122 @@
+"""Cancellation of work started by the current request.
+
+Code that starts work outside the event loop, e.g. a query on a database
+server, registers a callback with :func:`.on_cancel` for the time the work
+runs. When the client of the request goes away, the owner of the
+:class:`.CancelScope` calls :meth:`.CancelScope.cancel` and every
+registered callback stops its work, see
+:class:`app.internal.pkg.middlewares.disconnect.DisconnectMiddleware`.
+"""
+
+import asyncio
+import contextlib
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator, List, Optional
+
+__all__ = ["CancelScope", "cancel_scope", "on_cancel"]
+
+Callback = Callable[[], Awaitable[None]]
+
+
+class CancelScope:
+    """Callbacks that cancel running work of one request.
+
+    Attributes:
+        cancelled: True once :meth:`.cancel` was called.
+    """
+
+    cancelled: bool
+
+    def __init__(self):
+        self.cancelled = False
+        self._callbacks: List[Callback] = []
+
+    def add(self, callback: Callback) -> None:
+        """Register callback.
+
+        Args:
+            callback: Coroutine function that stops some work.
+
+        Returns:
+            None
+        """
+
+        self._callbacks.append(callback)
+
+    def discard(self, callback: Callback) -> None:
+        """Unregister callback if it is registered.
+
+        Args:
+            callback: Previously registered coroutine function.
+
+        Returns:
+            None
+        """
+
+        with contextlib.suppress(ValueError):
+            self._callbacks.remove(callback)
+
+    async def cancel(self) -> None:
+        """Run all registered callbacks concurrently.
+
+        Exceptions of callbacks are ignored, cancellation is best effort.
+
+        Returns:
+            None
+        """
+
+        self.cancelled = True
+        callbacks, self._callbacks = self._callbacks, []
+        await asyncio.gather(
+            *(callback() for callback in callbacks),
+            return_exceptions=True,
+        )
+
+
+#: ContextVar: Scope of the current request, None outside of requests.
+_scope: ContextVar[Optional[CancelScope]] = ContextVar("cancel_scope", default=None)
+
+
+@contextlib.contextmanager
+def cancel_scope() -> Iterator[CancelScope]:
+    """Create scope for callbacks registered inside the block.
+
+    Returns:
+        New scope bound to the current context.
+    """
+
+    scope = CancelScope()
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _scope.reset(token)
+
+
+@contextlib.contextmanager
+def on_cancel(callback: Callback) -> Iterator[None]:
+    """Register ``callback`` in the current scope for the block.
+
+    Args:
+        callback: Coroutine function that stops the work of the block.
+
+    Examples:
+        Stop a query when the client disconnects::
+
+            with on_cancel(lambda: cancel_query(conn)):
+                await cursor.execute(q)
+
+    Returns:
+        None
+    """
+
+    scope = _scope.get()
+    if scope is None:
+        yield
+        return
+
+    scope.add(callback)
+    try:
+        yield
+    finally:
+        scope.discard(callback)
@@ -0,0 +1,66 @@
+"""Deadline of the current request carried in a context variable.
+
+The deadline is set once at the edge of the server, see
+:class:`app.internal.pkg.middlewares.deadline.DeadlineMiddleware`, and
+every layer below reads the remaining budget with :func:`.remaining`
+instead of passing timeouts around.
+"""
+
+import contextlib
+import time
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+__all__ = ["deadline", "remaining"]
+
+#: ContextVar: ``time.monotonic`` value at which the current request expires.
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+@contextlib.contextmanager
+def deadline(timeout: Optional[float]) -> Iterator[None]:
+    """Limit the remaining budget of the block to ``timeout`` seconds.
+
+    Nested deadlines can only shorten the budget, never extend it.
+
+    Args:
+        timeout: Number of seconds the block may take, None for no limit.
+
+    Examples:
+        Give a block at most two seconds::
+
+            >>> with deadline(2.0):
+            ...     assert remaining() <= 2.0
+
+    Returns:
+        None
+    """
+
+    if timeout is None:
+        yield
+        return
+
+    expires = time.monotonic() + timeout
+    current = _deadline.get()
+    if current is not None:
+        expires = min(expires, current)
+
+    token = _deadline.set(expires)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Get remaining budget of the current request.
+
+    Returns:
+        Number of seconds until the deadline, zero or negative if it has
+        passed, None if the request has no deadline.
+    """
+
+    expires = _deadline.get()
+    if expires is None:
+        return None
+    return expires - time.monotonic()
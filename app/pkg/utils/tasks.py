@@ -0,0 +1,49 @@
+"""Background tasks detached from the request that started them.
+
+``asyncio`` copies the context variables of the caller into every task
+and callback, so work started from a request would inherit its deadline,
+disconnect cancel scope, read-your-writes state and trace span. Work that
+outlives the request must start in an empty context instead.
+"""
+
+import asyncio
+import contextvars
+from typing import Any, Callable, Coroutine, TypeVar
+
+__all__ = ["call_later_detached", "create_detached_task"]
+
+_T = TypeVar("_T")
+
+
+def create_detached_task(coro: Coroutine[Any, Any, _T]) -> "asyncio.Task[_T]":
+    """Run ``coro`` in a new task with empty context variables.
+
+    Args:
+        coro: Coroutine of the background work.
+
+    Returns:
+        The started task.
+    """
+
+    return contextvars.Context().run(asyncio.create_task, coro)
+
+
+def call_later_detached(
+    delay: float,
+    callback: Callable[[], Any],
+) -> asyncio.TimerHandle:
+    """Schedule ``callback`` with empty context variables.
+
+    Args:
+        delay: Number of seconds to wait.
+        callback: Function called without arguments.
+
+    Returns:
+        Handle that cancels the call.
+    """
+
+    return asyncio.get_running_loop().call_later(
+        delay,
+        callback,
+        context=contextvars.Context(),
+    )
@@ -0,0 +1,33 @@
+"""
+saved searches and notifications
+"""
+
+from yoyo import step
+
+__depends__ = {'20240606_01_YwSRu-profiles'}
+
+steps = [
+    step("""
+    CREATE TABLE saved_searches(
+        id SERIAL PRIMARY KEY,
+        user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        query VARCHAR(256) NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    CREATE INDEX saved_searches_user_id_idx ON saved_searches(user_id);
+
+    CREATE TABLE notifications(
+        id BIGSERIAL PRIMARY KEY,
+        user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+        saved_search_id INTEGER NOT NULL
+            REFERENCES saved_searches(id) ON DELETE CASCADE,
+        profile_user_id UUID NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    CREATE INDEX notifications_user_id_idx ON notifications(user_id, id);
+    CREATE INDEX notifications_saved_search_id_idx
+        ON notifications(saved_search_id);
+    """,
+         "DROP TABLE notifications; DROP TABLE saved_searches;"
+         ),
+]
@@ -0,0 +1,26 @@
+"""
+profiles user_id index
+
+Every ``ProfileRepository`` query filters on ``profiles.user_id``, and a
+user has at most one profile, so the index is unique. It is built
+``CONCURRENTLY`` to keep the table writable, which is not allowed inside
+a transaction.
+
+If the build fails (for example on duplicated ``user_id``), Postgres leaves
+an INVALID index behind: remove duplicates, drop the index and apply the
+migration again.
+"""
+
+from yoyo import step
+
+__depends__ = {'20241019_01_Kp4Rt-saved-searches'}
+
+__transactional__ = False
+
+steps = [
+    step(
+        "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS profiles_user_id_key "
+        "ON profiles(user_id);",
+        "DROP INDEX CONCURRENTLY IF EXISTS profiles_user_id_key;",
+    ),
+]
@@ -0,0 +1,23 @@
+"""
+row versions
+
+``version`` of a row is incremented by every update and checked by it,
+so that concurrent updates of a profile fail instead of overwriting each
+other. Adding a column with a constant default does not rewrite the
+tables.
+"""
+
+from yoyo import step
+
+__depends__ = {'20241019_02_Vb8Qm-profiles-user-id-index'}
+
+steps = [
+    step(
+        "ALTER TABLE profiles ADD COLUMN version INTEGER NOT NULL DEFAULT 1;",
+        "ALTER TABLE profiles DROP COLUMN version;",
+    ),
+    step(
+        "ALTER TABLE users ADD COLUMN version INTEGER NOT NULL DEFAULT 1;",
+        "ALTER TABLE users DROP COLUMN version;",
+    ),
+]
@@ -0,0 +1,102 @@
+"""Compare migration of models one by one and with ``migrate_many``.
+
+``migrate`` builds the whole ``to_dict`` of every item. ``to_dict plan``
+is ``migrate_many`` before it read planned attributes: the same plan of
+fields, but values taken from ``to_dict`` of every item. No database is
+needed::
+
+    python -m scripts.benchmarks.migrate_many --number 10000
+"""
+
+import timeit
+import uuid
+from argparse import ArgumentParser
+
+from app.pkg import models
+from app.pkg.models.base import BaseModel
+
+SAMPLES = {
+    "Profile->ReadProfileQuery": (
+        models.Profile(
+            id=1,
+            user_id=uuid.uuid4(),
+            first_name="Alexandr",
+            last_name="Popov",
+            telegram="@tester1337",
+            bio="Легко приспосабливаюсь к новым условиям и требованиям.",
+            version=1,
+        ),
+        models.ReadProfileQuery,
+    ),
+    "Profile->UpdateProfileCommand": (
+        models.Profile(
+            id=1,
+            user_id=uuid.uuid4(),
+            first_name="Alexandr",
+            last_name="Popov",
+            telegram="@tester1337",
+            bio="Легко приспосабливаюсь к новым условиям и требованиям.",
+            version=1,
+        ),
+        models.UpdateProfileCommand,
+    ),
+    "User->ReadUserQuery": (
+        models.User(
+            id=uuid.uuid4(),
+            email="tester@example.com",
+            password="password",
+            is_activated=True,
+        ),
+        models.ReadUserQuery,
+    ),
+}
+
+
+def _to_dict_plan(items, model) -> list:
+    fields = [name for name in model.__fields__ if name in type(items[0]).__fields__]
+    result = []
+    for item in items:
+        data = item.to_dict(show_secrets=True)
+        result.append(model(**{name: data[name] for name in fields}))
+    return result
+
+
+def bench(number: int) -> None:
+    """Migrate ``number`` copies of every sample in each way and print
+    results."""
+
+    for name, (sample, model) in SAMPLES.items():
+        items = [sample] * number
+        expected = [item.migrate(model) for item in items[:1]]
+        assert BaseModel.migrate_many(items[:1], model) == expected
+        assert _to_dict_plan(items[:1], model) == expected
+
+        one_by_one = min(
+            timeit.repeat(lambda: [item.migrate(model) for item in items], number=1),
+        )
+        to_dict_plan = min(
+            timeit.repeat(lambda: _to_dict_plan(items, model), number=1),
+        )
+        planned = min(
+            timeit.repeat(lambda: BaseModel.migrate_many(items, model), number=1),
+        )
+        print(
+            f"{name:<30} migrate={one_by_one:.3f}s "
+            f"to_dict plan={to_dict_plan:.3f}s "
+            f"migrate_many={planned:.3f}s "
+            f"speedup={one_by_one / planned:.1f}x",
+        )
+
+
+def cli():
+    """Parse arguments and run the benchmark."""
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=10_000)
+    args = parser.parse_args()
+
+    bench(args.number)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,76 @@
+"""Compare plain and prepared execution of a repository query.
+
+Reports client-side latency and server-side planning time taken from
+``EXPLAIN (ANALYZE)``. Run against a database with profiles::
+
+    python -m scripts.benchmarks.prepared_statements --iterations 5000
+"""
+
+import asyncio
+import statistics
+import time
+from argparse import ArgumentParser
+
+from app.configuration import __containers__
+from app.internal.repository.postgresql import connection
+
+QUERY = """
+    select
+        id , user_id, first_name, last_name, telegram, bio
+    from profiles
+    where user_id = %(user_id)s
+    """
+
+
+async def _planning_time(cursor, operation: str, parameters) -> float:
+    await cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {operation}", parameters)
+    return (await cursor.fetchone())["QUERY PLAN"][0]["Planning Time"]
+
+
+async def bench(iterations: int) -> None:
+    """Run the query ``iterations`` times in both modes and print results."""
+
+    async with connection.get_connection(return_pool=True) as pool:
+        async with connection.acquire_connection(pool) as cursor:
+            await cursor.execute("select user_id from profiles limit 1")
+            parameters = {"user_id": str((await cursor.fetchone())["user_id"])}
+
+        for prepared in (False, True):
+            latencies, planning = [], []
+            async with connection.acquire_connection(pool, prepared=prepared) as cur:
+                for _ in range(iterations):
+                    started = time.perf_counter()
+                    await cur.execute(QUERY, parameters)
+                    await cur.fetchone()
+                    latencies.append(time.perf_counter() - started)
+
+                operation, values = QUERY, parameters
+                if prepared:
+                    statement = await cur.cache.prepare(cur.cursor, QUERY, True)
+                    operation = f"EXECUTE {statement.name}(%s)"
+                    values = statement.values(parameters)
+
+                for _ in range(min(iterations, 100)):
+                    planning.append(await _planning_time(cur, operation, values))
+
+            print(
+                f"prepared={prepared!s:<5} "
+                f"latency p50={statistics.median(latencies) * 1000:.3f}ms "
+                f"p99={statistics.quantiles(latencies, n=100)[98] * 1000:.3f}ms "
+                f"planning mean={statistics.mean(planning):.3f}ms",
+            )
+
+
+def cli():
+    """Parse arguments and run the benchmark."""
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    __containers__.wire_packages(pkg_name=__name__)
+    asyncio.run(bench(args.iterations))
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,78 @@
+"""Compare memory held by profiles read in bulk.
+
+Rows of the database are converted the way ``collect_response`` does:
+validated by ``parse_obj_as`` as before, constructed without validation
+by :meth:`.BaseModel.from_trusted`, and as :class:`.ProfileRow`. No
+database is needed::
+
+    python -m scripts.benchmarks.rows_memory --rows 100000
+"""
+
+import datetime
+import gc
+import time
+import tracemalloc
+import typing
+import uuid
+from argparse import ArgumentParser
+
+import pydantic
+
+from app.pkg import models
+
+BUILDERS = {
+    "parse_obj_as": lambda rows: pydantic.parse_obj_as(
+        typing.List[models.Profile],
+        rows,
+    ),
+    "from_trusted": lambda rows: [models.Profile.from_trusted(r) for r in rows],
+    "ProfileRow": lambda rows: [models.ProfileRow.from_row(r) for r in rows],
+}
+
+
+def _rows(count: int) -> typing.List[dict]:
+    return [
+        {
+            "id": i + 1,
+            "user_id": uuid.uuid4(),
+            "first_name": "Alexandr",
+            "last_name": "Popov",
+            "telegram": "@tester1337",
+            "bio": "Легко приспосабливаюсь к новым условиям и требованиям.",
+            "created_at": datetime.datetime.now(),
+        }
+        for i in range(count)
+    ]
+
+
+def bench(count: int) -> None:
+    """Convert ``count`` rows in every way and print memory and time."""
+
+    rows = _rows(count)
+    for name, build in BUILDERS.items():
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = build(rows)
+        elapsed = time.perf_counter() - start
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{name:<14} {size / 2**20:8.1f}MiB "
+            f"{size / count:6.0f}B/row {elapsed * 1e3:8.1f}ms",
+        )
+        del result
+
+
+def cli():
+    """Parse arguments and run the benchmark."""
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    bench(args.rows)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,83 @@
+"""Compare the default and the ``orjson`` serialization of profiles.
+
+The default path is what ``FastAPI`` does for a route with
+``response_model``: validate the result, convert it with
+``jsonable_encoder`` and render it with ``json``. The new path renders
+the models with :class:`.ModelResponse`. No database is needed::
+
+    python -m scripts.benchmarks.serialization --profiles 10000
+"""
+
+import asyncio
+import statistics
+import time
+import typing
+import uuid
+from argparse import ArgumentParser
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.internal.pkg.responses import ModelResponse
+from app.pkg import models
+
+
+async def _default(field, profiles: typing.List[models.Profile]) -> bytes:
+    content = await serialize_response(
+        field=field,
+        response_content=profiles,
+        is_coroutine=True,
+    )
+    return JSONResponse(content).body
+
+
+async def _model_response(field, profiles: typing.List[models.Profile]) -> bytes:
+    return ModelResponse(profiles).body
+
+
+async def bench(count: int, repeat: int) -> None:
+    """Serialize ``count`` profiles ``repeat`` times and print results."""
+
+    profiles = [
+        models.Profile(
+            id=i + 1,
+            user_id=uuid.uuid4(),
+            first_name="Alexandr",
+            last_name="Popov",
+            telegram="@tester1337",
+            bio="Легко приспосабливаюсь к новым условиям и требованиям.",
+        )
+        for i in range(count)
+    ]
+    field = create_response_field(
+        name="Response_read_all",
+        type_=typing.List[models.Profile],
+    )
+
+    for name, serialize in (("default", _default), ("orjson", _model_response)):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            body = await serialize(field, profiles)
+            timings.append(time.perf_counter() - started)
+        print(
+            f"{name:<8} {count} profiles "
+            f"median={statistics.median(timings) * 1000:.1f}ms "
+            f"min={min(timings) * 1000:.1f}ms size={len(body)}B",
+        )
+
+
+def cli():
+    """Parse arguments and run the benchmark."""
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--profiles", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(bench(args.profiles, args.repeat))
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,81 @@
+"""Compare the generic and the compiled conversion of ``to_dict``.
+
+The generic conversion runs :func:`.cast_value` on every value of
+``dict()``, as ``to_dict`` did before serializers were compiled per
+class. No database is needed::
+
+    python -m scripts.benchmarks.to_dict --number 100000
+"""
+
+import timeit
+import uuid
+from argparse import ArgumentParser
+
+from app.pkg import models
+from app.pkg.models.base.serializer import cast_value
+
+SAMPLES = {
+    "Profile": models.Profile(
+        id=1,
+        user_id=uuid.uuid4(),
+        first_name="Alexandr",
+        last_name="Popov",
+        telegram="@tester1337",
+        bio="Легко приспосабливаюсь к новым условиям и требованиям.",
+    ),
+    "User": models.User(
+        id=uuid.uuid4(),
+        email="tester@example.com",
+        password="password",
+        is_activated=True,
+    ),
+    "Notification": models.Notification(
+        id=1,
+        user_id=uuid.uuid4(),
+        saved_search_id=1,
+        profile_user_id=uuid.uuid4(),
+    ),
+}
+
+
+def _generic(model, show_secrets: bool) -> dict:
+    return {k: cast_value(v, show_secrets) for k, v in model.dict().items()}
+
+
+def bench(number: int) -> None:
+    """Convert every sample ``number`` times in both ways and print results."""
+
+    for name, model in SAMPLES.items():
+        assert _generic(model, True) == model.to_dict(show_secrets=True)
+        dict_only = min(timeit.repeat(model.dict, number=number, repeat=3))
+        generic = min(
+            timeit.repeat(lambda: _generic(model, True), number=number, repeat=3),
+        )
+        compiled = min(
+            timeit.repeat(
+                lambda: model.to_dict(show_secrets=True),
+                number=number,
+                repeat=3,
+            ),
+        )
+        print(
+            f"{name:<18} dict()={dict_only / number * 1e6:.2f}us "
+            f"generic={generic / number * 1e6:.2f}us "
+            f"compiled={compiled / number * 1e6:.2f}us "
+            f"conversion speedup="
+            f"{(generic - dict_only) / max(compiled - dict_only, 1e-9):.1f}x",
+        )
+
+
+def cli():
+    """Parse arguments and run the benchmark."""
+
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=100_000)
+    args = parser.parse_args()
+
+    bench(args.number)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,44 @@
+"""Build the profile recommendations index and save it to disk.
+
+Workers memory-map the saved snapshot at boot instead of rebuilding the
+index themselves, so run this script after migrations and periodically
+to consolidate incremental updates.
+"""
+
+import asyncio
+
+from dependency_injector.wiring import Provide, inject
+
+from app.configuration import __containers__
+from app.internal.services import Services
+from app.internal.services.recommendation import RecommendationService
+from app.pkg.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@inject
+async def build(
+    recommendation_service: RecommendationService = Provide[
+        Services.recommendation_service
+    ],
+) -> None:
+    """Rebuild the index from all profiles in the database."""
+
+    count = await recommendation_service.rebuild()
+    logger.info(
+        "Profile index saved to %s: %s profiles",
+        recommendation_service.index_path,
+        count,
+    )
+
+
+def cli():
+    """Wire containers and build the index."""
+
+    __containers__.wire_packages(pkg_name=__name__)
+    asyncio.run(build())
+
+
+if __name__ == "__main__":
+    cli()
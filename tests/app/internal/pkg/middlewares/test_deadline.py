@@ -0,0 +1,46 @@
+"""Module for testing the deadline middleware."""
+
+import pytest
+
+from app.internal.pkg.middlewares.deadline import DeadlineMiddleware
+from app.pkg.utils.deadline import remaining
+
+
+async def budget_of(middleware_kwargs, path="/v1/profile/", headers=()):
+    budgets = []
+
+    async def app(scope, receive, send):
+        budgets.append(remaining())
+
+    middleware = DeadlineMiddleware(app, **middleware_kwargs)
+    scope = {"type": "http", "path": path, "headers": list(headers)}
+    await middleware(scope, None, None)
+    return budgets[0]
+
+
+async def test_without_deadline():
+    assert await budget_of({}) is None
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ([(b"x-request-timeout", b"2.5")], 2.5),
+        ([(b"x-request-timeout", b"1000")], 30.0),
+        ([(b"x-request-timeout", b"nan")], 5.0),
+        ([(b"x-request-timeout", b"-1")], 5.0),
+        ([(b"x-request-timeout", b"soon")], 5.0),
+    ],
+)
+async def test_header(headers, expected):
+    budget = await budget_of({"default": 5.0, "maximum": 30.0}, headers=headers)
+
+    assert expected - 0.1 < budget <= expected
+
+
+async def test_longest_route_prefix_wins():
+    kwargs = {"default": 5.0, "routes": {"/v1/": 3.0, "/v1/profile/": 1.0}}
+
+    assert 0.9 < await budget_of(kwargs, path="/v1/profile/search") <= 1.0
+    assert 2.9 < await budget_of(kwargs, path="/v1/user/") <= 3.0
+    assert 4.9 < await budget_of(kwargs, path="/metrics") <= 5.0
@@ -0,0 +1,145 @@
+"""Module for testing the disconnect middleware."""
+
+import asyncio
+
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.internal.pkg.middlewares.disconnect import DisconnectMiddleware
+from app.pkg.utils.cancellation import on_cancel
+
+SCOPE = {"type": "http", "method": "GET", "path": "/v1/profile/search"}
+
+
+def client(*messages):
+    queue = asyncio.Queue()
+    for message in messages:
+        queue.put_nowait(message)
+    return queue.get
+
+
+async def test_disconnect_cancels_handler_and_queries():
+    events = []
+
+    async def cancel_query():
+        events.append("query cancelled")
+
+    async def app(scope, receive, send):
+        assert (await receive())["type"] == "http.request"
+        with on_cancel(cancel_query):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                events.append("handler cancelled")
+                raise
+
+    receive = client(
+        {"type": "http.request", "body": b"", "more_body": False},
+        {"type": "http.disconnect"},
+    )
+    await asyncio.wait_for(
+        DisconnectMiddleware(app, grace=0.01)(SCOPE, receive, None),
+        1,
+    )
+
+    assert events == ["query cancelled", "handler cancelled"]
+
+
+async def test_handler_finishes_query_cancelled_on_server():
+    events = []
+    query = asyncio.get_running_loop().create_future()
+
+    async def cancel_query():
+        # The server stops the query a little after the cancel request.
+        asyncio.get_running_loop().call_later(
+            0.01,
+            query.set_exception,
+            RuntimeError("canceling statement due to user request"),
+        )
+
+    async def app(scope, receive, send):
+        await receive()
+        try:
+            with on_cancel(cancel_query):
+                await query
+        except RuntimeError:
+            events.append("query failed")
+        except asyncio.CancelledError:
+            events.append("handler cancelled")
+            raise
+        finally:
+            events.append("connection released")
+
+    receive = client(
+        {"type": "http.request", "body": b"", "more_body": False},
+        {"type": "http.disconnect"},
+    )
+    await asyncio.wait_for(DisconnectMiddleware(app)(SCOPE, receive, None), 1)
+
+    assert events == ["query failed", "connection released"]
+
+
+async def test_completed_request_is_not_cancelled():
+    sent = []
+
+    async def app(scope, receive, send):
+        await receive()
+        await send({"type": "http.response.start", "status": 200})
+
+    async def send(message):
+        sent.append(message)
+
+    receive = client({"type": "http.request", "body": b"", "more_body": False})
+    await DisconnectMiddleware(app)(SCOPE, receive, send)
+
+    assert sent == [{"type": "http.response.start", "status": 200}]
+
+
+class Server:
+    """Client of uvicorn, which reports a disconnect once the response is
+    sent."""
+
+    def __init__(self, *messages):
+        self.messages = list(messages)
+        self.responded = asyncio.Event()
+
+    async def receive(self):
+        if self.messages:
+            return self.messages.pop(0)
+        await self.responded.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        if message["type"] == "http.response.body":
+            self.responded.set()
+
+
+async def test_background_task_survives_disconnect_after_response():
+    done = []
+
+    async def notify():
+        await asyncio.sleep(0.05)
+        done.append("background task")
+
+    async def endpoint(request):
+        return PlainTextResponse("ok", background=BackgroundTask(notify))
+
+    app = Starlette(routes=[Route(SCOPE["path"], endpoint)])
+    scope = {
+        **SCOPE,
+        "headers": [],
+        "query_string": b"",
+        "root_path": "",
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "app": app,
+    }
+    server = Server({"type": "http.request", "body": b"", "more_body": False})
+    await asyncio.wait_for(
+        DisconnectMiddleware(app)(scope, server.receive, server.send),
+        1,
+    )
+
+    assert done == ["background task"]
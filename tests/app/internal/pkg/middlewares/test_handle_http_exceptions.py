@@ -0,0 +1,23 @@
+"""Module for testing handlers of API exceptions."""
+
+import uuid
+
+import orjson
+
+from app.internal.pkg.middlewares.handle_http_exceptions import (
+    handle_version_conflict,
+)
+from app.pkg import models
+from app.pkg.models.exceptions.repository import VersionConflict
+
+
+def test_version_conflict_returns_current_state():
+    current = models.Profile(id=1, user_id=uuid.uuid4(), bio="Golang", version=3)
+
+    response = handle_version_conflict(None, VersionConflict(current=current))
+
+    assert response.status_code == 409
+    body = orjson.loads(response.body)
+    assert body["message"] == VersionConflict.message
+    assert body["current"]["version"] == 3
+    assert body["current"]["bio"] == "Golang"
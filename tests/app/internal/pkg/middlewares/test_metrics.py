@@ -0,0 +1,44 @@
+"""Module for testing the metrics middleware."""
+
+import pytest
+
+from app.internal.pkg.middlewares.metrics import (
+    HTTP_IN_FLIGHT,
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUESTS,
+    UNMATCHED,
+    MetricsMiddleware,
+)
+
+
+class Route:
+    path = "/v1/profile/{user_id:uuid}"
+
+
+async def send(message):
+    pass
+
+
+async def test_request_is_labelled_with_route_template():
+    async def app(scope, receive, send):
+        scope["route"] = Route()
+        await send({"type": "http.response.start", "status": 200})
+
+    scope = {"type": "http", "method": "GET", "path": "/v1/profile/1"}
+    await MetricsMiddleware(app)(scope, None, send)
+
+    labels = {"method": "GET", "route": Route.path}
+    assert HTTP_REQUESTS.get(**labels, status=200) == 1
+    assert HTTP_REQUEST_SECONDS.count(**labels) == 1
+    assert HTTP_IN_FLIGHT.get() == 0
+
+
+async def test_failed_request_is_counted_as_server_error():
+    async def app(scope, receive, send):
+        raise RuntimeError
+
+    scope = {"type": "http", "method": "POST", "path": "/unknown"}
+    with pytest.raises(RuntimeError):
+        await MetricsMiddleware(app)(scope, None, send)
+
+    assert HTTP_REQUESTS.get(method="POST", route=UNMATCHED, status=500) == 1
@@ -0,0 +1,52 @@
+"""Module for testing the tracing middleware."""
+
+from app.internal.pkg.middlewares.tracing import TracingMiddleware
+from app.pkg.tracing import tracer
+
+TRACEPARENT = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+
+class Route:
+    path = "/v1/profile/{user_id:uuid}"
+
+
+class ListExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+async def send(message):
+    pass
+
+
+async def test_root_span_is_named_after_route(monkeypatch):
+    exporter = ListExporter()
+    monkeypatch.setattr(tracer, "exporter", exporter)
+    monkeypatch.setattr(tracer, "sample_rate", 0.01)
+
+    async def app(scope, receive, send):
+        scope["route"] = Route()
+        with tracer.span("child"):
+            await send({"type": "http.response.start", "status": 200})
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/v1/profile/1",
+        "headers": [(b"traceparent", TRACEPARENT.encode())],
+    }
+    await TracingMiddleware(app)(scope, None, send)
+
+    child, root = exporter.spans
+    assert root.name == f"GET {Route.path}"
+    assert root.trace_id == child.trace_id == TRACEPARENT.split("-")[1]
+    assert root.parent_id == TRACEPARENT.split("-")[2]
+    assert root.attributes == {
+        "http.method": "GET",
+        "http.target": "/v1/profile/1",
+        "http.status_code": 200,
+        "http.route": Route.path,
+    }
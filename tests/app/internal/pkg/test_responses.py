@@ -0,0 +1,83 @@
+"""Module for testing response classes."""
+
+import datetime
+import json
+import typing
+import uuid
+
+import fastapi
+import pydantic
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.internal.pkg.responses import ModelResponse, ORJSONResponse
+from app.pkg.models.base import BaseModel
+from app.pkg.models.types import EncryptedSecretBytes
+
+
+class Nested(BaseModel):
+    created: datetime.datetime
+    day: datetime.date
+
+
+class Sample(BaseModel):
+    user_id: uuid.UUID
+    password: pydantic.SecretStr
+    empty: typing.Optional[pydantic.SecretStr] = None
+    data: bytes
+    tags: typing.List[str]
+    nested: typing.List[Nested]
+
+
+SAMPLE = Sample(
+    user_id=uuid.uuid4(),
+    password="secret",
+    empty="",
+    data=b"data",
+    tags=["a", "b"],
+    nested=[
+        Nested(
+            created=datetime.datetime(2024, 1, 2, tzinfo=datetime.timezone.utc),
+            day=datetime.date(2024, 1, 2),
+        ),
+    ],
+)
+
+
+def test_models_are_encoded_like_jsonable_encoder():
+    expected = JSONResponse(jsonable_encoder([SAMPLE])).body
+
+    body = ModelResponse([SAMPLE]).body
+
+    assert json.loads(body) == json.loads(expected)
+
+
+def test_encoded_data_is_rendered_unchanged():
+    content = jsonable_encoder({"items": [SAMPLE], "count": 1})
+
+    body = ORJSONResponse(content).body
+
+    assert json.loads(body) == json.loads(JSONResponse(content).body)
+
+
+def test_secret_bytes_are_decoded():
+    class Secret(BaseModel):
+        encrypted: EncryptedSecretBytes
+
+    body = ModelResponse(Secret(encrypted=b"encrypted")).body
+
+    assert json.loads(body) == {"encrypted": "encrypted"}
+
+
+def test_headers_of_injected_response_are_kept():
+    injected = fastapi.Response()
+    del injected.headers["content-length"]
+    injected.set_cookie("access_token", "token")
+    injected.status_code = 202
+
+    response = ModelResponse([], response=injected)
+
+    assert response.status_code == 202
+    assert response.body == b"[]"
+    assert response.headers["set-cookie"].startswith("access_token=token")
+    assert response.headers["content-length"] == "2"
@@ -0,0 +1,136 @@
+"""Module for testing instrumentation of connection checkout."""
+
+import asyncio
+
+import pytest
+
+from app.internal.repository.postgresql import connection
+from app.internal.repository.postgresql.connection import acquire_connection
+from app.pkg.connectors.postgresql.metrics import (
+    POOL_ACQUIRE_TIMEOUTS,
+    POOL_HOLD_SECONDS,
+    track_pool,
+)
+from app.pkg.models.exceptions.repository import DeadlineExceeded, PoolTimeout
+from app.pkg.settings import settings
+from app.pkg.utils.deadline import deadline
+
+
+class FakeCursor:
+    def __init__(self, queries):
+        self.queries = queries
+
+    async def execute(self, operation, parameters=None):
+        self.queries.append(operation % parameters if parameters else operation)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.queries = []
+
+    async def cursor(self, cursor_factory=None):
+        return FakeCursor(self.queries)
+
+
+class FakePool:
+    """Pool that hands out one connection and blocks while it is taken."""
+
+    def __init__(self):
+        self.free = asyncio.Queue()
+        self.free.put_nowait(FakeConnection())
+
+    def acquire(self):
+        return self.free.get()
+
+    async def release(self, conn):
+        self.free.put_nowait(conn)
+
+
+def count(metric, name):
+    return next(
+        value
+        for sample, labels, value in metric.samples()
+        if labels == {"pool": name} and sample.endswith(("_total", "_count"))
+    )
+
+
+async def test_acquire_timeout(monkeypatch):
+    monkeypatch.setattr(settings.POSTGRES, "ACQUIRE_TIMEOUT", 0.01)
+    pool = FakePool()
+    track_pool(pool, name="fake")
+
+    async with acquire_connection(pool):
+        with pytest.raises(PoolTimeout):
+            async with acquire_connection(pool):
+                pass
+
+    async with acquire_connection(pool):
+        pass
+
+    assert count(POOL_ACQUIRE_TIMEOUTS, "fake") == 1
+    assert count(POOL_HOLD_SECONDS, "fake") == 2
+
+
+async def test_acquire_deadline(monkeypatch):
+    monkeypatch.setattr(settings.POSTGRES, "ACQUIRE_TIMEOUT", 10.0)
+    pool = FakePool()
+    track_pool(pool, name="fake-deadline")
+
+    async with acquire_connection(pool):
+        with deadline(0.01):
+            with pytest.raises(DeadlineExceeded):
+                async with acquire_connection(pool):
+                    pass
+
+    with deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            async with acquire_connection(pool):
+                pass
+
+
+async def test_statement_timeout():
+    pool = FakePool()
+    conn = pool.free.get_nowait()
+    pool.free.put_nowait(conn)
+
+    with deadline(5.0):
+        async with acquire_connection(pool):
+            pass
+    async with acquire_connection(pool):
+        pass
+    async with acquire_connection(pool):
+        pass
+
+    set_timeout, reset_timeout = conn.queries
+    assert set_timeout.startswith("SET statement_timeout = ")
+    assert 4000 < int(set_timeout.rsplit(" ", 1)[1]) <= 5000
+    assert reset_timeout == "RESET statement_timeout"
+
+
+async def test_same_statement_timeout_is_not_set_again(monkeypatch):
+    pool = FakePool()
+    conn = pool.free.get_nowait()
+    pool.free.put_nowait(conn)
+    monkeypatch.setattr(connection, "remaining", lambda: 5.0)
+
+    async with acquire_connection(pool):
+        pass
+    async with acquire_connection(pool):
+        pass
+
+    assert conn.queries == ["SET statement_timeout = 5000"]
+
+
+async def test_transaction_sets_local_statement_timeout(monkeypatch):
+    pool = FakePool()
+    conn = pool.free.get_nowait()
+    pool.free.put_nowait(conn)
+    monkeypatch.setattr(connection, "remaining", lambda: 5.0)
+
+    async with acquire_connection(pool, begin=True):
+        pass
+    monkeypatch.setattr(connection, "remaining", lambda: None)
+    async with acquire_connection(pool, begin=True):
+        pass
+
+    assert conn.queries == ["BEGIN; SET LOCAL statement_timeout = 5000", "BEGIN"]
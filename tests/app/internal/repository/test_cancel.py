@@ -0,0 +1,66 @@
+"""Module for testing cancellation of running queries."""
+
+import asyncio
+
+import pytest
+from psycopg2.extensions import QueryCanceledError
+
+from app.internal.pkg.middlewares.disconnect import DisconnectMiddleware
+from app.internal.repository.postgresql.connection import (
+    acquire_connection,
+    get_connection,
+)
+from app.pkg.utils.cancellation import cancel_scope
+
+
+@pytest.mark.postgresql
+async def test_cancelled_query_releases_connection(clean_postgres):
+    _ = clean_postgres
+
+    async def slow_query():
+        async with get_connection() as cur:
+            await cur.execute("select pg_sleep(10)")
+
+    with cancel_scope() as scope:
+        task = asyncio.create_task(slow_query())
+        await asyncio.sleep(0.2)
+        await scope.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(task, timeout=2)
+
+    async with get_connection(return_pool=True) as pool:
+        assert pool.freesize == pool.size
+    async with get_connection() as cur:
+        await cur.execute("select 1 as one")
+        assert await cur.fetchone() == {"one": 1}
+
+
+@pytest.mark.postgresql
+async def test_disconnect_keeps_connection_of_cancelled_query(clean_postgres):
+    _ = clean_postgres
+    connections = []
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def app(scope, receive, send):
+        await receive()
+        async with get_connection(return_pool=True) as pool:
+            async with acquire_connection(pool) as cur:
+                connections.append(cur.connection)
+                with pytest.raises(QueryCanceledError):
+                    await cur.execute("select pg_sleep(10)")
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.sleep(0.2)
+        return {"type": "http.disconnect"}
+
+    scope = {"type": "http", "method": "GET", "path": "/v1/profile/search"}
+    async with get_connection(return_pool=True) as pool:
+        size = pool.size
+        await asyncio.wait_for(DisconnectMiddleware(app)(scope, receive, None), 2)
+
+        assert pool.size == size
+        assert pool.freesize == pool.size
+    assert not connections[0].closed
@@ -0,0 +1,121 @@
+"""Module for testing conversion of rows to models."""
+
+import typing
+import uuid
+
+import pytest
+
+from app.internal.repository.postgresql.handlers.collect_response import (
+    ROW_VALIDATION_MISMATCHES,
+    collect_response,
+)
+from app.pkg import models
+from app.pkg.models.base import Partial
+from app.pkg.models.exceptions.users import UserNotFound
+from app.pkg.settings import settings
+
+USER_ID = uuid.uuid4()
+
+
+def row(**values):
+    return {
+        "id": 1,
+        "user_id": USER_ID,
+        "first_name": "Alexandr",
+        "last_name": None,
+        "telegram": "@tester1337",
+        "bio": None,
+        "version": 1,
+        **values,
+    }
+
+
+class FakeRepository:
+    def __init__(self, rows):
+        self.rows = rows
+
+    @collect_response
+    async def read(self) -> models.Profile:
+        return self.rows[0] if self.rows else None
+
+    @collect_response
+    async def read_all(self) -> typing.List[models.Profile]:
+        return self.rows
+
+    @collect_response
+    async def read_all_rows(self) -> typing.List[models.ProfileRow]:
+        return self.rows
+
+    @collect_response
+    async def read_partial(self) -> Partial[models.Profile]:
+        return self.rows[0]
+
+    @collect_response
+    async def read_all_partial(self) -> typing.List[Partial[models.ProfileRow]]:
+        return self.rows
+
+
+async def test_rows_are_not_validated():
+    repository = FakeRepository([row(telegram="not a telegram", extra="ignored")])
+
+    profile = await repository.read()
+
+    assert profile.telegram == "not a telegram"
+    assert profile.user_id == USER_ID
+    assert "extra" not in profile.dict()
+
+
+async def test_list_of_models():
+    repository = FakeRepository([row(id=1), row(id=2)])
+
+    profiles = await repository.read_all()
+
+    assert [profile.id for profile in profiles] == [1, 2]
+    assert all(isinstance(profile, models.Profile) for profile in profiles)
+
+
+async def test_list_of_rows():
+    repository = FakeRepository([row(id=1), row(id=2, extra="ignored")])
+
+    rows = await repository.read_all_rows()
+
+    assert [profile.id for profile in rows] == [1, 2]
+    assert all(isinstance(profile, models.ProfileRow) for profile in rows)
+
+
+async def test_partial_results_have_selected_columns():
+    selected = {"user_id": USER_ID, "first_name": "Alexandr"}
+    repository = FakeRepository([selected, selected])
+
+    profile = await repository.read_partial()
+    rows = await repository.read_all_partial()
+
+    assert profile.dict() == selected
+    assert not hasattr(profile, "bio")
+    assert [r.dict() for r in rows] == [selected, selected]
+    assert type(rows[0]).__slots__ == ("user_id", "first_name")
+
+
+async def test_partial_results_with_all_columns():
+    repository = FakeRepository([row()])
+
+    assert type(await repository.read_partial()) is models.Profile
+    assert type((await repository.read_all_partial())[0]) is models.ProfileRow
+
+
+async def test_empty_result():
+    with pytest.raises(UserNotFound):
+        await FakeRepository([]).read_all()
+
+
+async def test_sampled_rows_are_validated(monkeypatch):
+    monkeypatch.setattr(settings.POSTGRES, "ROW_VALIDATION_SAMPLE_RATE", 1.0)
+    before = ROW_VALIDATION_MISMATCHES.get(model="Profile")
+
+    await FakeRepository([row()]).read()
+    assert ROW_VALIDATION_MISMATCHES.get(model="Profile") == before
+
+    await FakeRepository([row(first_name=" padded ")]).read()
+    await FakeRepository([row(telegram="invalid")]).read_all()
+    await FakeRepository([row(telegram="invalid")]).read_all_rows()
+    assert ROW_VALIDATION_MISMATCHES.get(model="Profile") == before + 3
@@ -0,0 +1,96 @@
+"""Module for testing statements compiled from models."""
+
+import pytest
+
+from app.internal.repository.postgresql import compiler
+from app.internal.repository.postgresql.compiler import Table
+from app.internal.repository.postgresql.prepared import Statement
+from app.pkg import models
+
+PROFILES = Table("profiles", models.Profile)
+
+COLUMNS = "user_id, first_name, last_name, telegram, bio, id, version"
+
+
+def test_select():
+    assert compiler.select(PROFILES) == f"select {COLUMNS} from profiles"
+    assert compiler.select(PROFILES, where=("user_id",), fields=("bio",)) == (
+        "select bio from profiles where user_id = %(user_id)s"
+    )
+
+
+def test_insert_columns_are_fields_of_command():
+    assert compiler.insert(PROFILES, models.CreateProfileCommand) == (
+        "insert into profiles(user_id, first_name, last_name, telegram, bio)"
+        " values (%(user_id)s, %(first_name)s, %(last_name)s, %(telegram)s,"
+        f" %(bio)s) returning {COLUMNS}"
+    )
+
+
+def test_update_and_delete():
+    assert compiler.update(PROFILES, values=("bio",), where=("user_id",)) == (
+        "update profiles set bio = %(bio)s where user_id = %(user_id)s"
+        f" returning {COLUMNS}"
+    )
+    assert compiler.delete(PROFILES, where=("id", "user_id")) == (
+        "delete from profiles where id = %(id)s and user_id = %(user_id)s"
+        f" returning {COLUMNS}"
+    )
+
+
+def test_update_of_changed_columns_only():
+    assert compiler.update(
+        PROFILES,
+        values=("first_name", "bio"),
+        where=("user_id",),
+        only_changed=True,
+    ) == (
+        "update profiles set first_name = %(first_name)s, bio = %(bio)s"
+        " where user_id = %(user_id)s"
+        " and row(first_name, bio) is distinct from row(%(first_name)s, %(bio)s)"
+        f" returning {COLUMNS}"
+    )
+
+
+def test_update_of_versioned_table():
+    table = Table("profiles", models.Profile, version="version")
+
+    assert compiler.update(table, values=("bio",), where=("user_id",)) == (
+        "update profiles set bio = %(bio)s, version = version + 1"
+        " where user_id = %(user_id)s and version = %(version)s"
+        f" returning {COLUMNS}"
+    )
+
+
+def test_statements_are_cached():
+    compiler.select.cache_clear()
+
+    compiler.select(PROFILES, where=("user_id",))
+    compiler.select(PROFILES, where=("user_id",))
+
+    assert compiler.select.cache_info().hits == 1
+
+
+@pytest.mark.parametrize(
+    "compile_",
+    [
+        lambda: compiler.select(PROFILES, fields=("bio; drop table users",)),
+        lambda: compiler.select(PROFILES, where=("password",)),
+        lambda: compiler.insert(PROFILES, models.User),
+        lambda: compiler.update(PROFILES, values=("bio",), where=()),
+        lambda: compiler.delete(PROFILES, where=()),
+    ],
+)
+def test_invalid_statements(compile_):
+    with pytest.raises(ValueError):
+        compile_()
+
+
+def test_statements_can_be_prepared():
+    statement = Statement.compile(
+        compiler.update(PROFILES, values=("bio",), where=("user_id",)),
+        with_parameters=True,
+    )
+
+    assert statement.keys == ("bio", "user_id")
+    assert "$2 returning" in statement.sql
@@ -0,0 +1,139 @@
+"""Module for testing prepared statements cache."""
+
+from types import SimpleNamespace
+
+import pytest
+from psycopg2 import errors
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS
+
+from app.internal.repository.postgresql.prepared import (
+    PreparedCursor,
+    Statement,
+    StatementCache,
+)
+
+
+class FakeCursor:
+    """Cursor that records executed statements instead of running them."""
+
+    def __init__(self, status=TRANSACTION_STATUS_IDLE, failing=()):
+        self.executed = []
+        self.failing = failing
+        self.connection = SimpleNamespace(
+            raw=SimpleNamespace(get_transaction_status=lambda: status),
+        )
+
+    async def execute(self, operation, parameters=None, **kwargs):
+        self.executed.append((operation, parameters))
+        if operation.startswith(self.failing):
+            raise errors.IndeterminateDatatype()
+
+
+def test_compile_named_placeholders():
+    statement = Statement.compile(
+        "select * from users where email = %(email)s and id = %(id)s "
+        "or email like 'a%%' or id = %(id)s",
+        with_parameters=True,
+    )
+
+    assert statement.sql == (
+        "select * from users where email = $1 and id = $2 "
+        "or email like 'a%' or id = $2"
+    )
+    assert statement.values({"id": 1, "email": "e", "extra": 2}) == ["e", 1]
+
+
+def test_compile_without_parameters_keeps_percent():
+    statement = Statement.compile(
+        "select * from users where email like 'a%%'",
+        with_parameters=False,
+    )
+
+    assert statement.sql == "select * from users where email like 'a%%'"
+    assert statement.values(None) == []
+
+
+async def test_statement_is_prepared_once():
+    cursor = FakeCursor()
+    prepared = PreparedCursor(cursor=cursor, cache=StatementCache(max_size=8))
+    q = "select * from users where id = %(id)s"
+
+    await prepared.execute(q, {"id": "1"})
+    await prepared.execute(q, {"id": "2"})
+
+    name = Statement.compile(q, with_parameters=True).name
+    assert cursor.executed == [
+        (f"PREPARE {name} AS select * from users where id = $1", None),
+        (f"EXECUTE {name}(%s)", ["1"]),
+        (f"EXECUTE {name}(%s)", ["2"]),
+    ]
+
+
+async def test_least_recently_used_statement_is_deallocated():
+    cursor = FakeCursor()
+    cache = StatementCache(max_size=1)
+
+    first = await cache.prepare(cursor, "select 1", with_parameters=False)
+    await cache.prepare(cursor, "select 2", with_parameters=False)
+
+    assert cursor.executed[-1] == (f"DEALLOCATE {first.name}", None)
+    assert len(cache) == 1
+
+
+@pytest.mark.parametrize(
+    "operation, parameters",
+    [
+        ("set statement_timeout = 100", None),
+        ("select 1; select 2", None),
+        ("select * from unnest(%(ids)s::uuid[])", {"ids": ["1", "2"]}),
+    ],
+)
+async def test_not_preparable_query_is_passed_through(operation, parameters):
+    cursor = FakeCursor()
+    prepared = PreparedCursor(cursor=cursor, cache=StatementCache(max_size=8))
+
+    await prepared.execute(operation, parameters)
+
+    assert cursor.executed == [(operation, parameters)]
+
+
+async def test_parameters_missing_in_query_do_not_prevent_preparing():
+    cursor = FakeCursor()
+    prepared = PreparedCursor(cursor=cursor, cache=StatementCache(max_size=8))
+    q = "select * from users where id = %(id)s"
+
+    await prepared.execute(q, {"id": "1", "ids": ["1", "2"]})
+
+    assert cursor.executed[0][0].startswith("PREPARE ")
+
+
+async def test_query_failing_to_prepare_is_executed_as_is():
+    cursor = FakeCursor(failing="PREPARE")
+    prepared = PreparedCursor(cursor=cursor, cache=StatementCache(max_size=8))
+    q = "select * from users where %(id)s is null or id = %(id)s"
+
+    await prepared.execute(q, {"id": None})
+    await prepared.execute(q, {"id": "1"})
+
+    assert [operation for operation, _ in cursor.executed] == [
+        f"PREPARE {Statement.compile(q, with_parameters=True).name} AS "
+        "select * from users where $1 is null or id = $1",
+        q,
+        q,
+    ]
+
+
+async def test_failed_prepare_does_not_abort_transaction():
+    cursor = FakeCursor(status=TRANSACTION_STATUS_INTRANS, failing="PREPARE")
+    prepared = PreparedCursor(cursor=cursor, cache=StatementCache(max_size=8))
+    q = "select * from users where %(id)s is null"
+
+    await prepared.execute(q, {"id": None})
+
+    assert [operation for operation, _ in cursor.executed] == [
+        "SAVEPOINT prepare_statement",
+        f"PREPARE {Statement.compile(q, with_parameters=True).name} AS "
+        "select * from users where $1 is null",
+        "ROLLBACK TO SAVEPOINT prepare_statement",
+        q,
+    ]
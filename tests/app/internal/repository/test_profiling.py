@@ -0,0 +1,86 @@
+"""Module for testing profiling of repository queries."""
+
+import pytest
+
+from app.internal.repository.postgresql.handlers.handle_exception import (
+    handle_exception,
+)
+from app.internal.repository.postgresql.profiling import (
+    QUERY_ERRORS,
+    QUERY_ROWS,
+    SLOW_QUERIES,
+    ProfiledCursor,
+    QueryProfiler,
+    current_profile,
+    profiler,
+    redact,
+)
+from app.pkg.models.exceptions.repository import EmptyResult
+from app.pkg.models.exceptions.users import UserNotFound
+
+
+class FakeCursor:
+    rowcount = -1
+
+    async def execute(self, operation, parameters=None):
+        self.rowcount = 3
+
+
+class FakeRepository:
+    @handle_exception
+    async def read(self):
+        cur = ProfiledCursor(FakeCursor(), current_profile())
+        await cur.execute("select * from users where id = %(id)s", {"id": 1})
+        return cur.rowcount
+
+    @handle_exception
+    async def read_missing(self):
+        raise EmptyResult
+
+
+def test_redact():
+    assert redact(None) is None
+    assert redact({"id": 1, "password": "pw", "access_token": "t"}) == {
+        "id": "1",
+        "password": "***",
+        "access_token": "***",
+    }
+    assert redact({"about": "x" * 200})["about"].endswith("...")
+    assert redact((1, 2.5, None, "secret")) == [1, 2.5, None, "***"]
+
+
+async def test_profile_of_repository_call(monkeypatch):
+    profiles = []
+    monkeypatch.setattr(profiler, "hooks", [*profiler.hooks, profiles.append])
+
+    assert await FakeRepository().read() == 3
+    with pytest.raises(UserNotFound):
+        await FakeRepository().read_missing()
+
+    read, read_missing = profiles
+    assert read.name == "FakeRepository.read"
+    assert read.rows == 3
+    assert read.statements == [
+        ("select * from users where id = %(id)s", {"id": 1}),
+    ]
+    assert read_missing.error is None
+    assert QUERY_ROWS.get(query="FakeRepository.read") == 3
+    assert QUERY_ERRORS.get(query="FakeRepository.read_missing") == 0
+    assert current_profile() is None
+
+
+def test_slow_queries_are_counted():
+    slow = QueryProfiler(slow_threshold=0.0)
+    fast = QueryProfiler(slow_threshold=60.0)
+
+    with slow.profile("Repository.slow"), fast.profile("Repository.fast"):
+        pass
+
+    assert SLOW_QUERIES.get(query="Repository.slow") == 1
+    assert SLOW_QUERIES.get(query="Repository.fast") == 0
+
+
+def test_disabled_profiler():
+    with QueryProfiler(enabled=False).profile("Repository.read") as profile:
+        assert profile is None
+        assert current_profile() is None
@@ -0,0 +1,136 @@
+"""Module for testing query plans of repositories on a large database.
+
+Every repository query runs against a seeded database, and the plan of
+each executed statement must not read big tables sequentially.
+"""
+
+from uuid import uuid4
+
+import pytest
+
+from app.internal.repository.postgresql import (
+    NotificationRepository,
+    ProfileRepository,
+    SavedSearchRepository,
+    UserRepository,
+)
+from app.pkg import models
+from tests.fixtures.repository.postgresql.explain import seq_scans
+
+#: set: Tables that grow with the number of users.
+BIG_TABLES = {"users", "profiles", "saved_searches", "notifications"}
+
+CALLS = {
+    "users.create": lambda r, s: r["user"].create(
+        cmd=models.AuthorizeUserCommand(
+            email=f"{uuid4().hex}@example.com",
+            password="P@ssw0rd!",
+        ),
+    ),
+    "users.read": lambda r, s: r["user"].read(
+        query=models.ReadUserQuery(id=s.user_id),
+    ),
+    "users.read_email_password": lambda r, s: r["user"].read_email_password(
+        cmd=models.AuthorizeUserCommand(email=s.email, password=s.password),
+    ),
+    "profiles.create": lambda r, s: r["profile"].create(
+        cmd=models.CreateProfileCommand(user_id=s.spare_user_id),
+    ),
+    "profiles.read": lambda r, s: r["profile"].read(
+        query=models.ReadProfileQuery(user_id=s.user_id),
+    ),
+    "profiles.read_fields": lambda r, s: r["profile"].read(
+        query=models.ReadProfileQuery(user_id=s.user_id, fields="first_name"),
+    ),
+    "profiles.read_many": lambda r, s: r["profile"].read_many(
+        query=models.ReadProfilesQuery(
+            user_ids=[s.user_id, s.spare_user_id],
+            fields="user_id",
+        ),
+    ),
+    "profiles.update": lambda r, s: r["profile"].update(
+        cmd=models.UpdateProfileCommand(
+            user_id=s.user_id,
+            first_name="Ivan",
+            version=1,
+        ),
+    ),
+    "profiles.patch": lambda r, s: r["profile"].patch(
+        cmd=models.PatchProfileCommand(user_id=s.user_id, bio="Golang", version=1),
+    ),
+    "profiles.delete": lambda r, s: r["profile"].delete(
+        cmd=models.DeleteProfileCommand(user_id=s.user_id),
+    ),
+    "saved_searches.create": lambda r, s: r["saved_search"].create(
+        cmd=models.CreateSavedSearchCommand(user_id=s.user_id, query="golang"),
+    ),
+    "saved_searches.delete": lambda r, s: r["saved_search"].delete(
+        cmd=models.DeleteSavedSearchCommand(
+            id=s.saved_search_id,
+            user_id=s.user_id,
+        ),
+    ),
+    "notifications.create_many": lambda r, s: r["notification"].create_many(
+        cmds=[
+            models.CreateNotificationCommand(
+                user_id=s.user_id,
+                saved_search_id=s.saved_search_id,
+                profile_user_id=s.spare_user_id,
+            ),
+        ],
+    ),
+    "notifications.read": lambda r, s: r["notification"].read(
+        query=models.ReadNotificationsQuery(user_id=s.user_id),
+    ),
+}
+
+#: set: Queries that read a whole table on purpose.
+FULL_SCANS = {"profiles.read_all", "saved_searches.read_all"}
+
+
+@pytest.mark.slow
+@pytest.mark.postgresql
+@pytest.mark.parametrize("name", sorted(CALLS))
+async def test_no_sequential_scans(
+    name,
+    seeded_postgres,
+    record_queries,
+    explain,
+    user_repositories,
+    profile_repositories,
+    saved_search_repositories,
+    notification_repositories,
+):
+    repositories = {
+        "user": user_repositories,
+        "profile": profile_repositories,
+        "saved_search": saved_search_repositories,
+        "notification": notification_repositories,
+    }
+
+    with record_queries() as statements:
+        await CALLS[name](repositories, seeded_postgres)
+
+    assert statements
+    for q, parameters in statements:
+        plan = await explain(q, parameters)
+        assert not BIG_TABLES & set(seq_scans(plan)), (name, q, plan)
+
+
+def test_all_repository_queries_are_checked():
+    """A new repository method must be added to ``CALLS`` or ``FULL_SCANS``."""
+
+    repositories = {
+        "users": UserRepository,
+        "profiles": ProfileRepository,
+        "saved_searches": SavedSearchRepository,
+        "notifications": NotificationRepository,
+    }
+    methods = {
+        f"{table}.{method}"
+        for table, repository in repositories.items()
+        for method in vars(repository)
+        if not method.startswith("_")
+    }
+
+    assert methods <= set(CALLS) | FULL_SCANS
@@ -0,0 +1,137 @@
+"""Module for testing routing of queries to the read replica."""
+
+import asyncio
+
+import psycopg2
+import pytest
+from aiopg import Pool
+
+from app.internal.repository.postgresql import connection
+from app.internal.repository.postgresql.routing import (
+    Intent,
+    ReplicaRouter,
+    bind_session,
+)
+
+PRIMARY, REPLICA = object(), object()
+
+
+async def make_router(lag=0.0, error=None, **kwargs) -> ReplicaRouter:
+    """Create router whose health check returns ``lag`` or raises ``error``,
+    after its first check."""
+
+    router = ReplicaRouter(
+        max_lag=kwargs.pop("max_lag", 1.0),
+        sticky_for=kwargs.pop("sticky_for", 5.0),
+        check_interval=kwargs.pop("check_interval", 60.0),
+    )
+
+    async def fetch_lag(replica, q):
+        if error is not None:
+            raise error
+        return lag
+
+    router._ReplicaRouter__fetch_lag = fetch_lag
+    await router.check(REPLICA)
+    return router
+
+
+async def in_context(fn):
+    """Run ``fn`` as a separate request."""
+
+    return await asyncio.create_task(fn())
+
+
+async def test_read_goes_to_replica():
+    router = await make_router()
+
+    assert await in_context(lambda: router.route_read(PRIMARY, REPLICA)) is REPLICA
+
+
+async def test_without_replica_read_goes_to_primary():
+    router = await make_router()
+
+    assert await in_context(lambda: router.route_read(PRIMARY, None)) is PRIMARY
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"lag": 10.0},
+        {"error": psycopg2.OperationalError("connection refused")},
+    ],
+)
+async def test_unhealthy_replica_falls_back_to_primary(kwargs):
+    router = await make_router(**kwargs)
+
+    assert await in_context(lambda: router.route_read(PRIMARY, REPLICA)) is PRIMARY
+
+
+async def test_read_your_writes():
+    router = await make_router()
+
+    async def write():
+        bind_session("user")
+        router.record_write()
+        return await router.route_read(PRIMARY, REPLICA)
+
+    async def read(session):
+        bind_session(session)
+        return await router.route_read(PRIMARY, REPLICA)
+
+    assert await in_context(write) is PRIMARY
+    assert await in_context(lambda: read("user")) is PRIMARY
+    assert await in_context(lambda: read("other")) is REPLICA
+
+
+async def test_stickiness_expires():
+    router = await make_router(sticky_for=0.0)
+
+    async def write():
+        bind_session("user")
+        router.record_write()
+
+    async def read():
+        bind_session("user")
+        return await router.route_read(PRIMARY, REPLICA)
+
+    await in_context(write)
+
+    assert await in_context(read) is REPLICA
+
+
+async def test_only_write_intent_sticks_session_to_primary(monkeypatch):
+    monkeypatch.setattr(connection, "router", await make_router())
+    route = getattr(connection, "__route")
+    primary, replica = Pool.__new__(Pool), Pool.__new__(Pool)
+
+    def request(intent):
+        async def run():
+            bind_session("user")
+            return await route(primary, intent, replica)
+
+        return in_context(run)
+
+    assert await request(None) is primary
+    assert await request(Intent.READ) is replica
+    assert await request(Intent.WRITE) is primary
+    assert await request(Intent.READ) is primary
+
+
+async def test_read_does_not_wait_for_health_check():
+    router = ReplicaRouter(max_lag=1.0, sticky_for=5.0, check_interval=60.0)
+    checked = asyncio.Event()
+
+    async def fetch_lag(replica, q):
+        await checked.wait()
+        return 0.0
+
+    router._ReplicaRouter__fetch_lag = fetch_lag
+
+    read = in_context(lambda: router.route_read(PRIMARY, REPLICA))
+    assert await asyncio.wait_for(read, timeout=1.0) is PRIMARY
+
+    checked.set()
+    while not router.healthy:
+        await asyncio.sleep(0.001)
+    assert await in_context(lambda: router.route_read(PRIMARY, REPLICA)) is REPLICA
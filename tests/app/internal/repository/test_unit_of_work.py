@@ -0,0 +1,72 @@
+"""Module for testing unit of work."""
+
+from uuid import uuid4
+
+import pytest
+
+from app.internal.repository.postgresql.connection import (
+    get_connection,
+    unit_of_work,
+)
+from app.internal.repository.postgresql.routing import bind_session, router
+from app.pkg import models
+from app.pkg.models.exceptions.users import UserNotFound
+
+
+def authorize_cmd() -> models.AuthorizeUserCommand:
+    return models.AuthorizeUserCommand(
+        email=f"{uuid4().hex}@example.com",
+        password="P@ssw0rd!",
+    )
+
+
+@pytest.mark.postgresql
+async def test_commit(clean_postgres, user_repositories):
+    _ = clean_postgres
+
+    async with unit_of_work():
+        user = await user_repositories.create(cmd=authorize_cmd())
+
+    result = await user_repositories.read(query=user.migrate(models.ReadUserQuery))
+
+    assert result == user
+
+
+@pytest.mark.postgresql
+async def test_rollback(clean_postgres, user_repositories):
+    _ = clean_postgres
+
+    with pytest.raises(RuntimeError):
+        async with unit_of_work():
+            user = await user_repositories.create(cmd=authorize_cmd())
+            raise RuntimeError
+
+    with pytest.raises(UserNotFound):
+        await user_repositories.read(query=user.migrate(models.ReadUserQuery))
+
+
+@pytest.mark.postgresql
+async def test_only_writing_unit_sticks_session_to_primary(clean_postgres):
+    _ = clean_postgres
+    bind_session("user")
+
+    async with unit_of_work(intent=None):
+        pass
+    assert not router.is_sticky()
+
+    async with unit_of_work():
+        pass
+    assert router.is_sticky()
+
+
+@pytest.mark.postgresql
+async def test_nested_calls_share_connection(clean_postgres):
+    _ = clean_postgres
+
+    async with unit_of_work() as outer:
+        async with unit_of_work() as inner:
+            async with get_connection() as cursor:
+                assert outer is inner is cursor
+
+    async with get_connection() as cursor:
+        assert cursor is not outer
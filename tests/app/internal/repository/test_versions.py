@@ -0,0 +1,126 @@
+"""Module for testing optimistic concurrency of profile updates."""
+
+import uuid
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.internal.repository.postgresql import profiles
+from app.internal.repository.postgresql.profiles import ProfileRepository
+from app.pkg import models
+from app.pkg.models.exceptions.repository import VersionConflict
+from app.pkg.models.exceptions.users import UserNotFound
+
+USER_ID = uuid.uuid4()
+
+
+def row(**values):
+    return {
+        "id": 1,
+        "user_id": USER_ID,
+        "first_name": "Alexandr",
+        "last_name": None,
+        "telegram": None,
+        "bio": None,
+        "version": 1,
+        **values,
+    }
+
+
+class FakeCursor:
+    """Cursor that returns ``results`` of the executed statements in order."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.statements = []
+
+    async def execute(self, q, parameters=None):
+        self.statements.append(q)
+
+    async def fetchone(self):
+        return self.results.pop(0)
+
+
+@pytest.fixture()
+def cursor(monkeypatch):
+    def use(*results):
+        cur = FakeCursor(*results)
+
+        @asynccontextmanager
+        async def get_connection(**kwargs):
+            yield cur
+
+        monkeypatch.setattr(profiles, "get_connection", get_connection)
+        return cur
+
+    return use
+
+
+async def test_update_of_current_version(cursor):
+    cur = cursor(row(bio="Golang", version=2))
+
+    profile = await ProfileRepository().update(
+        cmd=models.UpdateProfileCommand(user_id=USER_ID, bio="Golang", version=1),
+    )
+
+    assert profile.version == 2
+    assert "version = %(version)s" in cur.statements[0]
+
+
+async def test_update_without_changes_returns_current(cursor):
+    cur = cursor(None, row(bio="Golang"))
+
+    profile = await ProfileRepository().update(
+        cmd=models.UpdateProfileCommand(
+            user_id=USER_ID,
+            first_name="Alexandr",
+            bio="Golang",
+            version=1,
+        ),
+    )
+
+    assert profile.version == 1
+    assert " is distinct from " in cur.statements[0]
+    assert cur.statements[1].startswith("select ")
+
+
+async def test_update_of_stale_version(cursor):
+    cursor(None, row(bio="Rust", version=3))
+
+    with pytest.raises(VersionConflict) as error:
+        await ProfileRepository().update(
+            cmd=models.UpdateProfileCommand(user_id=USER_ID, bio="Go", version=1),
+        )
+
+    assert error.value.current.bio == "Rust"
+    assert error.value.current.version == 3
+
+
+async def test_update_of_missing_profile(cursor):
+    cursor(None, None)
+
+    with pytest.raises(UserNotFound):
+        await ProfileRepository().update(
+            cmd=models.UpdateProfileCommand(user_id=USER_ID, version=1),
+        )
+
+
+async def test_patch_without_changes_returns_current(cursor):
+    cur = cursor(None, row(bio="Golang"))
+
+    profile = await ProfileRepository().patch(
+        cmd=models.PatchProfileCommand(user_id=USER_ID, bio="Golang", version=1),
+    )
+
+    assert profile.bio == "Golang"
+    assert cur.statements[0].startswith("update profiles set bio = %(bio)s,")
+    assert cur.statements[1].startswith("select ")
+
+
+async def test_patch_of_stale_version(cursor):
+    cursor(None, row(version=2))
+
+    with pytest.raises(VersionConflict):
+        await ProfileRepository().patch(
+            cmd=models.PatchProfileCommand(user_id=USER_ID, bio="Go", version=1),
+        )
@@ -0,0 +1,31 @@
+"""Module for testing warm-up of the connection pool."""
+
+import uuid
+
+import pytest
+
+from app.internal.repository.postgresql import connection
+from app.internal.repository.postgresql.prepared import get_statement_cache
+from app.pkg import models
+from app.pkg.settings import settings
+
+
+@pytest.mark.postgresql
+async def test_warm_up_prepares_queries_on_every_connection(
+    clean_postgres,
+    profile_repositories,
+):
+    _ = clean_postgres
+
+    query = models.ReadProfileQuery(user_id=uuid.UUID(int=0))
+    async with connection.get_connection(return_pool=True) as pool:
+        await connection.warm_up(
+            pool,
+            size=2,
+            queries=[lambda: profile_repositories.read(query=query)],
+        )
+
+        assert pool.freesize >= 2
+        if settings.POSTGRES.PREPARED_STATEMENTS:
+            free = list(pool._free)[-2:]
+            assert all(len(get_statement_cache(conn, max_size=1)) for conn in free)
@@ -0,0 +1,89 @@
+"""Module for testing deduplication of exception records."""
+
+import logging
+
+import pytest
+
+from app.pkg.logger.deduplication import DeduplicationFilter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("app.pkg.logger.deduplication.time.monotonic", clock)
+    return clock
+
+
+@pytest.fixture()
+def records():
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger("tests.deduplication")
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    yield records
+    logger.removeHandler(handler)
+
+
+def record(msg, args=(), level=logging.INFO, exc_info=None):
+    return logging.LogRecord(
+        "tests.deduplication",
+        level,
+        __file__,
+        1,
+        msg,
+        args,
+        exc_info,
+    )
+
+
+def test_repeated_exception_is_summarized(clock, records):
+    log_filter = DeduplicationFilter(interval=10, burst=2)
+    error = LookupError("User not found.")
+
+    allowed = [log_filter.filter(record(error)) for _ in range(5)]
+    assert allowed == [True, True, False, False, False]
+    assert log_filter.filter(record("error: %s", (KeyError("other"),)))
+    assert records == []
+
+    clock.now = 12
+    assert log_filter.filter(record(error))
+    (summary,) = records
+    assert summary.getMessage() == "LookupError x 5 in last 12s: User not found."
+    assert summary.levelno == logging.INFO
+
+
+def test_records_without_exception_and_severe_records_pass(clock, records):
+    log_filter = DeduplicationFilter(interval=10, burst=1, level=logging.ERROR)
+    error = ValueError("broken")
+
+    for _ in range(3):
+        assert log_filter.filter(record("plain message"))
+        exc_info = (ValueError, error, None)
+        severe = record("failed", level=logging.ERROR, exc_info=exc_info)
+        assert log_filter.filter(severe)
+
+    log_filter.flush()
+    assert records == []
+
+
+def test_flush_logs_current_window(clock, records):
+    log_filter = DeduplicationFilter(interval=10, burst=1)
+    for _ in range(1_001):
+        log_filter.filter(record("failed: %s", (ValueError("broken"),)))
+
+    clock.now = 3
+    log_filter.flush()
+
+    (summary,) = records
+    assert summary.getMessage() == "ValueError x 1,001 in last 3s: broken"
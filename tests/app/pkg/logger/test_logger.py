@@ -0,0 +1,60 @@
+"""Module for testing the queue-based logger."""
+
+import json
+import logging
+
+from app.pkg.logger import get_logger
+from app.pkg.logger.logger import JSONFormatter, configure_logging
+
+
+def test_handler_is_added_once():
+    first = get_logger("app.test.first")
+    get_logger("app.test.first")
+    get_logger("app.test.second")
+
+    package = logging.getLogger("app")
+    assert package.handlers == [configure_logging()]
+    assert not first.handlers
+    assert not package.propagate
+
+
+def test_message_is_merged_before_queueing():
+    handler = configure_logging()
+    arguments = ["before"]
+    record = logging.LogRecord(
+        "app",
+        logging.INFO,
+        __file__,
+        1,
+        "%s",
+        (arguments,),
+        None,
+    )
+
+    prepared = handler.prepare(record)
+    arguments.append("after")
+
+    assert prepared.getMessage() == "['before']"
+
+
+def test_json_formatter():
+    try:
+        raise ValueError("broken")
+    except ValueError as error:
+        record = logging.LogRecord(
+            "app.test",
+            logging.ERROR,
+            __file__,
+            7,
+            "failed %s",
+            ("query",),
+            (ValueError, error, error.__traceback__),
+        )
+
+    data = json.loads(JSONFormatter().format(record))
+
+    assert data["level"] == "ERROR"
+    assert data["logger"] == "app.test"
+    assert data["line"] == 7
+    assert data["message"] == "failed query"
+    assert data["exception"].endswith("ValueError: broken")
@@ -0,0 +1,65 @@
+"""Module for testing metrics rendering."""
+
+import pytest
+
+from app.pkg.metrics import Counter, Gauge, Histogram, Registry
+
+
+def test_render_counter_and_gauge():
+    registry = Registry()
+    counter = Counter(
+        "requests_total", "Requests.", ("path",), metrics_registry=registry
+    )
+    gauge = Gauge("idle", 'Idle "connections".', metrics_registry=registry)
+
+    counter.inc(path='/a"b')
+    counter.inc(2, path='/a"b')
+    gauge.set(3)
+    gauge.dec()
+
+    assert registry.render() == (
+        "# HELP requests_total Requests.\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{path="/a\\"b"} 3.0\n'
+        '# HELP idle Idle "connections".\n'
+        "# TYPE idle gauge\n"
+        "idle 2.0\n"
+    )
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    histogram = Histogram("wait", "Wait.", buckets=(0.1, 1), metrics_registry=registry)
+
+    for value in (0.05, 0.1, 0.5, 5):
+        histogram.observe(value)
+
+    samples = [
+        (name, labels.get("le"), value) for name, labels, value in histogram.samples()
+    ]
+    assert samples == [
+        ("wait_bucket", 0.1, 2),
+        ("wait_bucket", 1, 3),
+        ("wait_bucket", float("inf"), 4),
+        ("wait_sum", None, 5.65),
+        ("wait_count", None, 4),
+    ]
+    assert 'wait_bucket{le="+Inf"} 4' in registry.render()
+
+
+def test_labels_are_checked():
+    registry = Registry()
+    counter = Counter("errors_total", "Errors.", ("kind",), metrics_registry=registry)
+
+    with pytest.raises(ValueError):
+        counter.inc(other="x")
+    with pytest.raises(ValueError):
+        Counter("errors_total", "Errors.", metrics_registry=registry)
+
+
+def test_collect_callbacks_run_before_render():
+    registry = Registry()
+    gauge = Gauge("size", "Size.", metrics_registry=registry)
+    registry.on_collect(lambda: gauge.set(7))
+
+    assert "size 7.0" in registry.render()
@@ -0,0 +1,64 @@
+"""Module for testing aggregation of metrics of several workers."""
+
+import json
+import os
+
+from app.pkg.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    MultiProcessExporter,
+    Registry,
+)
+
+#: int: Pid that no process has.
+DEAD_PID = 2**22 + 1
+
+
+def worker_registry(requests, in_flight, wait):
+    registry = Registry()
+    Counter("requests_total", "Requests.", ("route",), metrics_registry=registry).inc(
+        requests,
+        route="/a",
+    )
+    Gauge("in_flight", "In flight.", metrics_registry=registry).set(in_flight)
+    Histogram("wait", "Wait.", buckets=(1,), metrics_registry=registry).observe(wait)
+    return registry
+
+
+def copy_snapshot(tmp_path, registry, pid):
+    exporter = MultiProcessExporter(tmp_path, metrics_registry=registry)
+    exporter.write()
+    os.replace(tmp_path / f"{os.getpid()}.json", tmp_path / f"{pid}.json")
+
+
+def test_samples_of_workers_are_summed(tmp_path):
+    copy_snapshot(tmp_path, worker_registry(2, 1, 0.5), pid=os.getppid())
+    exporter = MultiProcessExporter(tmp_path, metrics_registry=worker_registry(3, 2, 5))
+
+    text = exporter.render()
+
+    assert 'requests_total{route="/a"} 5.0' in text
+    assert "in_flight 3.0" in text
+    assert 'wait_bucket{le="1"} 1' in text
+    assert 'wait_bucket{le="+Inf"} 2' in text
+    assert "wait_count 2" in text
+    assert text.count("# TYPE requests_total counter") == 1
+
+
+def test_gauges_of_dead_workers_are_dropped(tmp_path):
+    copy_snapshot(tmp_path, worker_registry(2, 1, 0.5), pid=DEAD_PID)
+    exporter = MultiProcessExporter(tmp_path, metrics_registry=worker_registry(3, 2, 5))
+
+    text = exporter.render()
+
+    assert 'requests_total{route="/a"} 5.0' in text
+    assert "in_flight 2.0" in text
+
+
+def test_broken_snapshots_are_ignored(tmp_path):
+    (tmp_path / f"{os.getppid()}.json").write_text("[{")
+    (tmp_path / "other.json").write_text(json.dumps([]))
+    exporter = MultiProcessExporter(tmp_path, metrics_registry=worker_registry(3, 2, 5))
+
+    assert 'requests_total{route="/a"} 3.0' in exporter.render()
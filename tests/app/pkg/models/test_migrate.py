@@ -0,0 +1,95 @@
+"""Module for testing migration of models."""
+
+import uuid
+from typing import Any, List
+
+from pydantic import SecretStr
+
+from app.pkg import models
+from app.pkg.models.base import BaseModel
+from app.pkg.models.base.model import get_faker
+
+
+def profiles(count: int = 3):
+    return [
+        models.Profile(id=i + 1, user_id=uuid.uuid4(), first_name=f"Name{i}")
+        for i in range(count)
+    ]
+
+
+def test_migrate_many_matches_migrate():
+    items = profiles()
+
+    result = BaseModel.migrate_many(items, model=models.ReadProfileQuery)
+
+    assert result == [item.migrate(model=models.ReadProfileQuery) for item in items]
+
+
+def test_migrate_many_with_renames_and_extra_fields():
+    items = profiles()
+    saved_search_id = 7
+    extra_fields = {"user_id": items[0].user_id, "saved_search_id": saved_search_id}
+
+    result = BaseModel.migrate_many(
+        items,
+        model=models.Notification,
+        match_keys={"profile_user_id": "user_id"},
+        extra_fields=extra_fields,
+    )
+
+    assert result == [
+        item.migrate(
+            model=models.Notification,
+            match_keys={"profile_user_id": "user_id"},
+            extra_fields=extra_fields,
+        )
+        for item in items
+    ]
+    assert [n.profile_user_id for n in result] == [p.user_id for p in items]
+    assert {n.saved_search_id for n in result} == {saved_search_id}
+
+
+def test_migrate_many_converts_values_like_migrate():
+    class Source(BaseModel):
+        id: uuid.UUID
+
+    class Target(BaseModel):
+        id: str
+
+    item = Source(id=uuid.uuid4())
+
+    assert BaseModel.migrate_many([item], Target) == [item.migrate(Target)]
+
+
+def test_migrate_many_converts_nested_models_like_migrate():
+    class Inner(BaseModel):
+        id: uuid.UUID
+        password: SecretStr
+
+    class Source(BaseModel):
+        password: SecretStr
+        inner: Inner
+        inners: List[Inner]
+        anything: Any
+
+    class Target(BaseModel):
+        password: str
+        inner: dict
+        inners: list
+        anything: Any
+
+    inner = Inner(id=uuid.uuid4(), password="P@ssw0rd!")
+    item = Source(password="secret", inner=inner, inners=[inner], anything=inner)
+
+    assert BaseModel.migrate_many([item], Target) == [item.migrate(Target)]
+
+
+def test_random_fill_uses_cached_generator():
+    item = profiles(1)[0]
+
+    first = item.migrate(model=models.Notification, random_fill=True)
+    second = BaseModel.migrate_many([item], models.Notification, random_fill=True)[0]
+
+    assert first.user_id == second.user_id == item.user_id
+    assert isinstance(first.saved_search_id, int)
+    assert get_faker(models.Notification) is get_faker(models.Notification)
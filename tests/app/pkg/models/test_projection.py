@@ -0,0 +1,43 @@
+"""Module for testing partial models."""
+
+import uuid
+
+import pydantic
+import pytest
+
+from app.pkg import models
+from app.pkg.models.base import projection
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("bio", ("bio",)),
+        ("bio, user_id,bio,", ("user_id", "bio")),
+        (["id", "first_name"], ("first_name", "id")),
+    ],
+)
+def test_fields_are_ordered_as_model(value, expected):
+    assert pydantic.parse_obj_as(models.ProfileFields, value) == expected
+
+
+@pytest.mark.parametrize("value", ["", " , ", "bio,password", 42])
+def test_invalid_fields(value):
+    with pytest.raises(pydantic.ValidationError):
+        models.ReadProfileQuery(user_id=uuid.uuid4(), fields=value)
+
+
+def test_projection_is_cached_per_set_of_fields():
+    partial = projection(models.Profile, ("bio", "user_id"))
+
+    assert list(partial.__fields__) == ["user_id", "bio"]
+    assert projection(models.Profile, ["user_id", "bio"]) is partial
+    assert projection(models.Profile, models.Profile.__fields__) is models.Profile
+
+
+def test_projection_keeps_validation_of_fields():
+    partial = projection(models.Profile, ("user_id", "telegram"))
+
+    with pytest.raises(pydantic.ValidationError):
+        partial(user_id=uuid.uuid4(), telegram="invalid")
+    assert partial.__fields__["telegram"].required is False
@@ -0,0 +1,33 @@
+"""Module for testing compact rows of models."""
+
+import uuid
+
+from app.internal.pkg.responses import ModelResponse
+from app.pkg import models
+from app.pkg.models.base import row_class
+
+
+def test_row_has_fields_of_model_and_no_dict():
+    row = models.ProfileRow.from_row({"id": 1, "user_id": uuid.uuid4()})
+
+    assert models.ProfileRow.__slots__ == tuple(models.Profile.__fields__)
+    assert not hasattr(row, "__dict__")
+    assert row.first_name is None
+    assert row_class(models.Profile) is models.ProfileRow
+    assert models.ProfileRow.model_class() is models.Profile
+
+
+def test_row_is_serialized_like_model():
+    data = {
+        "id": 1,
+        "user_id": uuid.uuid4(),
+        "first_name": "Alexandr",
+        "telegram": "@tester1337",
+        "created_at": "ignored",
+    }
+    row = models.ProfileRow.from_row(data)
+    profile = models.Profile.from_trusted(data)
+
+    assert ModelResponse([row]).body == ModelResponse([profile]).body
+    assert row.to_model() == profile
+    assert row.dict() == profile.dict()
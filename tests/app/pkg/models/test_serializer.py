@@ -0,0 +1,110 @@
+"""Module for testing compiled serializers of ``BaseModel.to_dict``."""
+
+from __future__ import annotations
+
+import datetime
+import enum
+import typing
+import uuid
+
+import pydantic
+import pytest
+
+from app.pkg.models.base import BaseModel
+from app.pkg.models.base.serializer import cast_value
+from app.pkg.models.types import EncryptedSecretBytes
+
+
+class Role(str, enum.Enum):
+    ADMIN = "admin"
+
+
+class Child(BaseModel):
+    id: uuid.UUID
+    created: typing.Optional[datetime.datetime] = None
+
+
+class DerivedChild(Child):
+    token: pydantic.SecretStr
+
+
+class Node(BaseModel):
+    name: str
+    children: typing.List[Node] = []
+
+
+Node.update_forward_refs()
+
+
+class Sample(BaseModel):
+    id: pydantic.PositiveInt
+    user_id: pydantic.UUID4
+    optional_id: typing.Optional[uuid.UUID] = None
+    password: pydantic.SecretStr
+    encrypted: EncryptedSecretBytes
+    role: Role
+    created: datetime.datetime
+    day: datetime.date
+    tags: typing.Tuple[str, ...]
+    ids: typing.List[uuid.UUID]
+    child: Child
+    children: typing.List[Child]
+    mapping: typing.Dict[str, uuid.UUID]
+    empty: typing.Dict[str, str]
+    anything: typing.Any
+    union: typing.Union[uuid.UUID, int]
+    tree: Node
+
+
+def sample() -> Sample:
+    now = datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+    return Sample(
+        id=1,
+        user_id=uuid.uuid4(),
+        password="secret",
+        encrypted=b"encrypted",
+        role=Role.ADMIN,
+        created=now,
+        day=now,
+        tags=("a", "b"),
+        ids=[uuid.uuid4()],
+        child=DerivedChild(id=uuid.uuid4(), created=now, token="token"),
+        children=[Child(id=uuid.uuid4())],
+        mapping={"a": uuid.uuid4()},
+        empty={},
+        anything=[uuid.uuid4(), {"at": now}],
+        union=uuid.uuid4(),
+        tree=Node(name="root", children=[Node(name="leaf")]),
+    )
+
+
+@pytest.mark.parametrize("show_secrets", [False, True])
+@pytest.mark.parametrize(
+    "kwargs",
+    [{}, {"exclude": {"password"}}, {"include": {"child", "tags"}}],
+)
+def test_output_matches_generic_cast(show_secrets, kwargs):
+    model = sample()
+
+    expected = {
+        key: cast_value(value, show_secrets)
+        for key, value in model.dict(**kwargs).items()
+    }
+
+    assert model.to_dict(show_secrets=show_secrets, **kwargs) == expected
+
+
+def test_values_are_cast():
+    model = sample()
+
+    result = model.to_dict(show_secrets=True)
+
+    assert result["user_id"] == str(model.user_id)
+    assert result["password"] == "secret"
+    assert result["encrypted"] == "encrypted"
+    assert result["created"] == model.created.timestamp()
+    assert result["day"] == datetime.date(2024, 1, 2)
+    assert result["tags"] == ["a", "b"]
+    assert result["child"]["token"] == "token"
+    assert result["tree"]["children"][0] == {"name": "leaf", "children": []}
+    assert model.to_dict()["password"] == "**********"
@@ -0,0 +1,109 @@
+"""Module for testing approximate nearest-neighbour index."""
+
+import numpy as np
+import pytest
+
+from app.pkg.search import LSHIndex
+
+
+def _normalized(rng: np.random.Generator, n: int, dimensions: int) -> np.ndarray:
+    vectors = rng.standard_normal((n, dimensions)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.fixture()
+def vectors() -> np.ndarray:
+    return _normalized(np.random.default_rng(1), 500, 32)
+
+
+@pytest.fixture()
+def index(vectors) -> LSHIndex:
+    index = LSHIndex(dimensions=32, tables=8, bits=6, probes=2, seed=7)
+    for i, vector in enumerate(vectors):
+        index.add(str(i), vector)
+    return index
+
+
+def test_query_finds_itself(index, vectors):
+    for i in range(0, 500, 50):
+        key, score = index.query(vectors[i], limit=1)[0]
+
+        assert key == str(i)
+        assert score == pytest.approx(1.0)
+
+
+def test_remove(index, vectors):
+    assert index.remove("3")
+    assert not index.remove("3")
+
+    assert "3" not in [key for key, _ in index.query(vectors[3], limit=10)]
+    assert len(index) == 499
+
+
+def test_add_replaces_vector(index, vectors):
+    index.add("3", vectors[4])
+
+    assert {key for key, _ in index.query(vectors[4], limit=2)} == {"3", "4"}
+    assert len(index) == 500
+
+
+def test_save_and_load(tmp_path, index, vectors):
+    index.remove("0")
+    index.save(tmp_path / "index")
+
+    loaded = LSHIndex.load(tmp_path / "index")
+    loaded.add("new", vectors[0])
+
+    assert len(loaded) == 500
+    assert isinstance(loaded._vectors, np.memmap)
+    assert loaded.query(vectors[0], limit=1)[0][0] == "new"
+    assert loaded.query(vectors[10], limit=1) == index.query(vectors[10], limit=1)
+
+
+def test_save_switches_link_to_new_snapshot(tmp_path, index, vectors):
+    path = tmp_path / "index"
+    index.save(path)
+    first = path.resolve()
+    index.remove("0")
+    index.save(path)
+
+    assert path.is_symlink()
+    assert path.resolve() != first
+    assert not first.exists()
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        path.resolve().name,
+        "index",
+    ]
+    assert len(LSHIndex.load(path)) == 499
+
+
+def test_save_replaces_snapshot_directory(tmp_path, index):
+    path = tmp_path / "index"
+    path.mkdir()
+    (path / "meta.json").write_text("{}")
+
+    index.save(path)
+
+    assert path.is_symlink()
+    assert len(LSHIndex.load(path)) == 500
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_open_ignores_incompatible_snapshot(tmp_path, index):
+    index.save(tmp_path / "index")
+
+    assert len(LSHIndex.open(tmp_path / "index", dimensions=32, seed=8)) == 0
+    assert len(LSHIndex.open(tmp_path / "index", dimensions=32, bits=6, seed=7)) == 500
+
+
+def test_recall_grows_with_probes(index, vectors):
+    queries = _normalized(np.random.default_rng(2), 50, 32)
+    exact = [set(np.argsort(-(vectors @ q))[:5].astype(str)) for q in queries]
+
+    def recall(probes: int) -> float:
+        found = [
+            {key for key, _ in index.query(q, limit=5, probes=probes)} for q in queries
+        ]
+        return sum(len(f & e) for f, e in zip(found, exact)) / (5 * len(queries))
+
+    assert recall(0) <= recall(4)
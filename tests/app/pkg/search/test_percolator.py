@@ -0,0 +1,43 @@
+"""Module for testing percolator of saved searches."""
+
+from app.pkg.search import Percolator, tokenize
+
+
+def test_match_requires_all_terms():
+    percolator = Percolator()
+    percolator.add(1, tokenize("Python backend"), "python-backend")
+    percolator.add(2, tokenize("python"), "python")
+    percolator.add(3, tokenize("golang"), "golang")
+
+    assert sorted(percolator.match(tokenize("Senior Python developer"))) == [
+        "python",
+    ]
+    assert sorted(percolator.match(tokenize("Python, backend, SQL"))) == [
+        "python",
+        "python-backend",
+    ]
+
+
+def test_remove_and_replace():
+    percolator = Percolator()
+    percolator.add(1, ["python"], "first")
+    percolator.add(1, ["golang"], "second")
+
+    assert percolator.match(["python"]) == []
+    assert percolator.match(["golang"]) == ["second"]
+
+    percolator.remove(1)
+    assert percolator.match(["golang"]) == []
+    assert percolator.loaded_at is None
+
+    percolator.replace([(2, ["sql"], "sql")])
+    assert percolator.match(["sql"]) == ["sql"]
+    assert percolator.loaded_at is not None
+
+
+def test_empty_query_is_not_indexed():
+    percolator = Percolator()
+    percolator.add(1, [], "everything")
+
+    assert len(percolator) == 0
+    assert percolator.match(["python"]) == []
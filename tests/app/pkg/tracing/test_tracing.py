@@ -0,0 +1,122 @@
+"""Module for testing tracing spans and their export."""
+
+import json
+
+import pytest
+
+from app.pkg.tracing import (
+    OTLPFileExporter,
+    Tracer,
+    current_span,
+    format_traceparent,
+    parse_traceparent,
+    to_otlp,
+)
+
+TRACE_ID = "0af7651916cd43dd8448eb211c80319c"
+PARENT_ID = "b7ad6b7169203331"
+
+
+class ListExporter:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+def test_children_share_trace_of_root():
+    exporter = ListExporter()
+    tracer = Tracer(sample_rate=1.0, exporter=exporter)
+
+    with tracer.span("root") as root:
+        with tracer.span("child", key="value") as child:
+            assert current_span() is child
+        assert current_span() is root
+
+    assert [span.name for span in exporter.spans] == ["child", "root"]
+    assert child.trace_id == root.trace_id
+    assert child.parent_id == root.span_id
+    assert root.parent_id is None
+    assert child.attributes == {"key": "value"}
+    assert root.end >= child.end >= child.start >= root.start
+
+
+def test_unsampled_trace_records_nothing():
+    exporter = ListExporter()
+    tracer = Tracer(sample_rate=0.0, exporter=exporter)
+
+    with tracer.span("root") as root, tracer.span("child") as child:
+        child.set_attribute("key", "value")
+
+    assert not root.recording and not child.recording
+    assert exporter.spans == []
+    assert not Tracer(sample_rate=1.0).enabled
+
+
+def test_remote_parent_is_continued():
+    exporter = ListExporter()
+    tracer = Tracer(sample_rate=0.01, exporter=exporter)
+
+    with tracer.span("root", traceparent=f"00-{TRACE_ID}-{PARENT_ID}-01") as span:
+        assert format_traceparent(span) == f"00-{TRACE_ID}-{span.span_id}-01"
+    with tracer.span("unsampled", traceparent=f"00-{TRACE_ID}-{PARENT_ID}-00"):
+        pass
+
+    assert [(s.trace_id, s.parent_id) for s in exporter.spans] == [
+        (TRACE_ID, PARENT_ID),
+    ]
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        "",
+        "garbage",
+        f"ff-{TRACE_ID}-{PARENT_ID}-01",
+        f"00-{'0' * 32}-{PARENT_ID}-01",
+        f"00-{TRACE_ID}-{'x' * 16}-01",
+    ],
+)
+def test_invalid_traceparent(header):
+    assert parse_traceparent(header) is None
+
+
+async def test_traced_failure_and_otlp_file(tmp_path):
+    exporter = OTLPFileExporter(tmp_path / "spans.jsonl", service_name="test")
+    tracer = Tracer(sample_rate=1.0, exporter=exporter)
+
+    @tracer.traced()
+    async def failing():
+        raise ValueError("broken")
+
+    with pytest.raises(ValueError):
+        await failing()
+    await exporter.stop()
+
+    (line,) = (tmp_path / "spans.jsonl").read_text().splitlines()
+    resource_spans = json.loads(line)["resourceSpans"][0]
+    (span,) = resource_spans["scopeSpans"][0]["spans"]
+    assert resource_spans["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": "test"}},
+    ]
+    assert span["name"].endswith("failing")
+    assert span["status"] == {"code": 2, "message": "ValueError: broken"}
+    assert "parentSpanId" not in span
+
+
+def test_otlp_attribute_types():
+    exporter = ListExporter()
+    tracer = Tracer(sample_rate=1.0, exporter=exporter)
+    with tracer.span("root", flag=True, rows=3, wait=0.5, name_="x"):
+        pass
+
+    (span,) = to_otlp(exporter.spans, "test")["resourceSpans"][0]["scopeSpans"][0][
+        "spans"
+    ]
+    assert [attribute["value"] for attribute in span["attributes"]] == [
+        {"boolValue": True},
+        {"intValue": "3"},
+        {"doubleValue": 0.5},
+        {"stringValue": "x"},
+    ]
@@ -0,0 +1,33 @@
+"""Module for testing batched background writes."""
+
+import asyncio
+
+import pytest
+
+from app.pkg.utils.batcher import AsyncBatcher
+from app.pkg.utils.deadline import deadline, remaining
+
+
+def make_batcher(**kwargs):
+    written = []
+
+    async def flush(items):
+        budget = remaining()
+        if budget is not None and budget <= 0:
+            raise TimeoutError("deadline exceeded")
+        written.extend(items)
+
+    return AsyncBatcher(flush, **kwargs), written
+
+
+@pytest.mark.parametrize("max_size", [1, 100])
+async def test_write_ignores_deadline_of_request(max_size):
+    batcher, written = make_batcher(max_size=max_size, max_delay=0.01)
+
+    with deadline(-0.5):
+        batcher.put("item")
+
+    await asyncio.sleep(0.05)
+    await batcher.close()
+
+    assert written == ["item"]
@@ -0,0 +1,30 @@
+"""Module for testing cancellation scopes."""
+
+from app.pkg.utils.cancellation import cancel_scope, on_cancel
+
+
+async def test_cancel_runs_callbacks_of_running_blocks():
+    calls = []
+
+    async def callback():
+        calls.append("running")
+
+    async def failing():
+        raise RuntimeError
+
+    with cancel_scope() as scope:
+        with on_cancel(callback):
+            pass
+        with on_cancel(callback), on_cancel(failing):
+            await scope.cancel()
+
+    assert scope.cancelled
+    assert calls == ["running"]
+
+
+async def test_on_cancel_without_scope():
+    async def callback():
+        raise AssertionError
+
+    with on_cancel(callback):
+        pass
@@ -0,0 +1,21 @@
+"""Module for testing request deadlines."""
+
+from app.pkg.utils.deadline import deadline, remaining
+
+
+def test_no_deadline():
+    assert remaining() is None
+
+    with deadline(None):
+        assert remaining() is None
+
+
+def test_nested_deadline_only_shortens():
+    with deadline(10.0):
+        with deadline(60.0):
+            assert 9.0 < remaining() <= 10.0
+        with deadline(1.0):
+            assert 0.0 < remaining() <= 1.0
+        assert 1.0 < remaining() <= 10.0
+
+    assert remaining() is None
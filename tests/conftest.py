@@ -15,6 +15,7 @@ pytest_plugins = [
     "tests.fixtures.repository.postgresql.repositories",
     "tests.fixtures.repository.postgresql.postgresql",
     "tests.fixtures.repository.postgresql.inserters",
+    "tests.fixtures.repository.postgresql.explain",
     "tests.fixtures.router.client",
     "tests.fixtures.router.endpoints",
     "tests.fixtures.router.responses",
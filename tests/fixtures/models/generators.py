@@ -5,9 +5,7 @@
 """
 
 from typing import Any, Callable, Type
-import pydantic
 import pytest
-from jsf import JSF
 from app.pkg import models
 from app.pkg.models.base import Model
 
@@ -23,18 +21,18 @@ def __generator(model: Type[Model], **kwargs) -> Callable[..., Model]:
     Возвращает:
         Callable[..., Model]: Функция, которая при вызове генерирует экземпляр модели с тестовыми данными.
     """
-    mock = JSF(model.schema())
 
     def generate() -> Any:
         """
         Генерирует тестовые данные для модели, обновляя их с учетом переданных параметров.
 
+        Генератор JSF создается один раз для класса модели, см.
+        :meth:`.BaseModel.fake`.
+
         Возвращает:
             Any: Экземпляр модели с тестовыми данными.
         """
-        mock_generate = mock.generate()
-        mock_generate.update(kwargs)
-        return pydantic.parse_obj_as(model, mock_generate)
+        return model.fake(**kwargs)
 
     return generate()
 
@@ -0,0 +1,171 @@
+"""Планы запросов репозиториев PostgreSQL.
+
+Этот модуль содержит фикстуры для заполнения базы большим объемом данных,
+записи SQL-запросов, которые выполняют репозитории, и получения их планов
+через ``EXPLAIN (FORMAT JSON)``.
+"""
+
+import json
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Tuple
+from uuid import UUID
+
+import pytest
+
+from app.internal.repository.postgresql import (
+    connection,
+    notifications,
+    profiles,
+    saved_searches,
+    users,
+)
+
+#: int: Количество пользователей, которыми заполняется база.
+SEED_ROWS = 50_000
+
+#: tuple: Модули репозиториев, запросы которых записываются.
+REPOSITORY_MODULES = (users, profiles, saved_searches, notifications)
+
+
+@dataclass(frozen=True)
+class Seed:
+    """Строки, на которые ссылаются проверяемые запросы."""
+
+    user_id: UUID
+    email: str
+    password: str
+    spare_user_id: UUID
+    saved_search_id: int
+
+
+class _RecordingCursor:
+    """Курсор, который запоминает все выполненные запросы."""
+
+    def __init__(self, cursor, statements: List[Tuple[str, Any]]):
+        self._cursor = cursor
+        self._statements = statements
+
+    async def execute(self, operation, parameters=None, *args, **kwargs):
+        self._statements.append((operation, parameters))
+        return await self._cursor.execute(operation, parameters, *args, **kwargs)
+
+    def __getattr__(self, item):
+        return getattr(self._cursor, item)
+
+
+@pytest.fixture()
+async def seeded_postgres(clean_postgres) -> Seed:
+    """Заполняет базу ``SEED_ROWS`` пользователями, профилями, поисками и
+    уведомлениями и обновляет статистику планировщика."""
+
+    _ = clean_postgres
+
+    q = """
+        insert into users(email, password)
+        select 'user' || i || '@example.com', 'P@ssw0rd!'
+        from generate_series(1, %(rows)s) as i;
+
+        insert into profiles(user_id, first_name, last_name, bio)
+        select id, 'Alexandr', 'Popov', 'python backend developer'
+        from users;
+
+        insert into users(email, password)
+        values ('spare@example.com', 'P@ssw0rd!');
+
+        insert into saved_searches(user_id, query)
+        select id, 'python backend'
+        from users
+        where email like 'user%%0@example.com';
+
+        insert into notifications(user_id, saved_search_id, profile_user_id)
+        select s.user_id, s.id, s.user_id
+        from saved_searches s;
+
+        analyze;
+    """
+
+    async with connection.get_connection(return_pool=True) as pool:
+        async with connection.acquire_connection(pool) as cursor:
+            await cursor.execute(q, {"rows": SEED_ROWS})
+            await cursor.execute(
+                """
+                select
+                    u.id as user_id,
+                    u.email,
+                    u.password,
+                    (
+                        select id from users where email = 'spare@example.com'
+                    ) as spare_user_id,
+                    s.id as saved_search_id
+                from saved_searches s
+                join users u on u.id = s.user_id
+                limit 1
+                """
+            )
+            row = await cursor.fetchone()
+
+    return Seed(**row)
+
+
+@pytest.fixture()
+def record_queries(monkeypatch):
+    """Подменяет ``get_connection`` в модулях репозиториев и возвращает
+    контекстный менеджер со списком выполненных запросов."""
+
+    @contextmanager
+    def recorder() -> Iterator[List[Tuple[str, Any]]]:
+        statements: List[Tuple[str, Any]] = []
+        original = connection.get_connection
+
+        def recording_get_connection(*args, **kwargs):
+            return _RecordingConnection(original(*args, **kwargs), statements)
+
+        with monkeypatch.context() as patch:
+            for module in REPOSITORY_MODULES:
+                patch.setattr(module, "get_connection", recording_get_connection)
+            yield statements
+
+    return recorder
+
+
+class _RecordingConnection:
+    """Асинхронный контекстный менеджер, оборачивающий курсор."""
+
+    def __init__(self, context, statements):
+        self._context = context
+        self._statements = statements
+
+    async def __aenter__(self):
+        return _RecordingCursor(await self._context.__aenter__(), self._statements)
+
+    async def __aexit__(self, *exc_info):
+        return await self._context.__aexit__(*exc_info)
+
+
+@pytest.fixture()
+def explain():
+    """Возвращает функцию, которая строит план запроса."""
+
+    async def _explain(q: str, parameters: Any = None) -> Dict[str, Any]:
+        async with connection.get_connection(return_pool=True) as pool:
+            async with connection.acquire_connection(pool) as cursor:
+                await cursor.execute(f"EXPLAIN (FORMAT JSON) {q}", parameters)
+                plan = (await cursor.fetchone())["QUERY PLAN"]
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]["Plan"]
+
+    return _explain
+
+
+def seq_scans(plan: Dict[str, Any]) -> List[str]:
+    """Возвращает имена таблиц, которые план читает последовательно."""
+
+    found = []
+    if plan["Node Type"] == "Seq Scan":
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", ()):
+        found.extend(seq_scans(child))
+    return found
@@ -2,9 +2,29 @@
 
 import pytest
 
-from app.internal.repository.postgresql import UserRepository
+from app.internal.repository.postgresql import (
+    NotificationRepository,
+    ProfileRepository,
+    SavedSearchRepository,
+    UserRepository,
+)
 
 
 @pytest.fixture()
 async def user_repositories() -> UserRepository:
     return UserRepository()
+
+
+@pytest.fixture()
+async def profile_repositories() -> ProfileRepository:
+    return ProfileRepository()
+
+
+@pytest.fixture()
+async def saved_search_repositories() -> SavedSearchRepository:
+    return SavedSearchRepository()
+
+
+@pytest.fixture()
+async def notification_repositories() -> NotificationRepository:
+    return NotificationRepository()